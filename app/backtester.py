@@ -1,21 +1,46 @@
+from typing import List, Tuple, Dict, Union
+import os
+from .metrics import MetricsAccumulator
+from .data import TickStore, price_array
+from core.cache.cache import cached, code_version, hash_array
 
-from typing import List, Tuple, Dict
-from .metrics import compute_metrics
+Prices = Union[List[Tuple[str,float]], TickStore]
 
-def ewma_strategy(prices: List[Tuple[str,float]], alpha=0.05, threshold=2.5, window=50):
-    metrics, _ = ewma_run(prices, alpha=alpha, threshold=threshold, window=window)
-    return metrics
+# Sources the strategy metrics depend on; part of every result-cache key
+_APP_DIR=os.path.dirname(os.path.abspath(__file__))
+_CODE=(_APP_DIR, os.path.join(_APP_DIR, "..", "core", "metrics"))
 
-def persistence_strategy(prices: List[Tuple[str,float]], hold_period=10):
-    metrics, _ = persistence_run(prices, hold_period=hold_period)
-    return metrics
+def _cached_run(kind, params, prices, fn, cache):
+    px=price_array(prices)
+    if not cache:
+        return fn(px)
+    return cached(kind, params, [hash_array(px)], code_version(*_CODE), lambda: fn(px))
 
-def ewma_run(prices: List[Tuple[str,float]], alpha=0.05, threshold=2.5, window=50):
+def ewma_strategy(prices: Prices, alpha=0.05, threshold=2.5, window=50, cache=True):
+    # Identical prices + params + code are served from the result cache (core/cache); cache=False skips it
+    return _cached_run("ewma_strategy", {"alpha":alpha,"threshold":threshold,"window":window}, prices,
+                       lambda px: ewma_run(px, alpha=alpha, threshold=threshold, window=window, keep_equity=False)[0],
+                       cache)
+
+def persistence_strategy(prices: Prices, hold_period=10, cache=True):
+    return _cached_run("persistence_strategy", {"hold_period":hold_period}, prices,
+                       lambda px: persistence_run(px, hold_period=hold_period, keep_equity=False)[0], cache)
+
+_CHUNK=1<<16
+
+def _scalars(arr):
+    # Python floats for arr[1:], converted one fixed-size chunk at a time: the scalar loops stay
+    # fast without materializing a list of the whole (possibly memory-mapped) column
+    for s in range(1, len(arr), _CHUNK):
+        yield from arr[s:s+_CHUNK].tolist()
+
+def ewma_run(prices: Prices, alpha=0.05, threshold=2.5, window=50, keep_equity=True):
     if len(prices)<window+2: 
         raise ValueError("Not enough data")
-    p0=prices[0][1]; eq=[0.0]; ewma=p0; var=0.0; pos=0; trades=0; wins=0
-    for i in range(1,len(prices)):
-        px=prices[i][1]; prev=prices[i-1][1]; ret=px-prev
+    arr=price_array(prices)
+    prev=float(arr[0]); acc=MetricsAccumulator(0.0); eq=[0.0] if keep_equity else None; ewma=prev; var=0.0; pos=0; trades=0; wins=0
+    for px in _scalars(arr):
+        ret=px-prev; prev=px
         ewma=alpha*px+(1-alpha)*ewma
         diff=px-ewma; var=(1-alpha)*(var+alpha*diff*diff); vol=(var if var>1e-12 else 1e-12)**0.5
         upper=ewma+threshold*vol; lower=ewma-threshold*vol
@@ -26,23 +51,81 @@ def ewma_run(prices: List[Tuple[str,float]], alpha=0.05, threshold=2.5, window=5
             trades+=1
         if (pos==+1 and ret>0) or (pos==-1 and ret<0): 
             wins+=1
-        pos=new_pos; eq.append(eq[-1]+pos*ret)
-    M=compute_metrics(eq).__dict__; M["trades"]=trades; M["wins"]=wins
-    return M, eq
-
-def persistence_run(prices: List[Tuple[str,float]], hold_period=10):
-    eq=[0.0]; pos=0; hold=0; trades=0; wins=0
-    for i in range(1,len(prices)):
-        px=prices[i][1]; prev=prices[i-1][1]; ret=px-prev
+        pos=new_pos; x=acc.last+pos*ret; acc.update(x)
+        if eq is not None: eq.append(x)
+    acc.trades=trades; acc.wins=wins
+    return acc.snapshot().__dict__, eq
+
+def ewma_batch_run(prices: Prices, grid: List[Tuple[float,float,int]], chunk=2048) -> List[Dict]:
+    """Evaluate many (alpha, threshold, window) EWMA combos in one pass over the prices.
+
+    State is a (ticks x params) block per chunk; the EWMA/variance recursions step
+    all params together and everything else is array-level. Returns one metrics dict
+    per combo, in grid order, matching ``ewma_run`` up to float rounding in sharpe.
+    """
+    import numpy as np
+    px=price_array(prices); n=len(px); P=len(grid)
+    if P==0: return []
+    if n<max(int(g[2]) for g in grid)+2:
+        raise ValueError("Not enough data")
+    a=np.array([g[0] for g in grid], dtype=float); b=1.0-a
+    thr=np.array([g[1] for g in grid], dtype=float)
+    ewma=np.full(P, px[0]); var=np.zeros(P); pos=np.zeros(P)
+    trades=np.zeros(P, dtype=np.int64); wins=np.zeros(P, dtype=np.int64)
+    eq=np.zeros(P); peak=np.zeros(P); max_dd=np.zeros(P)
+    cnt=0; mean=np.zeros(P); m2=np.zeros(P)
+    E=np.empty((chunk+1,P)); V=np.empty((chunk+1,P))
+    for s in range(1,n,chunk):
+        e=min(s+chunk,n); m=e-s
+        x=px[s:e,None]; ret=px[s:e]-px[s-1:e-1]
+        AX=x*a
+        E[0]=ewma
+        for k in range(1,m+1):
+            np.multiply(b, E[k-1], out=E[k]); E[k]+=AX[k-1]
+        Ec=E[1:m+1]; Q=a*(x-Ec)*(x-Ec)
+        V[0]=var
+        for k in range(1,m+1):
+            np.add(V[k-1], Q[k-1], out=V[k]); V[k]*=b
+        Vc=V[1:m+1]
+        ewma=Ec[-1].copy(); var=Vc[-1].copy()
+        vol=np.sqrt(np.maximum(Vc,1e-12)); band=thr*vol
+        sig=np.where(x>Ec+band, 1.0, np.where(x<Ec-band, -1.0, 0.0))
+        # forward-fill band breaks into a position path, carrying the last chunk's position
+        rows=np.where(sig!=0, np.arange(m)[:,None], -1)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        new_pos=np.where(rows>=0, np.take_along_axis(sig, np.maximum(rows,0), axis=0), pos)
+        old_pos=np.vstack([pos[None,:], new_pos[:-1]])
+        trades+=(new_pos!=old_pos).sum(axis=0)
+        wins+=((old_pos*ret[:,None])>0).sum(axis=0)
+        EQ=np.cumsum(np.vstack([eq[None,:], new_pos*ret[:,None]]), axis=0)
+        PK=np.maximum.accumulate(np.vstack([peak[None,:], EQ[1:]]), axis=0)
+        max_dd=np.maximum(max_dd, (PK[1:]-EQ[1:]).max(axis=0))
+        # Chan et al. merge of per-chunk mean/M2 of the equity increments
+        r=np.diff(EQ, axis=0); cm=r.mean(axis=0); cm2=((r-cm)**2).sum(axis=0)
+        tot=cnt+m; d=cm-mean
+        mean=mean+d*m/tot; m2=m2+cm2+d*d*cnt*m/tot; cnt=tot
+        eq=EQ[-1].copy(); peak=PK[-1].copy(); pos=new_pos[-1].copy()
+    v=m2/(cnt-1) if cnt>1 else np.zeros(P)
+    sharpe=np.where(v>0, (cnt**0.5)*mean/np.sqrt(np.where(v>0,v,1.0)), 0.0)
+    return [{"pnl":float(eq[j]),"trades":int(trades[j]),"wins":int(wins[j]),
+             "max_dd":float(max_dd[j]),"sharpe":float(sharpe[j])} for j in range(P)]
+
+def persistence_run(prices: Prices, hold_period=10, keep_equity=True):
+    arr=price_array(prices)
+    acc=MetricsAccumulator(0.0); eq=[0.0] if keep_equity else None; pos=0; hold=0; trades=0; wins=0
+    prev=float(arr[0]) if len(arr) else 0.0
+    for px in _scalars(arr):
+        ret=px-prev; prev=px
         if hold==0: 
             pos=1 if ret>0 else -1; trades+=1; hold=hold_period
         else: 
             hold-=1
         if (pos==+1 and ret>0) or (pos==-1 and ret<0): 
             wins+=1
-        eq.append(eq[-1]+pos*ret)
-    M=compute_metrics(eq).__dict__; M["trades"]=trades; M["wins"]=wins
-    return M, eq
+        x=acc.last+pos*ret; acc.update(x)
+        if eq is not None: eq.append(x)
+    acc.trades=trades; acc.wins=wins
+    return acc.snapshot().__dict__, eq
 
 STRATEGIES = {
     "EWMA": ewma_strategy,
@@ -50,7 +133,5 @@ STRATEGIES = {
 }
 
 def list_strategies() -> Dict[str, str]:
-    return {
-        "EWMA": "EWMA band breakout with volatility bands (params: alpha, threshold, window)",
-        "PERSIST": "Directional persistence/hold strategy (params: hold_period)"
-    }
+    from .strategies import STRATEGIES
+    return dict(STRATEGIES)
@@ -1,5 +1,125 @@
 import csv
+from dataclasses import dataclass
+from typing import Any
+
+TICKS_MAGIC=b"HFTTICK1"
+TICKS_HEADER=16  # magic + uint64 tick count; then int64 ts[n], float64 price[n]
+
 def load_prices_csv(path):
     with open(path,'r') as f:
         r=csv.DictReader(f)
         return [(row['time'], float(row['price'])) for row in r]
+
+@dataclass(frozen=True)
+class TickStore:
+    """Columnar ticks: int64 nanosecond timestamps and float64 prices (usually memmaps)."""
+    ts: Any
+    price: Any
+
+    def __len__(self):
+        return len(self.price)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TickStore(self.ts[i], self.price[i])
+        return (int(self.ts[i]), float(self.price[i]))
+
+def is_ticks_file(path)->bool:
+    with open(path,'rb') as f:
+        return f.read(len(TICKS_MAGIC))==TICKS_MAGIC
+
+def open_ticks(path, mode='r')->TickStore:
+    import numpy as np
+    with open(path,'rb') as f:
+        head=f.read(TICKS_HEADER)
+    if len(head)<TICKS_HEADER or head[:8]!=TICKS_MAGIC:
+        raise ValueError(f"Not a tick store: {path}")
+    n=int(np.frombuffer(head, dtype='<u8', count=1, offset=8)[0])
+    if n==0:
+        return TickStore(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64))
+    ts=np.memmap(path, dtype='<i8', mode=mode, offset=TICKS_HEADER, shape=(n,))
+    price=np.memmap(path, dtype='<f8', mode=mode, offset=TICKS_HEADER+8*n, shape=(n,))
+    return TickStore(ts, price)
+
+def create_ticks(path, n)->TickStore:
+    """Allocate an n-tick store and return writable memmaps of its columns (fill, then flush)."""
+    import numpy as np
+    with open(path,'wb') as f:
+        f.write(TICKS_MAGIC+np.array([n], dtype='<u8').tobytes())
+        f.truncate(TICKS_HEADER+16*n)
+    if n==0:
+        return TickStore(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64))
+    return open_ticks(path, mode='r+')
+
+def file_key(path):
+    """Cache key for a data file: changes when the file is replaced or rewritten."""
+    import os
+    st=os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+def load_prices(path):
+    return open_ticks(path) if is_ticks_file(path) else load_prices_csv(path)
+
+def _count_rows(path)->int:
+    n=0; last=b"\n"
+    with open(path,'rb') as f:
+        for block in iter(lambda: f.read(1<<20), b""):
+            n+=block.count(b"\n"); last=block[-1:]
+    return n+(last!=b"\n")
+
+def _ts_mode(t:str)->str:
+    import numpy as np
+    try:
+        int(t); return "int"
+    except ValueError:
+        pass
+    try:
+        np.datetime64(t, 'ns'); return "datetime"
+    except ValueError:
+        return "ordinal"
+
+def csv_to_ticks(csv_path, out_path, chunk=1<<16)->int:
+    """One-time CSV(time,price) -> tick store conversion; returns the number of ticks.
+
+    Timestamps are taken as integer ns, parsed as datetimes, or (for opaque labels
+    like ``t1..tN``) replaced by the row ordinal, decided from the first row.
+    """
+    import numpy as np
+    cap=max(_count_rows(csv_path)-1, 0)
+    out=np.memmap(out_path, dtype=np.uint8, mode='w+', shape=(TICKS_HEADER+16*max(cap,1),))
+    ts=np.ndarray((cap,), dtype='<i8', buffer=out, offset=TICKS_HEADER)
+    price=np.ndarray((cap,), dtype='<f8', buffer=out, offset=TICKS_HEADER+8*cap)
+    n=0; mode=None; tbuf=[]; pbuf=[]
+
+    def flush():
+        nonlocal n
+        k=len(pbuf)
+        if mode=="int": ts[n:n+k]=np.array(tbuf, dtype=np.int64)
+        elif mode=="datetime": ts[n:n+k]=np.array(tbuf, dtype='datetime64[ns]').astype(np.int64)
+        else: ts[n:n+k]=np.arange(n, n+k, dtype=np.int64)
+        price[n:n+k]=pbuf; n+=k; tbuf.clear(); pbuf.clear()
+
+    with open(csv_path,'r') as f:
+        for row in csv.DictReader(f):
+            if mode is None: mode=_ts_mode(row['time'])
+            tbuf.append(row['time']); pbuf.append(float(row['price']))
+            if len(pbuf)>=chunk: flush()
+    if pbuf: flush()
+    if n!=cap:
+        # blank lines were counted as rows: slide the price column up behind ts[:n]
+        out[TICKS_HEADER+8*n:TICKS_HEADER+16*n]=np.array(price[:n]).view(np.uint8)
+    out[:8]=np.frombuffer(TICKS_MAGIC, dtype=np.uint8)
+    out[8:16]=np.array([n], dtype='<u8').view(np.uint8)
+    out.flush(); del ts, price, out
+    with open(out_path,'r+b') as fo:
+        fo.truncate(TICKS_HEADER+16*n)
+    return n
+
+def price_array(prices):
+    # float64 view of the price column for TickStore, list-of-tuples or 1-D array inputs
+    import numpy as np
+    if isinstance(prices, TickStore):
+        prices=prices.price
+    if isinstance(prices, np.ndarray):
+        return prices if prices.dtype==np.float64 else prices.astype(np.float64)
+    return np.fromiter((p for _,p in prices), dtype=np.float64, count=len(prices))
@@ -0,0 +1,6 @@
+# Strategy registry (name -> description). Kept import-free so listing strategies
+# does not load the engines.
+STRATEGIES = {
+    "EWMA": "EWMA band breakout with volatility bands (params: alpha, threshold, window)",
+    "PERSIST": "Directional persistence/hold strategy (params: hold_period)"
+}
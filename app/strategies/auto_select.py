@@ -1,24 +1,80 @@
-from typing import List, Tuple, Dict
-from ..backtester import ewma_strategy, persistence_strategy
-
-def _features(prices: List[Tuple[str,float]])->Dict:
-    import statistics
-    rets=[prices[i][1]-prices[i-1][1] for i in range(1,len(prices))]
-    vol=statistics.pstdev(rets) if len(rets)>1 else 0.0
-    trend=(prices[-1][1]-prices[0][1])/(abs(prices[0][1])+1e-9)
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..backtester import Prices, ewma_batch_run, persistence_strategy
+from ..data import price_array
+
+EWMA_GRID=[(0.02,1.8,90),(0.03,2.0,80),(0.05,2.5,50),(0.08,3.0,30),(0.10,3.2,25)]
+PERSIST_GRID=[5,8,12,16]
+
+def _features(prices: Prices)->Dict:
+    import numpy as np
+    px=price_array(prices); rets=np.diff(px)
+    vol=float(rets.std()) if len(rets)>1 else 0.0
+    trend=float((px[-1]-px[0])/(abs(px[0])+1e-9))
     return {"vol":vol,"trend":trend}
 
-def smart_choose_and_run(prices: List[Tuple[str,float]])->Dict:
+# Worker-side view of the parent's price array (set by _attach_prices in each pool process)
+_SHARED_PX=None
+_SHARED_SHM=None
+
+def _attach_prices(name: str, n: int):
+    global _SHARED_PX, _SHARED_SHM
+    import numpy as np
+    from multiprocessing import shared_memory
+    _SHARED_SHM=shared_memory.SharedMemory(name=name)
+    _SHARED_PX=np.ndarray((n,), dtype=np.float64, buffer=_SHARED_SHM.buf)
+
+def _eval_ewma(grid: List[Tuple[float,float,int]])->List[Dict]:
+    return ewma_batch_run(_SHARED_PX, grid)
+
+def _eval_persist(hold_period: int)->Dict:
+    # pool workers have no use for the cache: each process would hash the prices for a one-off lookup
+    return persistence_strategy(_SHARED_PX, hold_period=hold_period, cache=False)
+
+def _resolve_workers(workers: Optional[int])->int:
+    if workers is None:
+        workers=int(os.environ.get("AUTO_SELECT_WORKERS","1"))
+    return (os.cpu_count() or 1) if workers<=0 else workers
+
+def _run_parallel(px, ewma_grid, persist_grid, workers: int)->Tuple[List[Dict],List[Dict]]:
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    shm=shared_memory.SharedMemory(create=True, size=max(px.nbytes,1))
+    try:
+        np.ndarray(px.shape, dtype=np.float64, buffer=shm.buf)[:]=px
+        # one EWMA slice per worker: the batch engine's per-tick cost is flat in slice width
+        step=max(1, -(-len(ewma_grid)//workers))
+        slices=[ewma_grid[i:i+step] for i in range(0,len(ewma_grid),step)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_prices, initargs=(shm.name, len(px))) as ex:
+            ewma_parts=list(ex.map(_eval_ewma, slices))
+            persist=list(ex.map(_eval_persist, persist_grid))
+        return [m for part in ewma_parts for m in part], persist
+    finally:
+        shm.close(); shm.unlink()
+
+def smart_choose_and_run(prices: Prices, ewma_grid: Optional[Sequence[Tuple[float,float,int]]]=None,
+                         persist_grid: Optional[Sequence[int]]=None, workers: Optional[int]=None)->Dict:
+    """Regime-gated grid search; ``workers>1`` (or AUTO_SELECT_WORKERS) fans the grid out
+    over a process pool sharing the prices via shared memory. ``workers<=0`` uses every core.
+    Candidates keep grid order, so the pick is the same for any worker count."""
     feats=_features(prices); candidates=[]
+    ewma_grid=[tuple(g) for g in (EWMA_GRID if ewma_grid is None else ewma_grid)]
+    persist_grid=list(PERSIST_GRID if persist_grid is None else persist_grid)
     # Favor EWMA on trendier & moderate-vol regimes; wider grid
-    if abs(feats["trend"])>0.008 and feats["vol"]<0.6:
-        grid=[(0.02,1.8,90),(0.03,2.0,80),(0.05,2.5,50),(0.08,3.0,30),(0.10,3.2,25)]
-        for a,t,w in grid:
-            m=ewma_strategy(prices, alpha=a, threshold=t, window=w)
+    use_ewma=abs(feats["trend"])>0.008 and feats["vol"]<0.6
+    workers=_resolve_workers(workers)
+    if workers>1:
+        ewma_m, persist_m=_run_parallel(price_array(prices), ewma_grid if use_ewma else [],
+                                        [] if use_ewma else persist_grid, workers)
+    else:
+        ewma_m=ewma_batch_run(prices, ewma_grid) if use_ewma else []
+        persist_m=[] if use_ewma else [persistence_strategy(prices, hold_period=h) for h in persist_grid]
+    if use_ewma:
+        for (a,t,w),m in zip(ewma_grid, ewma_m):
             candidates.append(("EWMA", {"alpha":a,"threshold":t,"window":w}, m))
     else:
-        for h in [5,8,12,16]:
-            m=persistence_strategy(prices, hold_period=h)
+        for h,m in zip(persist_grid, persist_m):
             candidates.append(("PERSIST", {"hold_period":h}, m))
     best=max(candidates, key=lambda x: (x[2]["sharpe"], x[2]["pnl"]))
     return {"strategy":best[0],"params":best[1],"metrics":best[2],"features":feats,"candidates":candidates}
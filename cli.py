@@ -1,8 +1,6 @@
-import os, json, argparse, io, base64
-from datetime import datetime, UTC
-from app.data import load_prices_csv
-from app.backtester import ewma_strategy, persistence_strategy, ewma_run, persistence_run, list_strategies
-from app.strategies.auto_select import smart_choose_and_run
+import os, sys, json, argparse
+# App modules (and numpy through them) are imported by the code path that needs them:
+# --list-strategies loads neither, and matplotlib is only imported to write a report.
 
 def select_agent():
     impl=os.environ.get("AGENT_IMPL","local").lower()
@@ -13,12 +11,16 @@ def select_agent():
     return decide
 
 def run_baseline(prices):
+    from app.backtester import ewma_strategy
     return {"strategy":"EWMA","params":{"alpha":0.05,"threshold":2.5,"window":50},
             "metrics": ewma_strategy(prices, alpha=0.05, threshold=2.5, window=50)}
 
 def generate_report_html(path, prices, baseline, final):
     # Recompute equity curves and detect overlap
+    import io, base64
     from math import isclose
+    from datetime import datetime, UTC
+    from app.backtester import ewma_run, persistence_run
     _, eq_base = ewma_run(prices, **baseline["params"]) if baseline["strategy"]=="EWMA" else persistence_run(prices, **baseline["params"])
     if final["strategy"]=="EWMA":
         _, eq_final = ewma_run(prices, **final["params"])
@@ -67,18 +69,11 @@ def generate_report_html(path, prices, baseline, final):
     with open(path, "w") as f:
         f.write(html)
 
-def main():
-    ap = argparse.ArgumentParser(description="HFT Validator CLI")
-    ap.add_argument("--list-strategies", action="store_true", help="List strategies/validators and exit.")
-    ap.add_argument("--report", metavar="HTML_PATH", help="Write an HTML report (equity + metrics).")
-    args = ap.parse_args()
-
-    if args.list_strategies:
-        print(json.dumps(list_strategies(), indent=2))
-        return
-
-    data_path=os.environ.get("DATA_PATH","data/sample_prices.csv")
-    prices=load_prices_csv(data_path)
+def run(prices):
+    """Baseline vs smart pick vs agent-hinted final run; the CLI's JSON result."""
+    from datetime import datetime, UTC
+    from app.backtester import persistence_strategy, ewma_strategy
+    from app.strategies.auto_select import smart_choose_and_run
     baseline=run_baseline(prices)
 
     decide=select_agent()
@@ -108,9 +103,69 @@ def main():
         result["note"] = "Final Sharpe < baseline — falling back to baseline due to REQUIRE_IMPROVEMENT=1."
         result["final"] = result["baseline"]
         result["improvement_sharpe_over_baseline"] = 0.0
+    return result
+
+def profile_startup(argv, top=25):
+    """Re-run the command under ``python -X importtime`` and report import cost per module.
+
+    The command's own output still goes to stdout; the report (wall time, total import
+    time, and the ``top`` modules by cumulative import time) is JSON on stderr.
+    """
+    import subprocess, time
+    t0=time.perf_counter()
+    proc=subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv],
+                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    wall_ms=(time.perf_counter()-t0)*1000
+    sys.stdout.write(proc.stdout)
+    mods=[]
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr); continue
+        if "self [us]" in line:
+            continue
+        self_us, cum_us, name=line[len("import time:"):].split("|")
+        depth=(len(name)-len(name.lstrip())-1)//2
+        mods.append({"module":name.strip(), "depth":depth, "self_ms":int(self_us)/1000, "cumulative_ms":int(cum_us)/1000})
+    report={"wall_ms":round(wall_ms,1),
+            "imports_ms":round(sum(m["cumulative_ms"] for m in mods if m["depth"]==0),1),
+            "modules":sorted(mods, key=lambda m: -m["cumulative_ms"])[:top]}
+    print(json.dumps(report, indent=2), file=sys.stderr)
+    return proc.returncode
+
+def main():
+    ap = argparse.ArgumentParser(description="HFT Validator CLI")
+    ap.add_argument("--list-strategies", action="store_true", help="List strategies/validators and exit.")
+    ap.add_argument("--report", metavar="HTML_PATH", help="Write an HTML report (equity + metrics).")
+    ap.add_argument("--convert-ticks", metavar="TICKS_PATH", help="Convert the DATA_PATH CSV to a binary tick store and exit.")
+    ap.add_argument("--profile-startup", action="store_true", help="Run the command under -X importtime and report per-module import time (JSON on stderr).")
+    args = ap.parse_args()
+
+    if args.profile_startup:
+        # rebuild the child's argv from the parsed options: filtering strings would miss
+        # abbreviations like --profile and the child would profile itself again
+        child=(["--list-strategies"] if args.list_strategies else [])
+        child+=(["--report", args.report] if args.report else [])
+        child+=(["--convert-ticks", args.convert_ticks] if args.convert_ticks else [])
+        sys.exit(profile_startup(child))
+
+    if args.list_strategies:
+        from app.strategies import STRATEGIES
+        print(json.dumps(dict(STRATEGIES), indent=2))
+        return
+
+    data_path=os.environ.get("DATA_PATH","data/sample_prices.csv")
+    if args.convert_ticks:
+        from app.data import csv_to_ticks
+        n=csv_to_ticks(data_path, args.convert_ticks)
+        print(json.dumps({"source":data_path,"ticks_path":args.convert_ticks,"ticks":n}, indent=2))
+        return
+
+    from app.data import load_prices
+    prices=load_prices(data_path)
+    result=run(prices)
 
     if args.report:
-        generate_report_html(args.report, prices, baseline, result["final"])
+        generate_report_html(args.report, prices, result["baseline"], result["final"])
 
     print(json.dumps(result, indent=2))
 
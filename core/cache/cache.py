@@ -0,0 +1,215 @@
+"""Content-addressed result cache for strategy and validator runs.
+
+Keys hash the inputs (price arrays / frames), the run kind, its parameters and
+a code version (a digest of the source files the result depends on), so a hit
+is only possible when the evaluation would be identical. Results live in an
+in-memory LRU and, optionally, in an on-disk tier of pickles evicted oldest
+first once it exceeds a byte budget. The disk tier unpickles whatever is in its
+directory, so it is opt-in and must point at a directory only you can write.
+
+``default_cache()`` is configured from the environment:
+- ``HFT_CACHE``: ``memory`` (default), ``disk`` (memory + disk), or ``0`` (off)
+- ``HFT_CACHE_DIR``: disk tier location (default ``~/.cache/hft_validator``)
+- ``HFT_CACHE_MAX_BYTES``: disk budget (default 256 MiB)
+"""
+import copy
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_MISSING = object()
+
+
+def _digest():
+    return hashlib.blake2b(digest_size=20)
+
+
+def hash_array(a) -> str:
+    import numpy as np
+    a = np.ascontiguousarray(a)
+    h = _digest()
+    h.update(f"{a.dtype.str}{a.shape}".encode())
+    h.update(a.data)
+    return h.hexdigest()
+
+
+def hash_frame(df) -> str:
+    """Digest of a DataFrame's values, index, column names and dtypes."""
+    import pandas as pd
+    h = _digest()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+_CODE_VERSIONS: Dict[Tuple[str, ...], str] = {}
+
+
+def code_version(*paths) -> str:
+    """Digest of the given source files (directories: every ``*.py`` below them).
+
+    Computed once per process; editing any of the files changes keys built after a restart.
+    """
+    key = tuple(os.path.abspath(p) for p in paths)
+    if key not in _CODE_VERSIONS:
+        files = []
+        for p in key:
+            if os.path.isdir(p):
+                for root, dirs, names in os.walk(p):
+                    dirs[:] = [d for d in dirs if d != "__pycache__"]
+                    files += [os.path.join(root, n) for n in names if n.endswith(".py")]
+            else:
+                files.append(p)
+        h = _digest()
+        for f in sorted(files):
+            with open(f, "rb") as fh:
+                h.update(f.encode())
+                h.update(fh.read())
+        _CODE_VERSIONS[key] = h.hexdigest()
+    return _CODE_VERSIONS[key]
+
+
+def make_key(kind: str, params: Dict[str, Any], data_hashes=(), version: str = "") -> str:
+    h = _digest()
+    h.update(json.dumps([kind, params, list(data_hashes), version], sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU + size-bounded disk) cache of picklable results.
+
+    The disk directory is scanned once when the cache is created; after that
+    its size and eviction order are tracked as entries are written and read.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None, max_disk_bytes: int = 256 << 20):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._mem: "OrderedDict[str, Any]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> bytes, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, mode=0o700, exist_ok=True)
+            entries = []
+            for e in os.scandir(disk_dir):
+                if e.name.endswith(".pkl"):
+                    st = e.stat()
+                    entries.append((st.st_mtime_ns, e.name[:-4], st.st_size))
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_bytes += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + ".pkl")
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return self._mem[key]
+        if self.disk_dir:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = pickle.load(f)
+                os.utime(self._path(key))  # recency for eviction
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._remember(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def _remember(self, key: str, value) -> None:
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    def put(self, key: str, value) -> None:
+        self._remember(key, value)
+        if not self.disk_dir:
+            return
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return  # the disk tier is best effort (e.g. read-only filesystems)
+        with self._lock:
+            self._disk_bytes += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+            evict = []
+            while self._disk_bytes > self.max_disk_bytes and self._disk:
+                old, old_size = self._disk.popitem(last=False)
+                self._disk_bytes -= old_size
+                evict.append(old)
+        for old in evict:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def get_or_compute(self, key: str, fn: Callable[[], Any]):
+        """Cached ``fn()``; callers get a copy, so mutating a result never touches the cache."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn()
+            self.put(key, value)
+        return copy.deepcopy(value)
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._mem.clear()
+        if disk and self.disk_dir:
+            for e in os.scandir(self.disk_dir):
+                if e.name.endswith(".pkl"):
+                    os.remove(e.path)
+            with self._lock:
+                self._disk.clear()
+                self._disk_bytes = 0
+
+
+_DEFAULT: Optional[ResultCache] = None
+
+
+def default_cache() -> Optional[ResultCache]:
+    """Process-wide cache from the HFT_CACHE* environment; None when caching is off."""
+    global _DEFAULT
+    mode = os.environ.get("HFT_CACHE", "memory").lower()
+    if mode in ("0", "off", "false"):
+        return None
+    if _DEFAULT is None:
+        disk = None
+        if mode == "disk":
+            disk = os.environ.get("HFT_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "hft_validator")
+        try:
+            _DEFAULT = ResultCache(disk_dir=disk, max_disk_bytes=int(os.environ.get("HFT_CACHE_MAX_BYTES", 256 << 20)))
+        except OSError:
+            _DEFAULT = ResultCache()
+    return _DEFAULT
+
+
+def cached(kind: str, params: Dict[str, Any], data_hashes, version: str, fn: Callable[[], Any]):
+    """``fn()`` through the default cache (or directly when caching is off)."""
+    cache = default_cache()
+    if cache is None:
+        return fn()
+    return cache.get_or_compute(make_key(kind, params, data_hashes, version), fn)
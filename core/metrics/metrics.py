@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 import json
-from typing import Dict
+from typing import Dict, Optional
 
 @dataclass
 class Metrics:
@@ -23,3 +23,65 @@ class Metrics:
 
     def to_dict(self) -> Dict:
         return dict(pnl=self.pnl, trades=self.trades, wins=self.wins, max_dd=self.max_dd, sharpe=self.sharpe)
+
+
+class MetricsAccumulator:
+    """Single-pass equity metrics in O(1) memory.
+
+    Feed equity points with ``update(x)`` or per-step PnL increments with ``add(r)``;
+    PnL, running peak, max drawdown and a Welford mean/variance of the increments
+    (for Sharpe) are kept up to date, so ``snapshot()`` can be taken mid-run.
+    """
+
+    __slots__ = ("first", "last", "peak", "max_dd", "count", "mean", "m2", "trades", "wins")
+
+    def __init__(self, start: Optional[float] = None):
+        self.first: Optional[float] = None
+        self.last = 0.0
+        self.peak = 0.0
+        self.max_dd = 0.0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.trades = 0
+        self.wins = 0
+        if start is not None:
+            self.update(start)
+
+    def update(self, x: float) -> None:
+        if self.first is None:
+            self.first = self.last = self.peak = x
+            return
+        self._step(x - self.last, x)
+
+    def add(self, r: float) -> None:
+        if self.first is None:
+            self.update(0.0)
+        self._step(r, self.last + r)
+
+    def _step(self, r: float, x: float) -> None:
+        self.count += 1
+        d = r - self.mean
+        self.mean += d / self.count
+        self.m2 += d * (r - self.mean)
+        self.last = x
+        if x > self.peak:
+            self.peak = x
+        dd = self.peak - x
+        if dd > self.max_dd:
+            self.max_dd = dd
+
+    @property
+    def pnl(self) -> float:
+        return 0.0 if self.first is None else self.last - self.first
+
+    def variance(self, ddof: int = 1) -> float:
+        return self.m2 / (self.count - ddof) if self.count > ddof else 0.0
+
+    @property
+    def sharpe(self) -> float:
+        v = self.variance()
+        return (self.count ** 0.5) * (self.mean / (v ** 0.5)) if v > 0 else 0.0
+
+    def snapshot(self) -> Metrics:
+        return Metrics(self.pnl, self.trades, self.wins, self.max_dd, self.sharpe)
@@ -0,0 +1,106 @@
+"""In-process ctypes binding to the C++ backtest core (cpp/libhftcore.so).
+
+Build the library with ``make -C cpp``; set ``HFT_NATIVE_LIB`` to load it from
+another path. Price (and timestamp) arrays are passed to C++ by pointer, so a
+contiguous float64 NumPy array or tick-store memmap is not copied.
+"""
+import ctypes
+import os
+import sys
+from typing import Optional
+
+from core.metrics.metrics import Metrics
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+_LIB_NAME = "libhftcore.dylib" if sys.platform == "darwin" else "libhftcore.so"
+VALIDATOR_KINDS = {"EWMA": 0, "Volatility": 1, "Imbalance": 2, "Persistence": 3}
+
+class _Result(ctypes.Structure):
+    # mirrors struct Result in cpp/backtest.h
+    _fields_ = [("pnl", ctypes.c_double), ("trades", ctypes.c_int), ("wins", ctypes.c_int),
+                ("max_dd", ctypes.c_double), ("sharpe", ctypes.c_double)]
+
+_LIB = None
+
+def lib_path() -> str:
+    return os.environ.get("HFT_NATIVE_LIB") or os.path.join(_ROOT, "cpp", _LIB_NAME)
+
+def load_library(path: Optional[str] = None):
+    """Load (once) and return the shared library; raises OSError if it is not built."""
+    global _LIB
+    if _LIB is not None and path is None:
+        return _LIB
+    lib = ctypes.CDLL(path or lib_path())
+    dbl, size = ctypes.c_double, ctypes.c_size_t
+    lib.hft_run_ewma.argtypes = [ctypes.c_void_p, size, ctypes.c_int, dbl, dbl,
+                                 ctypes.POINTER(_Result), ctypes.c_char_p, size]
+    lib.hft_run_ewma.restype = ctypes.c_int
+    lib.hft_validate.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p, size, dbl, dbl, ctypes.c_void_p,
+                                 ctypes.c_char_p, size]
+    lib.hft_validate.restype = ctypes.c_int64
+    lib.hft_validate_ewma_lanes.argtypes = [ctypes.c_void_p, ctypes.c_void_p, size, ctypes.c_void_p,
+                                            ctypes.c_void_p, size, ctypes.c_void_p, ctypes.c_char_p, size]
+    lib.hft_validate_ewma_lanes.restype = ctypes.c_int
+    if path is None:
+        _LIB = lib
+    return lib
+
+def available() -> bool:
+    try:
+        load_library()
+        return True
+    except OSError:
+        return False
+
+def _f64(x):
+    import numpy as np
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+def run_ewma(prices, window: int = 50, alpha: float = 0.05, threshold: float = 2.5) -> Metrics:
+    """Same computation as ``cpp/backtester --validator=EWMA`` on a price column."""
+    lib = load_library()
+    px = _f64(prices)
+    res = _Result()
+    err = ctypes.create_string_buffer(256)
+    if lib.hft_run_ewma(px.ctypes.data, px.size, int(window), float(alpha), float(threshold),
+                        ctypes.byref(res), err, len(err)) != 0:
+        raise ValueError(err.value.decode())
+    return Metrics(pnl=res.pnl, trades=res.trades, wins=res.wins, max_dd=res.max_dd, sharpe=res.sharpe)
+
+def validate(kind: str, prices, ts=None, p1: float = 0.0, p2: float = 0.0):
+    """Run a fresh cpp/validator.h validator over every tick; returns a bool array.
+
+    Parameters follow the C++ constructors: EWMA(alpha, threshold),
+    Volatility(window, max_vol), Imbalance(threshold), Persistence(hold_ticks).
+    """
+    import numpy as np
+    if kind not in VALIDATOR_KINDS:
+        raise ValueError(f"Unknown validator: {kind}")
+    px = _f64(prices)
+    stamps = None if ts is None else np.ascontiguousarray(ts, dtype=np.uint64)
+    if stamps is not None and stamps.size != px.size:
+        raise ValueError("ts and prices must have the same length")
+    out = np.empty(px.size, dtype=np.bool_)
+    err = ctypes.create_string_buffer(256)
+    if load_library().hft_validate(VALIDATOR_KINDS[kind], px.ctypes.data,
+                                   None if stamps is None else stamps.ctypes.data,
+                                   px.size, float(p1), float(p2), out.ctypes.data, err, len(err)) < 0:
+        raise RuntimeError(err.value.decode())
+    return out
+
+def validate_ewma_lanes(prices, alphas, thresholds):
+    """EWMA flags for many (alpha, threshold) pairs in one pass: an (n, lanes) bool array.
+
+    Column k equals ``validate("EWMA", prices, p1=alphas[k], p2=thresholds[k])``.
+    """
+    import numpy as np
+    px = _f64(prices)
+    a, t = _f64(alphas), _f64(thresholds)
+    if a.shape != t.shape or a.ndim != 1:
+        raise ValueError("alphas and thresholds must be 1-D and the same length")
+    out = np.empty((px.size, a.size), dtype=np.bool_)
+    err = ctypes.create_string_buffer(256)
+    if load_library().hft_validate_ewma_lanes(px.ctypes.data, None, px.size, a.ctypes.data,
+                                              t.ctypes.data, a.size, out.ctypes.data, err, len(err)) != 0:
+        raise RuntimeError(err.value.decode())
+    return out
@@ -0,0 +1,107 @@
+#pragma once
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+
+// Plain-old-data so it can be filled in place through the C API (capi.cpp).
+struct Result {
+    double pnl = 0.0;
+    int trades = 0;
+    int wins = 0;
+    double max_dd = 0.0;
+    double sharpe = 0.0;
+};
+
+// Equity/trade bookkeeping shared by the strategies below. Single pass: return
+// mean/variance for Sharpe are accumulated with Welford instead of a stored vector.
+struct Accum {
+    double pnl = 0.0, peak = 0.0, min_equity = 0.0;
+    int trades = 0, wins = 0;
+    size_t count = 0;
+    double mean = 0.0, m2 = 0.0;
+
+    // pos is held over the tick's return; new_pos is the position after it
+    void step(int pos, int new_pos, double ret) {
+        count++;
+        double d = ret - mean;
+        mean += d / count;
+        m2 += d * (ret - mean);
+        if (new_pos != pos) {
+            trades++;
+            if ((pos==+1 && ret>0) || (pos==-1 && ret<0)) wins++;
+        }
+        pnl += pos * ret;
+        peak = std::max(peak, pnl);
+        min_equity = std::min(min_equity, pnl);
+    }
+
+    Result result() const {
+        double var_r = count > 1 ? m2 / (count - 1) : 0.0;
+        Result R;
+        R.pnl = pnl;
+        R.trades = trades;
+        R.wins = wins;
+        R.max_dd = peak - min_equity;
+        R.sharpe = (std::sqrt((double)count) * (var_r>0? mean/std::sqrt(var_r): 0.0));
+        return R;
+    }
+};
+
+// EWMA band breakout over a contiguous price column.
+static Result run_ewma(const double* px, size_t n, int window, double alpha, double threshold) {
+    if (n < (size_t)window+2) throw std::runtime_error("Not enough data for EWMA");
+    double ewma = px[0];
+    double var = 0.0;
+    int pos = 0;
+    Accum acc;
+
+    for (size_t i=1;i<n;++i) {
+        double p = px[i];
+        double ret = (p - px[i-1]);
+
+        ewma = alpha*p + (1.0-alpha)*ewma;
+        double diff = p - ewma;
+        var = (1.0 - alpha)*(var + alpha*diff*diff);
+
+        double vol = std::sqrt(std::max(var, 1e-12));
+        double upper = ewma + threshold*vol;
+        double lower = ewma - threshold*vol;
+
+        int new_pos = 0;
+        if (p > upper) new_pos = +1;
+        else if (p < lower) new_pos = -1;
+        else new_pos = pos;
+
+        acc.step(pos, new_pos, ret);
+        pos = new_pos;
+    }
+    return acc.result();
+}
+
+// Validator-gated momentum: while the validator passes a tick, hold the direction
+// of that tick's move; otherwise stay flat. Every tick (including the first) is
+// fed to the validator so stateful validators warm up on the full series.
+// Flags come from the validator's validate_batch in fixed-size blocks.
+template <class V>
+static Result run_gated(V& v, const double* px, const int64_t* ts, size_t n) {
+    if (n < 2) throw std::runtime_error("Not enough data");
+    static_assert(sizeof(int64_t) == sizeof(uint64_t), "timestamps are passed through as uint64");
+    const size_t B = 4096;
+    uint8_t flags[B];
+    int pos = 0;
+    Accum acc;
+    for (size_t start = 0; start < n; start += B) {
+        size_t m = std::min(B, n - start);
+        v.validate_batch(px + start, reinterpret_cast<const uint64_t*>(ts + start), m, flags);
+        for (size_t j = (start == 0); j < m; ++j) {
+            size_t i = start + j;
+            double ret = px[i] - px[i-1];
+            int new_pos = flags[j] ? (ret > 0) - (ret < 0) : 0;
+            acc.step(pos, new_pos, ret);
+            pos = new_pos;
+        }
+    }
+    return acc.result();
+}
@@ -0,0 +1,83 @@
+// C ABI over the backtest core and validators, built as libhftcore.so and loaded
+// in-process from Python (core/native/native.py) via ctypes. Inputs are raw
+// pointers into caller-owned buffers (e.g. NumPy arrays); nothing is copied.
+#include <cstdint>
+#include <vector>
+#include <cstring>
+#include <stdexcept>
+#include "backtest.h"
+#include "validator.h"
+
+// No exception may cross the C ABI: ctypes cannot catch it and the Python process would abort.
+static void set_err(char* err, size_t err_len, const char* msg) {
+    if (err && err_len) {
+        std::strncpy(err, msg, err_len - 1);
+        err[err_len - 1] = '\0';
+    }
+}
+
+extern "C" {
+
+// Returns 0 on success, -1 on error (message copied into err when given).
+int hft_run_ewma(const double* px, size_t n, int window, double alpha, double threshold,
+                 Result* out, char* err, size_t err_len) {
+    try {
+        *out = run_ewma(px, n, window, alpha, threshold);
+        return 0;
+    } catch (const std::exception& e) {
+        set_err(err, err_len, e.what());
+        return -1;
+    } catch (...) {
+        set_err(err, err_len, "unknown error");
+        return -1;
+    }
+}
+
+// Runs a fresh validator over n ticks and writes one 0/1 flag per tick into out.
+// kind: 0=EWMA(p1=alpha, p2=threshold), 1=Volatility(p1=window, p2=max_vol),
+//       2=Imbalance(p1=threshold), 3=Persistence(p1=hold_ticks).
+// ts may be null. Returns the number of flagged ticks, or -1 on error (an unknown kind,
+// or a failure such as bad_alloc; message copied into err when given).
+int64_t hft_validate(int kind, const double* px, const uint64_t* ts, size_t n,
+                     double p1, double p2, uint8_t* out, char* err, size_t err_len) {
+    auto run = [&](auto v) {
+        v.validate_batch(px, ts, n, out);
+        int64_t hits = 0;
+        for (size_t i = 0; i < n; ++i) hits += out[i];
+        return hits;
+    };
+    try {
+        switch (kind) {
+            case 0: return run(EWMAValidator(p1, p2));
+            case 1: return run(VolatilityValidator((int)p1, p2));
+            case 2: return run(ImbalanceValidator(p1));
+            case 3: return run(PersistenceValidator((int)p1));
+            default: set_err(err, err_len, "unknown validator kind"); return -1;
+        }
+    } catch (const std::exception& e) {
+        set_err(err, err_len, e.what());
+        return -1;
+    } catch (...) {
+        set_err(err, err_len, "unknown error");
+        return -1;
+    }
+}
+
+// EWMA flags for `lanes` (alpha, threshold) pairs in one pass; out is n x lanes, tick-major.
+// Returns 0 on success, -1 on error (message copied into err when given).
+int hft_validate_ewma_lanes(const double* px, const uint64_t* ts, size_t n, const double* alphas,
+                            const double* thresholds, size_t lanes, uint8_t* out, char* err, size_t err_len) {
+    try {
+        EWMALanes v(std::vector<double>(alphas, alphas + lanes), std::vector<double>(thresholds, thresholds + lanes));
+        v.validate_batch(px, ts, n, out);
+        return 0;
+    } catch (const std::exception& e) {
+        set_err(err, err_len, e.what());
+        return -1;
+    } catch (...) {
+        set_err(err, err_len, "unknown error");
+        return -1;
+    }
+}
+
+}
@@ -0,0 +1,199 @@
+#pragma once
+#include <atomic>
+#include <fstream>
+#include <map>
+#include <ostream>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+#include "backtest.h"
+#include "ticks.h"
+#include "validator.h"
+
+// Parameter sweep over one shared tick column.
+//
+// Grid file: one validator per line followed by key=v1,v2,... lists; every line
+// expands to the cartesian product of its lists. Blank lines and # comments are ignored.
+//
+//   EWMA        alpha=0.02,0.05 threshold=2,2.5,3 window=50
+//   Volatility  window=20,50 max_vol=0.01,0.02
+//   Persistence hold=3,5,8
+//   Imbalance   threshold=0.5,0.6
+//
+// EWMA runs the band-breakout strategy (run_ewma); the validator.h validators
+// gate a momentum position (run_gated). Omitted keys take the constructor defaults.
+
+using Params = std::vector<std::pair<std::string, double>>;
+
+struct SweepJob {
+    std::string validator;
+    Params params;
+};
+
+static const std::map<std::string, Params>& sweep_defaults() {
+    static const std::map<std::string, Params> d = {
+        {"EWMA", {{"alpha", 0.05}, {"threshold", 2.5}, {"window", 50}}},
+        {"Volatility", {{"window", 50}, {"max_vol", 0.02}}},
+        {"Persistence", {{"hold", 3}}},
+        {"Imbalance", {{"threshold", 0.6}}},
+    };
+    return d;
+}
+
+static std::vector<SweepJob> parse_grid(std::istream& in) {
+    std::vector<SweepJob> jobs;
+    std::string line;
+    int lineno = 0;
+    while (std::getline(in, line)) {
+        lineno++;
+        auto hash = line.find('#');
+        if (hash != std::string::npos) line.erase(hash);
+        std::istringstream ss(line);
+        std::string validator, tok;
+        if (!(ss >> validator)) continue;
+        auto def = sweep_defaults().find(validator);
+        if (def == sweep_defaults().end())
+            throw std::runtime_error("grid line " + std::to_string(lineno) + ": unknown validator " + validator);
+        std::vector<std::vector<double>> axes;
+        for (const auto& kv : def->second) axes.push_back({kv.second});
+        while (ss >> tok) {
+            auto eq = tok.find('=');
+            size_t k = 0;
+            while (k < def->second.size() && def->second[k].first != tok.substr(0, eq)) k++;
+            if (eq == std::string::npos || k == def->second.size())
+                throw std::runtime_error("grid line " + std::to_string(lineno) + ": bad parameter " + tok);
+            std::vector<double> vals;
+            std::istringstream vs(tok.substr(eq + 1));
+            std::string v;
+            while (std::getline(vs, v, ',')) {
+                try {
+                    vals.push_back(std::stod(v));
+                } catch (const std::exception&) {
+                    throw std::runtime_error("grid line " + std::to_string(lineno) + ": bad value in " + tok);
+                }
+            }
+            if (vals.empty())
+                throw std::runtime_error("grid line " + std::to_string(lineno) + ": no values for " + tok);
+            axes[k] = vals;
+        }
+        // cartesian product, last axis fastest
+        std::vector<size_t> idx(axes.size(), 0);
+        while (true) {
+            SweepJob job{validator, {}};
+            for (size_t a = 0; a < axes.size(); ++a) job.params.push_back({def->second[a].first, axes[a][idx[a]]});
+            jobs.push_back(std::move(job));
+            size_t a = axes.size();
+            while (a > 0 && ++idx[a - 1] == axes[a - 1].size()) idx[--a] = 0;
+            if (a == 0) break;
+        }
+    }
+    return jobs;
+}
+
+static double param(const SweepJob& job, const std::string& key) {
+    for (const auto& kv : job.params) if (kv.first == key) return kv.second;
+    throw std::runtime_error("missing parameter " + key);
+}
+
+static Result run_job(const SweepJob& job, const Ticks& ticks) {
+    const double* px = ticks.price.data();
+    const int64_t* ts = ticks.ts.data();
+    size_t n = ticks.size();
+    if (job.validator == "EWMA")
+        return run_ewma(px, n, (int)param(job, "window"), param(job, "alpha"), param(job, "threshold"));
+    if (job.validator == "Volatility") {
+        VolatilityValidator v((int)param(job, "window"), param(job, "max_vol"));
+        return run_gated(v, px, ts, n);
+    }
+    if (job.validator == "Persistence") {
+        PersistenceValidator v((int)param(job, "hold"));
+        return run_gated(v, px, ts, n);
+    }
+    ImbalanceValidator v(param(job, "threshold"));
+    return run_gated(v, px, ts, n);
+}
+
+struct SweepResult {
+    Result r;
+    std::string error;  // set instead of r when the job threw (e.g. not enough data)
+};
+
+// Runs every job on `threads` workers pulling from a shared counter; results keep job order.
+static std::vector<SweepResult> run_sweep(const std::vector<SweepJob>& jobs, const Ticks& ticks, unsigned threads) {
+    std::vector<SweepResult> out(jobs.size());
+    std::atomic<size_t> next{0};
+    auto worker = [&]() {
+        for (size_t i = next++; i < jobs.size(); i = next++) {
+            try {
+                out[i].r = run_job(jobs[i], ticks);
+            } catch (const std::exception& e) {
+                out[i].error = e.what();
+            }
+        }
+    };
+    if (threads == 0) threads = std::max(1u, std::thread::hardware_concurrency());
+    threads = (unsigned)std::min<size_t>(threads, std::max<size_t>(jobs.size(), 1));
+    std::vector<std::thread> pool;
+    for (unsigned t = 1; t < threads; ++t) pool.emplace_back(worker);
+    worker();
+    for (auto& t : pool) t.join();
+    return out;
+}
+
+// JSON string body: error messages and names can carry arbitrary grid-file text.
+static std::string json_escape(const std::string& s) {
+    static const char hex[] = "0123456789abcdef";
+    std::string out;
+    out.reserve(s.size());
+    for (unsigned char c : s) {
+        if (c == '"' || c == '\\') {
+            out += '\\';
+            out += (char)c;
+        } else if (c < 0x20) {
+            out += "\\u00";
+            out += hex[c >> 4];
+            out += hex[c & 15];
+        } else {
+            out += (char)c;
+        }
+    }
+    return out;
+}
+
+// One JSON object per line, same keys as the single-run output plus an "error" field on failure.
+static void write_jsonl(std::ostream& os, const std::vector<SweepJob>& jobs, const std::vector<SweepResult>& res) {
+    for (size_t i = 0; i < jobs.size(); ++i) {
+        os << "{\"validator\":\"" << json_escape(jobs[i].validator) << "\",";
+        for (const auto& kv : jobs[i].params) os << "\"" << json_escape(kv.first) << "\":" << kv.second << ",";
+        const Result& R = res[i].r;
+        if (!res[i].error.empty()) {
+            os << "\"error\":\"" << json_escape(res[i].error) << "\"}\n";
+            continue;
+        }
+        os << "\"pnl\":" << R.pnl << ","
+           << "\"trades\":" << R.trades << ","
+           << "\"wins\":" << R.wins << ","
+           << "\"max_dd\":" << R.max_dd << ","
+           << "\"sharpe\":" << R.sharpe
+           << "}\n";
+    }
+}
+
+// Flat table; parameters go in one "k=v;k=v" column since validators take different keys.
+static void write_csv(std::ostream& os, const std::vector<SweepJob>& jobs, const std::vector<SweepResult>& res) {
+    os << "validator,params,pnl,trades,wins,max_dd,sharpe,error\n";
+    for (size_t i = 0; i < jobs.size(); ++i) {
+        os << jobs[i].validator << ",";
+        for (size_t k = 0; k < jobs[i].params.size(); ++k)
+            os << (k ? ";" : "") << jobs[i].params[k].first << "=" << jobs[i].params[k].second;
+        const Result& R = res[i].r;
+        if (!res[i].error.empty()) {
+            os << ",,,,,," << res[i].error << "\n";
+            continue;
+        }
+        os << "," << R.pnl << "," << R.trades << "," << R.wins << "," << R.max_dd << "," << R.sharpe << ",\n";
+    }
+}
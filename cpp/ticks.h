@@ -0,0 +1,120 @@
+#pragma once
+#include <charconv>
+#include <cstdint>
+#include <cstring>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <vector>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+// Struct-of-arrays tick column: int64 timestamps (ns, or row ordinals) and float64 prices.
+struct Ticks {
+    std::vector<int64_t> ts;
+    std::vector<double> price;
+    size_t size() const { return price.size(); }
+};
+
+// Binary tick store shared with app/data.py (csv_to_ticks / open_ticks):
+// 8-byte magic, uint64 count n, then int64 ts[n], then float64 price[n], little endian.
+static const char TICKS_MAGIC[8] = {'H','F','T','T','I','C','K','1'};
+static const size_t TICKS_HEADER = 16;
+
+// Read-only whole-file mapping, unmapped on destruction.
+class MappedFile {
+public:
+    explicit MappedFile(const std::string& path) {
+        int fd = ::open(path.c_str(), O_RDONLY);
+        if (fd < 0) throw std::runtime_error("Failed to open: " + path);
+        struct stat st;
+        if (::fstat(fd, &st) != 0) { ::close(fd); throw std::runtime_error("Failed to stat: " + path); }
+        size_ = (size_t)st.st_size;
+        if (size_ > 0) {
+            void* p = ::mmap(nullptr, size_, PROT_READ, MAP_PRIVATE, fd, 0);
+            if (p == MAP_FAILED) { ::close(fd); throw std::runtime_error("Failed to mmap: " + path); }
+            ::madvise(p, size_, MADV_SEQUENTIAL);
+            data_ = static_cast<const char*>(p);
+        }
+        ::close(fd);
+    }
+    ~MappedFile() { if (data_) ::munmap(const_cast<char*>(data_), size_); }
+    MappedFile(const MappedFile&) = delete;
+    MappedFile& operator=(const MappedFile&) = delete;
+    const char* data() const { return data_; }
+    size_t size() const { return size_; }
+private:
+    const char* data_ = nullptr;
+    size_t size_ = 0;
+};
+
+static bool is_ticks_file(const MappedFile& f) {
+    return f.size() >= sizeof(TICKS_MAGIC) && std::memcmp(f.data(), TICKS_MAGIC, sizeof(TICKS_MAGIC)) == 0;
+}
+
+static Ticks load_ticks_binary(const MappedFile& f, const std::string& path) {
+    uint64_t n = 0;
+    if (f.size() >= TICKS_HEADER) std::memcpy(&n, f.data() + 8, sizeof(n));
+    if (f.size() < TICKS_HEADER || (f.size() - TICKS_HEADER) / 16 < n)
+        throw std::runtime_error("Truncated tick store: " + path);
+    Ticks t;
+    t.ts.resize(n);
+    t.price.resize(n);
+    std::memcpy(t.ts.data(), f.data() + TICKS_HEADER, n * sizeof(int64_t));
+    std::memcpy(t.price.data(), f.data() + TICKS_HEADER + n * sizeof(int64_t), n * sizeof(double));
+    return t;
+}
+
+// time,price CSV. Same row rules as the old getline/stod loader: blank lines and rows
+// without a parseable price are skipped, and the first row whose time field contains
+// "time" is taken as the header. Integer timestamps are kept; anything else (labels
+// such as t1..tN) becomes the row ordinal, decided from the first data row.
+static Ticks load_ticks_csv(const MappedFile& f) {
+    Ticks t;
+    const char* p = f.data();
+    const char* end = p + f.size();
+    size_t est = f.size() / 16 + 1;
+    t.ts.reserve(est);
+    t.price.reserve(est);
+    bool header = true;
+    int int_ts = -1;  // unknown until the first data row
+    while (p < end) {
+        const char* eol = static_cast<const char*>(std::memchr(p, '\n', end - p));
+        if (!eol) eol = end;
+        const char* line_end = (eol > p && eol[-1] == '\r') ? eol - 1 : eol;
+        const char* c1 = static_cast<const char*>(std::memchr(p, ',', line_end - p));
+        if (c1) {
+            const char* tf = p;
+            const char* tf_end = c1;
+            const char* pf = c1 + 1;
+            const char* c2 = static_cast<const char*>(std::memchr(pf, ',', line_end - pf));
+            const char* pf_end = c2 ? c2 : line_end;
+            if (header && std::string_view(tf, tf_end - tf).find("time") != std::string_view::npos) {
+                header = false;
+            } else {
+                while (pf < pf_end && (*pf == ' ' || *pf == '\t')) ++pf;
+                if (pf < pf_end && *pf == '+') ++pf;
+                double px;
+                auto pr = std::from_chars(pf, pf_end, px);
+                if (pr.ec == std::errc()) {
+                    int64_t ts;
+                    auto tr = std::from_chars(tf, tf_end, ts);
+                    bool ok = tr.ec == std::errc() && tr.ptr == tf_end;
+                    if (int_ts < 0) int_ts = ok;
+                    t.ts.push_back(int_ts && ok ? ts : (int64_t)t.price.size());
+                    t.price.push_back(px);
+                }
+            }
+        }
+        p = eol + 1;
+    }
+    return t;
+}
+
+// Loads either format, chosen by the file's magic bytes.
+static Ticks load_ticks(const std::string& path) {
+    MappedFile f(path);
+    return is_ticks_file(f) ? load_ticks_binary(f, path) : load_ticks_csv(f);
+}
@@ -1,19 +1,29 @@
 #pragma once
+#include <algorithm>
 #include <cmath>
-#include <deque>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
 
+// Per-tick validate() stays virtual for callers holding a Validator&. Hot paths
+// use validate_batch() on the concrete (final) type instead: one call per block
+// of ticks, writing a 0/1 flag per tick, with the per-tick step() inlined.
+// ts may be null; none of the validators below read timestamps.
 struct Validator {
     virtual bool validate(double price, uint64_t ts_ns) = 0;
+    virtual void validate_batch(const double* prices, const uint64_t* ts, size_t n, uint8_t* out) {
+        for (size_t i = 0; i < n; ++i) out[i] = validate(prices[i], ts ? ts[i] : 0);
+    }
     virtual ~Validator() = default;
 };
 
-struct EWMAValidator : public Validator {
+struct EWMAValidator final : public Validator {
     double mean = 0.0, var = 1.0;
     bool init = false;
     double alpha;
     double threshold;
     EWMAValidator(double alpha_=0.05, double thr=2.5) : alpha(alpha_), threshold(thr) {}
-    bool validate(double price, uint64_t) override {
+    bool step(double price) {
         if (!init) { mean = price; init = true; return false; }
         double delta = price - mean;
         mean += alpha * delta;
@@ -22,43 +32,132 @@ struct EWMAValidator : public Validator {
         double z = (price - mean) / (1e-9 + stddev);
         return std::fabs(z) > threshold;
     }
+    bool validate(double price, uint64_t) override { return step(price); }
+    void validate_batch(const double* prices, const uint64_t*, size_t n, uint8_t* out) override {
+        size_t i = 0;
+        if (!init && n) out[i++] = step(prices[0]);
+        double m = mean, v = var;  // state in registers for the loop
+        for (; i < n; ++i) {
+            double delta = prices[i] - m;
+            m += alpha * delta;
+            v = (1 - alpha) * (v + alpha * delta * delta);
+            double z = (prices[i] - m) / (1e-9 + std::sqrt(v));
+            out[i] = std::fabs(z) > threshold;
+        }
+        mean = m; var = v;
+    }
+};
+
+// Many EWMA parameterizations over one price stream. State is kept per lane as
+// struct-of-arrays so the inner loop over lanes is branch-free and vectorizable.
+// Lane k matches EWMAValidator(alphas[k], thresholds[k]) bit for bit.
+struct EWMALanes {
+    std::vector<double> alpha, threshold, mean, var;
+    bool init = false;
+    EWMALanes(const std::vector<double>& alphas, const std::vector<double>& thresholds)
+        : alpha(alphas), threshold(thresholds), mean(alphas.size(), 0.0), var(alphas.size(), 1.0) {}
+    size_t lanes() const { return alpha.size(); }
+    // out is tick-major: out[i * lanes() + k] is lane k's flag for tick i
+    void validate_batch(const double* prices, const uint64_t*, size_t n, uint8_t* out) {
+        const size_t L = lanes();
+        const double* __restrict a = alpha.data();
+        const double* __restrict thr = threshold.data();
+        double* __restrict m = mean.data();
+        double* __restrict v = var.data();
+        size_t i = 0;
+        if (!init && n) {
+            for (size_t k = 0; k < L; ++k) { m[k] = prices[0]; out[k] = 0; }
+            init = true;
+            i = 1;
+        }
+        for (; i < n; ++i) {
+            const double p = prices[i];
+            uint8_t* __restrict o = out + i * L;
+            for (size_t k = 0; k < L; ++k) {
+                double delta = p - m[k];
+                m[k] += a[k] * delta;
+                v[k] = (1 - a[k]) * (v[k] + a[k] * delta * delta);
+                double z = (p - m[k]) / (1e-9 + std::sqrt(v[k]));
+                o[k] = std::fabs(z) > thr[k];
+            }
+        }
+    }
 };
 
-struct VolatilityValidator : public Validator {
-    std::deque<double> window;
+// Rolling population std over a fixed-size ring buffer: O(1) per tick via a
+// Welford add / sliding replace. Prices are shifted by a reference level to
+// avoid cancellation, and the stats are recomputed exactly each time the ring wraps.
+struct VolatilityValidator final : public Validator {
+    std::vector<double> ring;
+    size_t count = 0, head = 0;
+    double shift = 0.0, mean = 0.0, m2 = 0.0;  // mean is relative to shift
     int maxSize;
     double maxVol;
-    VolatilityValidator(int win=50, double maxV=0.02) : maxSize(win), maxVol(maxV) {}
-    bool validate(double price, uint64_t) override {
-        window.push_back(price);
-        if ((int)window.size() > maxSize) window.pop_front();
-        if (window.size() < 2) return false;
-        double mean = 0;
-        for (auto v : window) mean += v;
-        mean /= window.size();
-        double var = 0;
-        for (auto v : window) var += (v - mean) * (v - mean);
-        var /= window.size();
-        double stddev = std::sqrt(var);
-        return stddev < maxVol;
+    VolatilityValidator(int win=50, double maxV=0.02)
+        : ring(win > 0 ? win : 1), maxSize(win > 0 ? win : 1), maxVol(maxV) {}
+    void push(double price) {
+        if (count == 0) shift = price;
+        double x = price - shift;
+        if (count < ring.size()) {
+            ring[count++] = x;
+            double d = x - mean;
+            mean += d / count;
+            m2 += d * (x - mean);
+            return;
+        }
+        double old = ring[head];
+        ring[head] = x;
+        head = (head + 1) % ring.size();
+        if (head == 0) {
+            double s = 0.0;
+            for (double v : ring) s += v;
+            s /= count;
+            for (double& v : ring) v -= s;
+            shift += s;
+            mean = 0.0;
+            for (double v : ring) mean += v;
+            mean /= count;
+            m2 = 0.0;
+            for (double v : ring) m2 += (v - mean) * (v - mean);
+        } else {
+            double m0 = mean;
+            mean += (x - old) / count;
+            m2 += (x - old) * (x - mean + old - m0);
+        }
+    }
+    double stddev() const { return std::sqrt(std::max(m2, 0.0) / count); }
+    bool step(double price) {
+        push(price);
+        if (count < 2) return false;
+        return stddev() < maxVol;
+    }
+    bool validate(double price, uint64_t) override { return step(price); }
+    void validate_batch(const double* prices, const uint64_t*, size_t n, uint8_t* out) override {
+        for (size_t i = 0; i < n; ++i) out[i] = step(prices[i]);
     }
 };
 
-struct ImbalanceValidator : public Validator {
+struct ImbalanceValidator final : public Validator {
     double threshold;
     ImbalanceValidator(double thr=0.6) : threshold(thr) {}
-    bool validate(double price, uint64_t ts_ns) override {
+    bool step(double price) const {
         double imbalance = (fmod(price, 2.0) > 1.0) ? 0.7 : 0.4;
         return imbalance > threshold;
     }
+    bool validate(double price, uint64_t) override { return step(price); }
+    void validate_batch(const double* prices, const uint64_t*, size_t n, uint8_t* out) override {
+        // stateless: both outcomes are known up front, leaving a select per tick
+        const uint8_t hi = 0.7 > threshold, lo = 0.4 > threshold;
+        for (size_t i = 0; i < n; ++i) out[i] = std::fmod(prices[i], 2.0) > 1.0 ? hi : lo;
+    }
 };
 
-struct PersistenceValidator : public Validator {
+struct PersistenceValidator final : public Validator {
     int holdTicks;
     int counter = 0;
     bool active = false;
     PersistenceValidator(int h=3) : holdTicks(h) {}
-    bool validate(double price, uint64_t ts_ns) override {
+    bool step(double price) {
         if (price > 100.0) {
             counter++;
             if (counter >= holdTicks) { active = true; }
@@ -68,4 +167,9 @@ struct PersistenceValidator : public Validator {
         }
         return active;
     }
+    bool validate(double price, uint64_t) override { return step(price); }
+    void validate_batch(const double* prices, const uint64_t*, size_t n, uint8_t* out) override {
+        for (size_t i = 0; i < n; ++i) out[i] = step(prices[i]);
+    }
 };
+
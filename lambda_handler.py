@@ -1,8 +1,22 @@
 import json, os
-from app.data import load_prices_csv
+from app.data import file_key, load_prices
 from app.strategies.auto_select import smart_choose_and_run
+
+# Warm-start cache: survives between invocations of a warm container. Keyed on the
+# data file's (path, mtime_ns, size), so replacing the file invalidates it.
+_WARM={"key":None,"prices":None,"decision":None}
+
+def _warm(path):
+    key=file_key(path)
+    if _WARM["key"]!=key:
+        _WARM.update(key=key, prices=load_prices(path), decision=None)
+    return _WARM
+
 def handler(event, context):
-    prices=load_prices_csv(os.environ.get("DATA_PATH","data/sample_prices.csv"))
-    chosen=smart_choose_and_run(prices)
-    return {"statusCode":200,"headers":{"Content-Type":"application/json"},
-            "body": json.dumps({"decision":{"strategy":chosen["strategy"],"params":chosen["params"],"features":chosen["features"]}})}
+    warm=_warm(os.environ.get("DATA_PATH","data/sample_prices.csv"))
+    hit=warm["decision"] is not None
+    if not hit:
+        chosen=smart_choose_and_run(warm["prices"])
+        warm["decision"]={"strategy":chosen["strategy"],"params":chosen["params"],"features":chosen["features"]}
+    return {"statusCode":200,"headers":{"Content-Type":"application/json","X-Cache":"hit" if hit else "miss"},
+            "body": json.dumps({"decision":warm["decision"]})}
@@ -0,0 +1,7 @@
+"""Makes the repo root importable, so modules here can use ``core`` and ``app``
+when run as scripts from python/ (``python python/replay.py ...``)."""
+import pathlib, sys
+
+ROOT = str(pathlib.Path(__file__).resolve().parents[1])
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
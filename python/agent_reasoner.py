@@ -9,13 +9,16 @@ def decide(context):
         return {"validator":"Volatility","reason":"Elevated return volatility; prefer volatility gate"}
     return {"validator":"Persistence","reason":"Spiky moves; require persistence above rolling mean"}
 
-def log_decision(decision, metrics, path):
-    rec = {
+def decision_record(decision, metrics):
+    return {
         "timestamp": int(time.time()),
         "decision": decision.get("validator"),
         "reason": decision.get("reason"),
         "context": metrics
     }
+
+def log_decision(decision, metrics, path):
+    rec = decision_record(decision, metrics)
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "a") as f:
         f.write(json.dumps(rec) + "\n")
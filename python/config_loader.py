@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Tuple, Union
 import json
 
 try:
@@ -48,6 +48,20 @@ def load_config(path: Union[str, Path]) -> StrategySpec:
         raise ValueError("Config root must be an object/dict")
     return StrategySpec(raw=raw, path=str(p))
 
+_SPECS: Dict[str, Tuple[Tuple[int, int], StrategySpec]] = {}
+
+def load_config_cached(path: Union[str, Path]) -> StrategySpec:
+    """``load_config`` memoized per file version: re-parsed only when its mtime or size changes."""
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Config not found: {p}")
+    st = p.stat()
+    key, version = str(p.resolve()), (st.st_mtime_ns, st.st_size)
+    hit = _SPECS.get(key)
+    if hit is None or hit[0] != version:
+        hit = _SPECS[key] = (version, load_config(p))
+    return hit[1]
+
 def get_exec_params(spec: StrategySpec) -> ConfigDict:
     r = spec.raw
     pos = r.get("position", {}).get("sizing", {})
@@ -0,0 +1,120 @@
+"""Signal execution kernel shared by strategy implementations.
+
+Turns per-bar long/short signal arrays into a position path, trade count
+and PnL, honoring the position/execution settings parsed by
+``config_loader.get_exec_params``:
+
+- ``allow_pyramiding``: same-direction signals add ``add_size`` up to ``max_position``
+- ``reverse_mode``: ``"flatten_then_reverse"``, the only supported mode (an
+  opposite signal closes and re-enters the other way)
+- ``same_bar_reverse``: when False, the re-entry of a reversal is placed on the next bar
+
+Trades count entries and adds; flattening alone is not a trade. An entry size
+of 0 never opens a position and an ``add_size`` of 0 never adds.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+import numpy as np
+
+REVERSE_MODES = ("flatten_then_reverse",)
+
+
+def _positions_vectorized(long_sig, short_sig, max_position, initial_size, add_size, allow_pyramiding):
+    # Same-bar flatten-and-reverse: each run of same-direction signals starts from flat,
+    # so the position after the k-th signal of a run depends only on k.
+    n = len(long_sig)
+    pos = np.zeros(n, dtype=np.int64)
+    ev = np.flatnonzero((long_sig | short_sig)[1:]) + 1
+    if ev.size == 0 or min(initial_size, max_position) <= 0:  # nothing ever opens, so nothing adds
+        return pos, 0
+    sign = np.where(long_sig[ev], 1, -1)
+    k = np.arange(ev.size)
+    new_run = np.ones(ev.size, dtype=bool)
+    new_run[1:] = sign[1:] != sign[:-1]
+    rank = k - np.maximum.accumulate(np.where(new_run, k, 0))
+    if allow_pyramiding:
+        size = np.minimum(initial_size + rank * add_size, max_position)
+    else:
+        size = np.full(ev.size, min(initial_size, max_position))
+    size = np.maximum(size, 0)
+    prev = np.where(new_run, 0, np.concatenate(([0], size[:-1])))
+    trades = int(np.count_nonzero(size > prev))
+    last = np.full(n, -1)
+    last[ev] = k
+    np.maximum.accumulate(last, out=last)
+    held = last >= 0
+    pos[held] = (sign * size)[last[held]]
+    return pos, trades
+
+
+def _positions_loop(long_sig, short_sig, max_position, initial_size, add_size,
+                    allow_pyramiding, same_bar_reverse):
+    longs = long_sig.tolist()
+    shorts = short_sig.tolist()
+    n = len(longs)
+    path = [0] * n
+    pos = 0
+    trades = 0
+    pending = 0
+    entry = min(initial_size, max_position)
+    for i in range(1, n):
+        if pending:
+            if pos == 0 and entry > 0:
+                pos = pending * entry
+                trades += 1
+            pending = 0
+        d = 1 if longs[i] else (-1 if shorts[i] else 0)
+        if d:
+            if pos * d < 0:
+                pos = 0
+                if same_bar_reverse:
+                    if entry > 0:
+                        pos = d * entry
+                        trades += 1
+                else:
+                    pending = d
+            elif pos == 0:
+                if entry > 0:
+                    pos = d * entry
+                    trades += 1
+            elif allow_pyramiding and add_size > 0 and abs(pos) < max_position:
+                pos = d * min(abs(pos) + add_size, max_position)
+                trades += 1
+        path[i] = pos
+    return np.asarray(path, dtype=np.int64), trades
+
+
+def execute_signals(
+    long_sig,
+    short_sig,
+    price,
+    max_position: int = 4,
+    *,
+    initial_size: int = 1,
+    add_size: int = 1,
+    allow_pyramiding: bool = True,
+    reverse_mode: str = "flatten_then_reverse",
+    same_bar_reverse: bool = True,
+) -> Dict[str, Any]:
+    """Run long/short signal arrays through the position rules.
+
+    Signals on bar 0 are ignored; a long signal wins when both fire on a bar.
+    Returns ``position`` (per-bar path after that bar's signal), ``trades`` and
+    ``pnl`` (position held over each bar times the price change into it).
+    """
+    if reverse_mode not in REVERSE_MODES:
+        raise ValueError(f"reverse_mode must be one of {REVERSE_MODES}, got {reverse_mode!r}")
+    long_sig = np.asarray(long_sig, dtype=bool)
+    short_sig = np.asarray(short_sig, dtype=bool)
+    price = np.asarray(price, dtype=float)
+    max_position, initial_size, add_size = int(max_position), int(initial_size), int(add_size)
+
+    if same_bar_reverse:
+        pos, trades = _positions_vectorized(long_sig, short_sig, max_position, initial_size,
+                                            add_size, allow_pyramiding)
+    else:
+        pos, trades = _positions_loop(long_sig, short_sig, max_position, initial_size, add_size,
+                                      allow_pyramiding, same_bar_reverse)
+    pnl = float(np.dot(pos[1:], np.diff(price))) if len(price) > 1 else 0.0
+    return {"position": pos, "trades": trades, "pnl": pnl}
@@ -3,25 +3,41 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+def _rolling_extreme(x: np.ndarray, period: int, op) -> np.ndarray:
+    """Trailing-window max/min (expanding over the first ``period-1`` bars) in O(n).
+
+    van Herk/Gil-Werman: split the front-padded series into blocks of ``period``,
+    take per-block prefix and suffix running extremes, and combine one of each.
+    ``op`` is ``np.maximum`` or ``np.minimum``.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n == 0 or period <= 1:
+        return x.copy()
+    fill = -np.inf if op is np.maximum else np.inf
+    m = n + period - 1
+    nblocks = -(-m // period)
+    padded = np.full(nblocks * period, fill)
+    padded[period - 1:m] = x
+    blocks = padded.reshape(nblocks, period)
+    prefix = op.accumulate(blocks, axis=1).ravel()
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return op(suffix[:n], prefix[period - 1:m])
+
 def _stochastic_k(close: np.ndarray, high: np.ndarray, low: np.ndarray, period: int) -> np.ndarray:
-    k = np.zeros_like(close, dtype=float)
-    for i in range(len(close)):
-        s = max(0, i - period + 1)
-        hh = np.max(high[s:i+1])
-        ll = np.min(low[s:i+1])
-        denom = (hh - ll) if (hh - ll) > 1e-12 else 1e-12
-        k[i] = 100.0 * (close[i] - ll) / denom
-    return k
+    hh = _rolling_extreme(high, period, np.maximum)
+    ll = _rolling_extreme(low, period, np.minimum)
+    rng = hh - ll
+    denom = np.where(rng > 1e-12, rng, 1e-12)
+    return 100.0 * (close - ll) / denom
 
 def _sma(x: np.ndarray, n: int) -> np.ndarray:
     if n <= 1:
         return x.astype(float)
-    out = np.zeros_like(x, dtype=float)
     csum = np.cumsum(np.insert(x.astype(float), 0, 0.0))
-    for i in range(len(x)):
-        s = max(0, i - n + 1)
-        out[i] = (csum[i+1] - csum[s]) / (i - s + 1)
-    return out
+    i = np.arange(len(x))
+    s = np.maximum(0, i - n + 1)
+    return (csum[i + 1] - csum[s]) / (i - s + 1)
 
 def compute_kd(df: pd.DataFrame, k_period=9, d_period=3, smooth=3) -> pd.DataFrame:
     close = df["price"].to_numpy(dtype=float)
@@ -44,9 +60,8 @@ def generate_kd_signals(df_kd: pd.DataFrame, oversold=20, overbought=80) -> pd.D
 
     bull = np.zeros(len(df), dtype=bool)
     bear = np.zeros(len(df), dtype=bool)
-    for i in range(1, len(df)):
-        bull[i] = (K[i-1] <= D[i-1]) and (K[i] > D[i])
-        bear[i] = (K[i-1] >= D[i-1]) and (K[i] < D[i])
+    bull[1:] = (K[:-1] <= D[:-1]) & (K[1:] > D[1:])
+    bear[1:] = (K[:-1] >= D[:-1]) & (K[1:] < D[1:])
 
     df["bull_cross"] = bull
     df["bear_cross"] = bear
@@ -1,10 +1,30 @@
 
-import os, json, random
+import os, json, math, random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
 from visualize_metrics import run_pipeline
+from synthetic_market import scenarios
 
 BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 ABS_RESULTS = os.path.join(BASE, 'results')
-ABS_AWS = os.path.join(BASE, 'aws')
+
+# Search space shared by every optimizer: name -> (kind, low, high), bounds inclusive
+SPACE = {
+    'ewma_alpha': ('float', 0.02, 0.10),
+    'ewma_z': ('float', 2.2, 3.2),
+    'vol_window': ('int', 30, 120),
+    'vol_max': ('float', 0.005, 0.015),
+    'persist_hold': ('int', 3, 6),
+    'persist_mean_alpha': ('float', 0.02, 0.10),
+    'persist_z': ('float', 0.18, 0.4),
+    'pos_calm': ('float', 0.6, 1.0),
+    'pos_volatile': ('float', 0.3, 0.6),
+    'pos_jumpy': ('float', 0.2, 0.5),
+    'min_interval_ticks': ('int', 5, 10),
+    'max_trades_per_100': ('int', 10, 18),
+    'confirm': ('int', 2, 3),
+}
 
 def score(metrics):
     agent = metrics['agent']
@@ -15,46 +35,189 @@ def score(metrics):
         + 0.00005 * agent['total_pnl']
     )
 
-def random_search(iters=10, seed=42, n_ticks=3500, baseline_latency=5, agent_latency=2,
-                  cost_bps=0.8, slip_bps=0.5, out_json=None):
-    random.seed(seed)
-    best = None
-    best_score = -1e9
-    for _ in range(iters):
-        params = {
-            'ewma_alpha': random.uniform(0.02, 0.10),
-            'ewma_z': random.uniform(2.2, 3.2),
-            'vol_window': random.randint(30, 120),
-            'vol_max': random.uniform(0.005, 0.015),
-            'persist_hold': random.randint(3, 6),
-            'persist_mean_alpha': random.uniform(0.02, 0.10),
-            'persist_z': random.uniform(0.18, 0.4),
-            'pos_calm': random.uniform(0.6, 1.0),
-            'pos_volatile': random.uniform(0.3, 0.6),
-            'pos_jumpy': random.uniform(0.2, 0.5),
-            'min_interval_ticks': random.randint(5, 10),
-            'max_trades_per_100': random.randint(10, 18),
-            'confirm': random.randint(2, 3),
-        }
-        metrics = run_pipeline(
-            n_ticks=n_ticks,
-            baseline_latency=baseline_latency, agent_latency=agent_latency,
-            cost_bps=cost_bps, slip_bps=slip_bps,
-            generate_artifacts=False,
-            out_dir=ABS_RESULTS, logs_path=os.path.join(ABS_AWS, 'reasoning_logs.jsonl'),
-            **params
-        )
-        s = score(metrics)
-        if s > best_score:
-            best_score = s
-            best = {'score': s, 'params': params, 'metrics': metrics['agent']}
+def sample_params(rng=random):
+    return {k: rng.randint(lo, hi) if kind == 'int' else rng.uniform(lo, hi)
+            for k, (kind, lo, hi) in SPACE.items()}
+
+def evaluate(params, n_ticks=3500, baseline_latency=5, agent_latency=2, cost_bps=0.8, slip_bps=0.5):
+    metrics = run_pipeline(
+        n_ticks=n_ticks,
+        baseline_latency=baseline_latency, agent_latency=agent_latency,
+        cost_bps=cost_bps, slip_bps=slip_bps,
+        generate_artifacts=False, in_memory=True,
+        df=scenarios(n_ticks),
+        **params
+    )
+    return {'score': score(metrics), 'params': params, 'metrics': metrics['agent'], 'n_ticks': n_ticks}
+
+class _Pool:
+    """Evaluates candidates in-process (workers<=1) or on a reused process pool."""
+    def __init__(self, workers=1):
+        self.ex = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    def map(self, params_list, n_ticks, **kw):
+        fn = partial(evaluate, n_ticks=n_ticks, **kw)
+        return list(self.ex.map(fn, params_list)) if self.ex else [fn(p) for p in params_list]
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        if self.ex:
+            self.ex.shutdown()
+
+def _write_best(best, out_json):
     if best:
         os.makedirs(ABS_RESULTS, exist_ok=True)
         out_path = out_json or os.path.join(ABS_RESULTS, 'best_params.json')
         with open(out_path, 'w') as f:
             json.dump(best, f, indent=2)
+
+def _pick(records):
+    # highest score; ties keep the earliest candidate so results are reproducible
+    return max(records, key=lambda r: r['score']) if records else None
+
+def random_search(iters=10, seed=42, n_ticks=3500, baseline_latency=5, agent_latency=2,
+                  cost_bps=0.8, slip_bps=0.5, out_json=None, workers=1):
+    random.seed(seed)
+    candidates = [sample_params() for _ in range(iters)]
+    with _Pool(workers) as pool:
+        records = pool.map(candidates, n_ticks, baseline_latency=baseline_latency,
+                           agent_latency=agent_latency, cost_bps=cost_bps, slip_bps=slip_bps)
+    rec = _pick(records)
+    best = {'score': rec['score'], 'params': rec['params'], 'metrics': rec['metrics']} if rec else None
+    _write_best(best, out_json)
     return best
 
+def _budgets(min_ticks, max_ticks, eta):
+    out = []
+    b = float(min_ticks)
+    while b < max_ticks:
+        out.append(int(round(b)))
+        b *= eta
+    return out + [int(max_ticks)]
+
+def _halving(pool, configs, min_ticks, max_ticks, eta, history, **kw):
+    survivors = list(configs)
+    for b in _budgets(min_ticks, max_ticks, eta):
+        records = pool.map(survivors, b, **kw)
+        history.extend(records)
+        if b >= max_ticks:
+            return _pick(records)
+        order = sorted(range(len(records)), key=lambda i: (-records[i]['score'], i))
+        survivors = [records[i]['params'] for i in order[:max(1, len(records) // eta)]]
+
+def successive_halving(n_configs=27, min_ticks=900, max_ticks=8100, eta=3, seed=42,
+                       workers=1, out_json=None, **pipeline_kwargs):
+    """Successive halving over ``n_ticks`` budgets.
+
+    ``n_configs`` random candidates are scored on ``min_ticks``; the top
+    1/``eta`` move to an ``eta``-times larger budget until ``max_ticks``, so
+    poor candidates are stopped early. Returns the best record at ``max_ticks``
+    plus the full evaluation ``history``.
+    """
+    rng = random.Random(seed)
+    configs = [sample_params(rng) for _ in range(n_configs)]
+    history = []
+    with _Pool(workers) as pool:
+        best = _halving(pool, configs, min_ticks, max_ticks, eta, history, **pipeline_kwargs)
+    _write_best(best, out_json)
+    return {'best': best, 'history': history}
+
+def hyperband(min_ticks=300, max_ticks=8100, eta=3, seed=42, workers=1, out_json=None, **pipeline_kwargs):
+    """Hyperband: successive-halving brackets trading candidate count against starting budget."""
+    rng = random.Random(seed)
+    s_max = int(math.log(max_ticks / min_ticks, eta) + 1e-9)
+    history, finals = [], []
+    with _Pool(workers) as pool:
+        for s in range(s_max, -1, -1):
+            n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+            configs = [sample_params(rng) for _ in range(n)]
+            r = max_ticks / eta ** s
+            finals.append(_halving(pool, configs, r, max_ticks, eta, history, **pipeline_kwargs))
+    best = _pick(finals)
+    _write_best(best, out_json)
+    return {'best': best, 'history': history}
+
+def _to_unit(params):
+    return np.array([(params[k] - lo) / (hi - lo) for k, (_, lo, hi) in SPACE.items()])
+
+def _from_unit(u):
+    out = {}
+    for x, (k, (kind, lo, hi)) in zip(np.clip(u, 0.0, 1.0), SPACE.items()):
+        v = lo + x * (hi - lo)
+        out[k] = int(round(v)) if kind == 'int' else float(v)
+    return out
+
+def _parzen_logpdf(x, centers, bw):
+    # Per-dimension Gaussian mixture over `centers` plus a uniform prior component on [0, 1]
+    n = len(centers)
+    dens = np.exp(-0.5 * ((x[:, None, :] - centers[None, :, :]) / bw) ** 2) / (bw * math.sqrt(2 * math.pi))
+    mix = (dens.sum(axis=1) + 1.0) / (n + 1)
+    return np.log(mix).sum(axis=1)
+
+def _tpe_propose(obs, k, rng, gamma, n_candidates):
+    X = np.array([_to_unit(r['params']) for r in obs])
+    order = np.argsort([-r['score'] for r in obs], kind='stable')
+    n_good = max(1, int(math.ceil(gamma * len(obs))))
+    good, bad = X[order[:n_good]], X[order[n_good:]]
+    bw_good = np.maximum(good.std(axis=0) * len(good) ** -0.2, 0.05) if len(good) > 1 else np.full(X.shape[1], 0.2)
+    bw_bad = np.maximum(bad.std(axis=0) * len(bad) ** -0.2, 0.05) if len(bad) > 1 else np.full(X.shape[1], 0.2)
+    picks = good[rng.integers(0, len(good), size=n_candidates * k)]
+    cand = np.clip(picks + rng.normal(0.0, 1.0, size=picks.shape) * bw_good, 0.0, 1.0)
+    ratio = _parzen_logpdf(cand, good, bw_good) - (_parzen_logpdf(cand, bad, bw_bad) if len(bad) else 0.0)
+    out, seen = [], {json.dumps(r['params'], sort_keys=True) for r in obs}
+    for i in np.argsort(-ratio, kind='stable'):
+        p = _from_unit(cand[i])
+        key = json.dumps(p, sort_keys=True)
+        if key not in seen:
+            seen.add(key); out.append(p)
+        if len(out) == k:
+            break
+    return out
+
+def tpe_search(iters=100, n_startup=20, batch=None, gamma=0.25, n_candidates=64, patience=None,
+               n_ticks=3500, seed=42, workers=1, out_json=None, **pipeline_kwargs):
+    """TPE-style surrogate search over SPACE.
+
+    After ``n_startup`` random candidates, each round fits Parzen densities to
+    the best ``gamma`` fraction and the rest and evaluates the ``batch``
+    candidates (default: ``workers``) with the highest good/bad density ratio.
+    Stops after ``iters`` evaluations or ``patience`` evaluations without improvement.
+    """
+    rng = np.random.default_rng(seed)
+    py_rng = random.Random(seed)
+    batch = batch or max(1, workers)
+    history, best, since_best = [], None, 0
+    with _Pool(workers) as pool:
+        while len(history) < iters:
+            k = min(batch, iters - len(history))
+            if len(history) < n_startup:
+                proposals = [sample_params(py_rng) for _ in range(min(k, n_startup - len(history)))]
+            else:
+                proposals = _tpe_propose(history, k, rng, gamma, n_candidates) or [sample_params(py_rng)]
+            for rec in pool.map(proposals, n_ticks, **pipeline_kwargs):
+                history.append(rec)
+                if best is None or rec['score'] > best['score']:
+                    best, since_best = rec, 0
+                else:
+                    since_best += 1
+            if patience is not None and since_best >= patience:
+                break
+    _write_best(best, out_json)
+    return {'best': best, 'history': history}
+
 if __name__ == '__main__':
-    result = random_search()
+    import argparse
+    ap = argparse.ArgumentParser(description="Validator parameter search")
+    ap.add_argument("--method", choices=["random", "halving", "hyperband", "tpe"], default="random")
+    ap.add_argument("--iters", type=int, default=None, help="Evaluations for random/tpe")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+    if args.method == "random":
+        result = random_search(iters=args.iters or 10, seed=args.seed, workers=args.workers)
+    elif args.method == "halving":
+        result = successive_halving(seed=args.seed, workers=args.workers)['best']
+    elif args.method == "hyperband":
+        result = hyperband(seed=args.seed, workers=args.workers)['best']
+    else:
+        result = tpe_search(iters=args.iters or 100, seed=args.seed, workers=args.workers)['best']
     print('Best:', json.dumps(result, indent=2))
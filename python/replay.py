@@ -0,0 +1,212 @@
+"""Asyncio market replay: publishes ticks at recorded (or accelerated) speed to
+concurrent subscribers and measures whether they keep up.
+
+Each subscriber gets its own bounded queue and consumer task, so a slow one
+backs up (or drops, with ``overflow="drop"``) without stalling the others'
+processing. The report has per-subscriber latency (publish to handler done),
+handler time and queue backlog, plus how far the publisher fell behind schedule.
+
+    python python/replay.py --data data/sample_prices.csv --rate 5000
+"""
+import asyncio, inspect, json, time
+from dataclasses import dataclass
+
+import numpy as np
+
+import _paths  # noqa: F401  (repo root, for core/ and app/)
+from app.data import TickStore, load_prices
+
+DEFAULT_INTERVAL_NS = 1_000_000  # spacing for sources without real timestamps
+
+
+@dataclass(frozen=True)
+class Tick:
+    seq: int
+    ts: int        # event time, ns
+    price: float
+    sent_ns: int   # time.perf_counter_ns() when published
+
+
+def _ordinal(ts):
+    # labels like t1..tN carry no time; tick stores converted from them hold row ordinals
+    return ts is None or (len(ts) > 1 and ts[0] == 0 and ts[-1] == len(ts) - 1 and bool(np.all(np.diff(ts) == 1)))
+
+
+def tick_times(source, interval_ns=None):
+    """(ts_ns, price) arrays for a TickStore, DataFrame, [(time, price)] rows or bare prices.
+
+    Recorded timestamps are used when the source has them (integer ns, datetimes,
+    a DatetimeIndex); otherwise, or when ``interval_ns`` is given, ticks are spaced
+    ``interval_ns`` apart.
+    """
+    import pandas as pd
+    ts = None
+    if isinstance(source, TickStore):
+        ts, price = np.asarray(source.ts, dtype=np.int64), np.asarray(source.price, dtype=np.float64)
+    elif isinstance(source, pd.DataFrame):
+        price = source["price"].to_numpy(dtype=np.float64)
+        col = next((c for c in ("ts", "time") if c in source.columns), None)
+        if col is not None:
+            ts = _parse_times(source[col].tolist())
+        elif isinstance(source.index, pd.DatetimeIndex):
+            ts = source.index.asi8
+    elif len(source) and isinstance(source[0], (tuple, list)):
+        price = np.fromiter((p for _, p in source), dtype=np.float64, count=len(source))
+        ts = _parse_times([t for t, _ in source])
+    else:
+        price = np.asarray(source, dtype=np.float64)
+    if interval_ns is not None or _ordinal(ts):
+        ts = np.arange(len(price), dtype=np.int64) * int(interval_ns or DEFAULT_INTERVAL_NS)
+    return ts, price
+
+
+def _parse_times(values):
+    try:
+        return np.array([int(v) for v in values], dtype=np.int64)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return np.array(values, dtype="datetime64[ns]").astype(np.int64)
+    except (TypeError, ValueError):
+        return None
+
+
+class _SubscriberStats:
+    def __init__(self):
+        self.latency_ns = []
+        self.service_ns = []
+        self.backlog = []
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+
+    def report(self):
+        lat = np.asarray(self.latency_ns, dtype=np.float64) / 1e3
+        svc = np.asarray(self.service_ns, dtype=np.float64) / 1e3
+        backlog = np.asarray(self.backlog)
+        return {
+            "ticks": len(lat),
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "latency_us": {"p50": float(np.percentile(lat, 50)), "p99": float(np.percentile(lat, 99)),
+                           "max": float(lat.max())} if len(lat) else {},
+            "handler_us": {"mean": float(svc.mean()), "max": float(svc.max())} if len(svc) else {},
+            "backlog": {"mean": float(backlog.mean()), "max": int(backlog.max())} if len(backlog) else {},
+        }
+
+
+class Replay:
+    """Replays ticks to ``subscribers`` ({name: handler}); handlers take a Tick and may be coroutines.
+
+    ``speed`` scales recorded time (1.0 real time, 10.0 ten times faster, None as
+    fast as the subscribers allow). ``overflow`` decides what a full subscriber
+    queue does: ``"block"`` holds the publisher back (lag grows), ``"drop"`` skips
+    the tick for that subscriber and counts it. The last ``spin_s`` before each
+    tick is due is spent yielding to the event loop rather than in a timer sleep.
+    """
+    def __init__(self, subscribers, speed=1.0, queue_size=1024, overflow="block", spin_s=1e-3):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"overflow must be 'block' or 'drop', got {overflow!r}")
+        self.subscribers = dict(subscribers)
+        self.speed = speed
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.spin_s = spin_s
+
+    async def _consume(self, handler, queue, stats):
+        while True:
+            tick = await queue.get()
+            if tick is None:
+                return
+            start = time.perf_counter_ns()
+            try:
+                out = handler(tick)
+                if inspect.isawaitable(out):
+                    await out
+            except Exception as exc:  # a failing handler is counted, not allowed to stop the replay
+                stats.errors += 1
+                stats.last_error = f"{type(exc).__name__}: {exc}"
+            end = time.perf_counter_ns()
+            stats.latency_ns.append(end - tick.sent_ns)
+            stats.service_ns.append(end - start)
+
+    async def run(self, source, interval_ns=None):
+        ts, price = tick_times(source, interval_ns)
+        queues = {name: asyncio.Queue(self.queue_size) for name in self.subscribers}
+        stats = {name: _SubscriberStats() for name in self.subscribers}
+        tasks = [asyncio.create_task(self._consume(h, queues[name], stats[name]))
+                 for name, h in self.subscribers.items()]
+        lag = []
+        t0 = time.perf_counter()
+        try:
+            for seq in range(len(price)):
+                if self.speed:
+                    due = t0 + (ts[seq] - ts[0]) / 1e9 / self.speed
+                    ahead = due - time.perf_counter()
+                    # timer sleeps overshoot by up to the loop's resolution: sleep to just short
+                    # of the due time, then keep yielding to the subscribers until it arrives
+                    if ahead > self.spin_s:
+                        await asyncio.sleep(ahead - self.spin_s)
+                    await asyncio.sleep(0)
+                    while time.perf_counter() < due:
+                        await asyncio.sleep(0)
+                    lag.append(max(time.perf_counter() - due, 0.0))
+                else:
+                    await asyncio.sleep(0)
+                tick = Tick(seq, int(ts[seq]), float(price[seq]), time.perf_counter_ns())
+                for name, q in queues.items():
+                    stats[name].backlog.append(q.qsize())
+                    if self.overflow == "drop" and q.full():
+                        stats[name].dropped += 1
+                    else:
+                        await q.put(tick)
+            for q in queues.values():
+                await q.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+        wall = time.perf_counter() - t0
+        span = (ts[-1] - ts[0]) / 1e9 if len(ts) > 1 else 0.0
+        lag_us = np.asarray(lag) * 1e6
+        return {
+            "ticks": int(len(price)),
+            "speed": self.speed,
+            "wall_s": wall,
+            "rate_per_s": len(price) / wall if wall > 0 else 0.0,
+            "target_rate_per_s": (len(price) - 1) / span * self.speed if self.speed and span > 0 else None,
+            "lag_us": {"mean": float(lag_us.mean()), "p99": float(np.percentile(lag_us, 99)),
+                       "max": float(lag_us.max())} if len(lag_us) else {},
+            "subscribers": {name: s.report() for name, s in stats.items()},
+        }
+
+
+def replay(source, subscribers, speed=1.0, interval_ns=None, **kw):
+    """Synchronous wrapper: run a Replay to completion and return its report."""
+    return asyncio.run(Replay(subscribers, speed=speed, **kw).run(source, interval_ns))
+
+
+if __name__ == "__main__":
+    import argparse
+    from validator_sim import EWMAValidator, PersistenceValidator, StreamingSimulator
+    from synthetic_market import labeled_scenarios
+    ap = argparse.ArgumentParser(description="Replay ticks through streaming validators and report latency/backlog")
+    ap.add_argument("--data", help="CSV or tick store (default: synthetic scenarios)")
+    ap.add_argument("--n_ticks", type=int, default=3000, help="Synthetic ticks when --data is not given")
+    ap.add_argument("--speed", type=float, default=1.0, help="Multiple of recorded speed; 0 = as fast as possible")
+    ap.add_argument("--rate", type=float, help="Replay evenly at this many ticks/s instead of recorded times")
+    ap.add_argument("--queue", type=int, default=1024)
+    ap.add_argument("--overflow", choices=["block", "drop"], default="block")
+    args = ap.parse_args()
+
+    source = load_prices(args.data) if args.data else labeled_scenarios(n=args.n_ticks)
+    sims = {"ewma": StreamingSimulator(EWMAValidator(0.05, 2.5, 1.8), latency_ticks=1),
+            "persist": StreamingSimulator(PersistenceValidator(3, 0.05, 0.1), latency_ticks=1)}
+    subs = {name: (lambda tick, s=s: s.on_tick(tick.price)) for name, s in sims.items()}
+    report = replay(source, subs, speed=args.speed or None, queue_size=args.queue, overflow=args.overflow,
+                    interval_ns=int(1e9 / args.rate) if args.rate else None)
+    for s in sims.values():
+        s.close()
+    report["results"] = {name: s.result() for name, s in sims.items()}
+    print(json.dumps(report, indent=2))
@@ -29,3 +29,18 @@ def discover_handlers() -> Dict[str, StrategyHandler]:
         stype = m.group(1)
         handlers[stype] = StrategyHandler(type=stype, module=p.stem, func="run")
     return handlers
+
+_LOADED: Dict[str, Callable[..., Dict[str, Any]]] = {}
+
+def resolve_handler(stype: str) -> Callable[..., Dict[str, Any]]:
+    """Loaded run callable for ``stype``; discovery only runs again for types not resolved yet."""
+    fn = _LOADED.get(stype)
+    if fn is None:
+        handlers = discover_handlers()
+        if stype not in handlers:
+            raise ValueError(
+                f"Unknown strategy.type='{stype}'. "
+                f"Available types: {sorted(handlers.keys())}"
+            )
+        fn = _LOADED[stype] = handlers[stype].load()
+    return fn
@@ -1,35 +1,97 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Sequence
 import json
 
-from config_loader import load_config, StrategySpec
-from synthetic_market import labeled_scenarios
-from strategy_registry import discover_handlers
+import pandas as pd
 
-def run_from_config(config_path: str, n_ticks: int = 3000) -> Dict[str, Any]:
-    spec: StrategySpec = load_config(config_path)
-    handlers = discover_handlers()
-
-    if spec.type not in handlers:
-        raise ValueError(
-            f"Unknown strategy.type='{spec.type}'. "
-            f"Available types: {sorted(handlers.keys())}"
-        )
+from config_loader import load_config_cached, StrategySpec
+from synthetic_market import frame_copy, scenarios
+from strategy_registry import resolve_handler
 
-    handler = handlers[spec.type].load()
-    df = labeled_scenarios(n=n_ticks)
+def run_from_config(config_path: str, n_ticks: int = 3000) -> Dict[str, Any]:
+    spec: StrategySpec = load_config_cached(config_path)
+    handler = resolve_handler(spec.type)
+    df = scenarios(n_ticks)
 
     result = handler(spec, df)
     result["config_path"] = str(Path(config_path).resolve())
     result["n_ticks"] = int(n_ticks)
     return result
 
+_WORKER: Dict[str, Any] = {}
+
+def _init_worker(df: pd.DataFrame, types: Sequence[str]) -> None:
+    # once per process: the frame arrives with the pool (inherited, not pickled, under fork)
+    # and every handler the batch needs is imported up front
+    _WORKER["df"] = df
+    _WORKER["handlers"] = {t: resolve_handler(t) for t in types}
+
+def _run_in_worker(spec: StrategySpec) -> Dict[str, Any]:
+    return _WORKER["handlers"][spec.type](spec, frame_copy(_WORKER["df"]))
+
+def run_configs(
+    specs: Sequence[StrategySpec],
+    df: pd.DataFrame,
+    workers: int = 1,
+    processes: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Run every spec on ``df``; results come back in ``specs`` order.
+
+    Handlers are resolved once (an unknown type fails before anything runs).
+    With ``workers > 1`` the specs fan out over a process pool that receives
+    ``df`` once per worker, so tasks carry only the spec, or over threads with
+    ``processes=False``. Each run gets a ``frame_copy``, so handlers editing
+    the frame never see each other's changes. ``progress(done, total)`` is
+    called as runs finish; raising from it abandons the runs not started yet.
+    """
+    handlers = {s.type: resolve_handler(s.type) for s in specs}
+    n = len(specs)
+    out: List[Optional[Dict[str, Any]]] = [None] * n
+    if workers <= 1 or n <= 1:
+        for i, spec in enumerate(specs):
+            out[i] = handlers[spec.type](spec, frame_copy(df))
+            if progress:
+                progress(i + 1, n)
+        return out
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+    if processes:
+        ex = ProcessPoolExecutor(min(workers, n), initializer=_init_worker, initargs=(df, sorted(handlers)))
+        futures = {ex.submit(_run_in_worker, spec): i for i, spec in enumerate(specs)}
+    else:
+        ex = ThreadPoolExecutor(min(workers, n), thread_name_prefix="strategy")
+        futures = {ex.submit(handlers[spec.type], spec, frame_copy(df)): i for i, spec in enumerate(specs)}
+    try:
+        for done, f in enumerate(as_completed(futures), 1):
+            out[futures[f]] = f.result()
+            if progress:
+                progress(done, n)
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+    return out
+
+def run_batch(config_paths: Sequence[str], n_ticks: int = 3000, workers: int = 1,
+              processes: bool = True) -> List[Dict[str, Any]]:
+    """``run_from_config`` for many configs on one shared scenario frame, in ``config_paths`` order."""
+    specs = [load_config_cached(p) for p in config_paths]
+    results = run_configs(specs, scenarios(n_ticks), workers=workers, processes=processes)
+    for path, result in zip(config_paths, results):
+        result["config_path"] = str(Path(path).resolve())
+        result["n_ticks"] = int(n_ticks)
+    return results
+
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser()
-    ap.add_argument("--config", required=True, help="Path to strategy YAML/JSON")
+    ap.add_argument("--config", required=True, nargs="+", help="Path(s) to strategy YAML/JSON")
     ap.add_argument("--n_ticks", type=int, default=3000)
+    ap.add_argument("--workers", type=int, default=1, help="Run several configs in parallel processes")
+    ap.add_argument("--threads", action="store_true", help="Use threads instead of processes for --workers")
     args = ap.parse_args()
-    out = run_from_config(args.config, n_ticks=args.n_ticks)
+    if len(args.config) == 1:
+        out = run_from_config(args.config[0], n_ticks=args.n_ticks)
+    else:
+        out = run_batch(args.config, n_ticks=args.n_ticks, workers=args.workers, processes=not args.threads)
     print(json.dumps(out, ensure_ascii=False, indent=2))
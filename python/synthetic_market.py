@@ -1,30 +1,428 @@
 
+import hashlib, json, os, shutil, tempfile, threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 
-def _gbm(n, s0=100.0, mu=0.0, sigma=0.01):
+import _paths  # noqa: F401  (repo root, for core/ and app/)
+from app.data import create_ticks, open_ticks
+
+REGIMES = ("calm_trend", "volatile", "jumpy")
+
+def _gbm(n, s0=100.0, mu=0.0, sigma=0.01, rs=np.random):
     dt = 1.0
-    returns = np.random.normal((mu - 0.5*sigma**2)*dt, sigma*np.sqrt(dt), size=n)
+    returns = rs.normal((mu - 0.5*sigma**2)*dt, sigma*np.sqrt(dt), size=n)
     price = s0 * np.exp(np.cumsum(returns))
     return price
 
 def labeled_scenarios(n=3000, seed=123):
-    np.random.seed(seed)
+    # legacy MT19937 stream, so series match what the old global np.random.seed produced
+    rs = np.random.RandomState(seed)
     # split into 3 regimes: calm_trend, volatile, jumpy
     n1 = n//3
     n2 = n//3
     n3 = n - n1 - n2
 
     # calm trending up (low vol)
-    p1 = _gbm(n1, s0=100.0, mu=0.002, sigma=0.005)
+    p1 = _gbm(n1, s0=100.0, mu=0.002, sigma=0.005, rs=rs)
     # volatile sideways (higher vol)
-    p2 = _gbm(n2, s0=float(p1[-1]), mu=0.0, sigma=0.02)
+    p2 = _gbm(n2, s0=float(p1[-1]), mu=0.0, sigma=0.02, rs=rs)
     # jumpy (vol clusters + jumps)
-    base = _gbm(n3, s0=float(p2[-1]), mu=0.0, sigma=0.015)
-    jumps = np.random.choice([0.0, 0.02, -0.02, 0.04, -0.04], size=n3, p=[0.94,0.02,0.02,0.01,0.01])
+    base = _gbm(n3, s0=float(p2[-1]), mu=0.0, sigma=0.015, rs=rs)
+    jumps = rs.choice([0.0, 0.02, -0.02, 0.04, -0.04], size=n3, p=[0.94,0.02,0.02,0.01,0.01])
     base *= np.cumprod(1.0 + jumps)
 
     price = np.concatenate([p1, p2, base])
-    regime = (["calm_trend"]*n1) + (["volatile"]*n2) + (["jumpy"]*n3)
-    df = pd.DataFrame({"price": price, "regime": regime})
+    codes = np.repeat(np.arange(3, dtype=np.int8), [n1, n2, n3])
+    df = pd.DataFrame({"price": price, "regime": pd.Categorical.from_codes(codes, REGIMES)})
     return df
+
+def regime_index(df):
+    """{regime: [(start, stop), ...]} contiguous runs of ``df["regime"]`` in order of first appearance.
+
+    One vectorized pass over the regime codes. Not cached on the frame: ``df.attrs``
+    is carried into slices and filtered frames, where the runs would be stale.
+    """
+    col = df["regime"]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes, names = col.cat.codes.to_numpy(), col.cat.categories
+    else:
+        codes, names = pd.factorize(col)
+    bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate([[0], bounds]) if len(codes) else bounds
+    idx = {}
+    for s, e in zip(starts.tolist(), np.append(bounds, len(codes)).tolist()):
+        if codes[s] >= 0:
+            idx.setdefault(names[codes[s]], []).append((s, e))
+    return idx
+
+def regime_prices(price, runs):
+    # a view when the regime is one contiguous run, otherwise its runs concatenated in order
+    if len(runs) == 1:
+        return price[runs[0][0]:runs[0][1]]
+    return np.concatenate([price[s:e] for s, e in runs])
+
+# --- Chunked, seeded generator for long series ---
+
+@dataclass(frozen=True)
+class Regime:
+    # per-tick log-return parameters
+    name: str
+    mu: float = 0.0
+    sigma: float = 1e-4
+    trend: float = 0.0                     # extra drift whose sign is drawn per segment
+    jump_intensity: float = 0.0            # probability of a jump on any tick
+    jump_sizes: tuple = (0.002, -0.002, 0.004, -0.004)
+    jump_probs: tuple = (1/3, 1/3, 1/6, 1/6)  # size distribution given a jump
+
+# tick-scale counterparts of labeled_scenarios' regimes; driftless overall, so long series stay bounded
+DEFAULT_REGIMES = (
+    Regime("calm_trend", sigma=1e-4, trend=5e-6),
+    Regime("volatile", sigma=4e-4),
+    Regime("jumpy", sigma=3e-4, jump_intensity=1e-3),
+)
+
+class MarketGenerator:
+    """Regime-switching log-normal random walk with jumps, produced in fixed-size chunks.
+
+    The regime path is either a per-tick Markov chain (``transition`` matrix, or
+    ``switch_prob`` spread evenly over the other regimes) or explicit ``segments``
+    [(name, length), ...] repeated to fill ``n`` (trends then point up). It is drawn segment by segment,
+    so it is cheap even for 100M ticks. Chunk ``k`` draws its returns from its own
+    ``SeedSequence(seed, spawn_key=(1, k))`` stream, so any chunk can be rebuilt
+    independently and workers can fill disjoint slices. The output depends on
+    ``seed`` and ``chunk_size``, not on how the chunks are scheduled.
+    """
+    def __init__(self, n, regimes=DEFAULT_REGIMES, transition=None, switch_prob=1e-3, segments=None,
+                 seed=123, chunk_size=1 << 20, s0=100.0, tick_ns=1_000_000, start_ns=0):
+        self.n = int(n)
+        self.regimes = tuple(regimes)
+        self.names = tuple(r.name for r in self.regimes)
+        k = len(self.regimes)
+        if transition is None:
+            transition = np.full((k, k), switch_prob / max(k - 1, 1))
+            np.fill_diagonal(transition, 1.0 - switch_prob if k > 1 else 1.0)
+        self.transition = np.asarray(transition, dtype=np.float64)
+        if self.transition.shape != (k, k) or not np.allclose(self.transition.sum(axis=1), 1.0):
+            raise ValueError(f"transition must be a {k}x{k} row-stochastic matrix")
+        if segments is not None:
+            segments = [(name, int(length)) for name, length in segments]
+            if not segments:
+                raise ValueError("segments must list at least one (name, length) pair")
+            for name, length in segments:
+                if name not in self.names:
+                    raise ValueError(f"unknown regime {name!r} in segments; expected one of {self.names}")
+                if length < 1:
+                    raise ValueError(f"segment lengths must be >= 1, got {length} for {name!r}")
+        self.segments = segments
+        self.seed = seed
+        self.chunk_size = int(chunk_size)
+        self.s0 = s0
+        self.tick_ns = tick_ns
+        self.start_ns = start_ns
+        self._schedule = None
+
+    def cache_key(self):
+        return ("MarketGenerator", self.n, tuple(map(repr, self.regimes)), tuple(map(tuple, self.transition.tolist())),
+                tuple(map(tuple, self.segments)) if self.segments else None,
+                self.seed, self.chunk_size, self.s0, self.tick_ns, self.start_ns)
+
+    def _rng(self, *key):
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=key))
+
+    @property
+    def n_chunks(self):
+        return -(-self.n // self.chunk_size)
+
+    def schedule(self):
+        """(starts, codes, signs): where each regime segment begins, its regime code and trend sign."""
+        if self._schedule is None:
+            starts, codes, signs, pos = [], [], [], 0
+            if self.segments:
+                idx = {name: c for c, name in enumerate(self.names)}
+                while pos < self.n:
+                    for name, length in self.segments:
+                        if pos >= self.n:
+                            break
+                        starts.append(pos); codes.append(idx[name]); signs.append(1); pos += length
+            else:
+                rng = self._rng(0)
+                stay = np.diag(self.transition)
+                others = self.transition.copy()
+                np.fill_diagonal(others, 0.0)
+                cum = np.cumsum(others / np.maximum(others.sum(axis=1, keepdims=True), 1e-300), axis=1)
+                c = int(rng.integers(len(self.regimes)))
+                while pos < self.n:
+                    starts.append(pos); codes.append(c); signs.append(1 if rng.random() < 0.5 else -1)
+                    pos += int(rng.geometric(1.0 - stay[c])) if stay[c] < 1.0 else self.n
+                    c = min(int(np.searchsorted(cum[c], rng.random(), side="right")), len(self.regimes) - 1)
+            self._schedule = (np.asarray(starts, dtype=np.int64), np.asarray(codes, dtype=np.int8),
+                              np.asarray(signs, dtype=np.int8))
+        return self._schedule
+
+    def _segments(self, lo, hi):
+        starts = self.schedule()[0]
+        return np.searchsorted(starts, np.arange(lo, hi), side="right") - 1
+
+    def codes(self, lo, hi):
+        return self.schedule()[1][self._segments(lo, hi)]
+
+    def log_returns(self, k):
+        """(codes, log returns) for chunk ``k``; depends only on the seed, the schedule and ``k``."""
+        lo = k * self.chunk_size
+        hi = min(lo + self.chunk_size, self.n)
+        seg = self._segments(lo, hi)
+        _, seg_codes, seg_signs = self.schedule()
+        codes = seg_codes[seg]
+        rng = self._rng(1, k)
+        mu = np.array([r.mu for r in self.regimes])
+        sigma = np.array([r.sigma for r in self.regimes])
+        trend = np.array([r.trend for r in self.regimes])
+        out = mu[codes] + trend[codes] * seg_signs[seg] + sigma[codes] * rng.standard_normal(hi - lo)
+        u = rng.random(hi - lo)
+        for c, r in enumerate(self.regimes):
+            if r.jump_intensity > 0:
+                hit = np.flatnonzero((codes == c) & (u < r.jump_intensity))
+                out[hit] += np.log1p(rng.choice(r.jump_sizes, size=len(hit), p=r.jump_probs))
+        return codes, out
+
+    def chunks(self):
+        """Yield DataFrame chunks (ts, price, categorical regime) with the price level carried across."""
+        level = np.log(self.s0)
+        for k in range(self.n_chunks):
+            codes, r = self.log_returns(k)
+            lp = level + np.cumsum(r)
+            level = lp[-1]
+            lo = k * self.chunk_size
+            yield pd.DataFrame({
+                "ts": self.start_ns + np.arange(lo, lo + len(r), dtype=np.int64) * self.tick_ns,
+                "price": np.exp(lp),
+                "regime": pd.Categorical.from_codes(codes, self.names),
+            }, index=pd.RangeIndex(lo, lo + len(r)))
+
+    def frame(self):
+        return pd.concat(list(self.chunks())) if self.n else pd.DataFrame(
+            {"ts": np.zeros(0, np.int64), "price": np.zeros(0), "regime": pd.Categorical([], self.names)})
+
+    def write_ticks(self, path, workers=1, regimes_path=None):
+        """Write the series to a tick store (app/data.py format); regime codes optionally to an int8 ``.npy``.
+
+        With ``workers > 1`` chunks are generated in a process pool straight into
+        the memmapped store: first each chunk's cumulative log return, then, once
+        the chunk offsets are known, the prices.
+        """
+        store = create_ticks(path, self.n)
+        if regimes_path:
+            np.lib.format.open_memmap(regimes_path, mode="w+", dtype=np.int8, shape=(self.n,)).flush()
+        self.schedule()
+        ks = range(self.n_chunks)
+        if workers and workers > 1 and self.n_chunks > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                totals = list(ex.map(_write_log_chunk, [self] * len(ks), [path] * len(ks), ks, [regimes_path] * len(ks)))
+                offsets, level = [], np.log(self.s0)
+                for total in totals:  # same order of additions as the sequential path
+                    offsets.append(level); level += total
+                list(ex.map(_finish_chunk, [self] * len(ks), [path] * len(ks), ks, offsets))
+        else:
+            level = np.log(self.s0)
+            for k in ks:
+                _write_log_chunk(self, path, k, regimes_path, store)
+                level = _finish_chunk(self, path, k, level, store)
+        return self.n
+
+# --- Process-wide scenario cache ---
+
+def _copy_on_write():
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True  # always on; reading the option only warns
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:  # pandas < 2 has no Copy-on-Write
+        return False
+
+def frame_copy(df):
+    """A copy of ``df`` that callers may edit without touching ``df``.
+
+    Shallow under pandas Copy-on-Write (always on from pandas 3, opt-in on 2.x),
+    deep otherwise, where writes through a shallow copy reach the original.
+    """
+    return df.copy(deep=not _copy_on_write())
+
+class ScenarioCache:
+    """Generated scenario frames keyed on their generator parameters, LRU-evicted by bytes.
+
+    ``get`` returns a ``frame_copy``, so callers may add or edit columns
+    without touching the cached frame. With ``spill_dir`` each new frame
+    is also written there as one ``.npy`` per column, so other processes (pool
+    workers, restarted apps) load it instead of regenerating; that tier is
+    trimmed oldest first to ``max_disk_bytes``.
+    """
+    def __init__(self, max_bytes=256 << 20, spill_dir=None, max_disk_bytes=1 << 30):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._mem = OrderedDict()  # key -> (frame, nbytes)
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    @staticmethod
+    def _name(key):
+        return hashlib.blake2b(json.dumps(key, default=repr).encode(), digest_size=16).hexdigest()
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return frame_copy(self._mem[key][0])
+        df = self._load(key)
+        if df is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            df = build()
+            with self._lock:
+                self.misses += 1
+            self._spill(key, df)
+        self._remember(key, df)
+        return frame_copy(df)
+
+    def _remember(self, key, df):
+        size = int(df.memory_usage(index=True).sum())
+        with self._lock:
+            if key in self._mem or size > self.max_bytes:
+                return
+            self._mem[key] = (df, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, old) = self._mem.popitem(last=False)
+                self.nbytes -= old
+
+    def keys(self):
+        with self._lock:
+            return list(self._mem)
+
+    def _spill(self, key, df):
+        if not self.spill_dir:
+            return
+        tmp = None
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            tmp = tempfile.mkdtemp(dir=self.spill_dir, suffix=".tmp")
+            meta = {"columns": [], "categories": {}}
+            for col in df.columns:
+                values = df[col]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    meta["categories"][col] = values.cat.categories.tolist()
+                    values = values.cat.codes
+                np.save(os.path.join(tmp, f"{len(meta['columns'])}.npy"), values.to_numpy())
+                meta["columns"].append(col)
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp, os.path.join(self.spill_dir, self._name(key)))
+            self._trim_disk()
+        except OSError:  # the spill is best effort (read-only disk, another process won the rename)
+            if tmp:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def _load(self, key):
+        if not self.spill_dir:
+            return None
+        path = os.path.join(self.spill_dir, self._name(key))
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            cols = {}
+            for i, col in enumerate(meta["columns"]):
+                values = np.load(os.path.join(path, f"{i}.npy"))
+                if col in meta["categories"]:
+                    values = pd.Categorical.from_codes(values, meta["categories"][col])
+                cols[col] = values
+            os.utime(path)  # recency for trimming
+        except (OSError, ValueError, KeyError):
+            return None
+        return pd.DataFrame(cols)
+
+    def _trim_disk(self):
+        entries = []
+        for e in os.scandir(self.spill_dir):
+            if e.is_dir() and not e.name.endswith(".tmp"):
+                size = sum(f.stat().st_size for f in os.scandir(e.path))
+                entries.append((e.stat().st_mtime_ns, size, e.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._mem.clear()
+            self.nbytes = 0
+        if disk and self.spill_dir and os.path.isdir(self.spill_dir):
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+_CACHE = None
+
+def scenario_cache():
+    """Process-wide ScenarioCache from ``HFT_SCENARIO_CACHE_BYTES`` (default 256 MiB) and ``HFT_SCENARIO_DIR`` (spill, off by default)."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ScenarioCache(max_bytes=int(os.environ.get("HFT_SCENARIO_CACHE_BYTES", 256 << 20)),
+                               spill_dir=os.environ.get("HFT_SCENARIO_DIR") or None)
+    return _CACHE
+
+def scenarios(n=3000, seed=123):
+    """Memoized ``labeled_scenarios(n, seed)``."""
+    n, seed = int(n), int(seed)
+    return scenario_cache().get(("labeled_scenarios", n, seed), lambda: labeled_scenarios(n=n, seed=seed))
+
+def generated_frame(gen):
+    """Memoized ``gen.frame()`` for a MarketGenerator."""
+    return scenario_cache().get(gen.cache_key(), gen.frame)
+
+def _write_log_chunk(gen, path, k, regimes_path=None, store=None):
+    # fills the chunk's timestamps; its prices temporarily hold the cumulative log return (returned total)
+    store = store or open_ticks(path, mode="r+")
+    lo = k * gen.chunk_size
+    codes, r = gen.log_returns(k)
+    cum = np.cumsum(r)
+    store.ts[lo:lo + len(r)] = gen.start_ns + np.arange(lo, lo + len(r), dtype=np.int64) * gen.tick_ns
+    store.price[lo:lo + len(r)] = cum
+    store.ts.flush(); store.price.flush()
+    if regimes_path:
+        reg = np.load(regimes_path, mmap_mode="r+")
+        reg[lo:lo + len(r)] = codes
+        reg.flush()
+    return float(cum[-1])
+
+def _finish_chunk(gen, path, k, offset, store=None):
+    # shifts the chunk by the log level at its start and exponentiates; returns the level at its end
+    store = store or open_ticks(path, mode="r+")
+    lo = k * gen.chunk_size
+    seg = store.price[lo:min(lo + gen.chunk_size, gen.n)]
+    last = offset + float(seg[-1])
+    seg[:] = np.exp(offset + seg)
+    store.price.flush()
+    return last
+
+if __name__ == "__main__":
+    import argparse, time
+    ap = argparse.ArgumentParser(description="Generate a regime-switching synthetic tick series")
+    ap.add_argument("--n", type=int, default=1_000_000)
+    ap.add_argument("--out", required=True, help="Tick store path (see app/data.py)")
+    ap.add_argument("--regimes-out", help="Optional int8 .npy of regime codes (%s)" % ", ".join(REGIMES))
+    ap.add_argument("--switch-prob", type=float, default=1e-3, help="Per-tick regime switch probability")
+    ap.add_argument("--chunk", type=int, default=1 << 20)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=123)
+    args = ap.parse_args()
+    gen = MarketGenerator(args.n, switch_prob=args.switch_prob, seed=args.seed, chunk_size=args.chunk)
+    t0 = time.perf_counter()
+    gen.write_ticks(args.out, workers=args.workers, regimes_path=args.regimes_out)
+    print(f"wrote {args.n} ticks in {len(gen.schedule()[0])} regime segments to {args.out} "
+          f"in {time.perf_counter() - t0:.2f}s")
@@ -1,7 +1,12 @@
 
+from collections import deque
+
 import numpy as np
 import pandas as pd
 
+import _paths  # noqa: F401  (repo root, for core/ and app/)
+from core.metrics.metrics import MetricsAccumulator
+
 class EWMAValidator:
     def __init__(self, alpha=0.05, z_enter=2.5, z_exit=1.8):
         self.alpha = alpha
@@ -28,23 +33,49 @@ class EWMAValidator:
         return fired
 
 class VolatilityValidator:
+    """Rolling std of returns over a fixed-size ring buffer.
+
+    Mean/M2 are updated in O(1) per tick (Welford add, then a sliding
+    replace once the window is full) and recomputed exactly each time the
+    ring wraps, so rounding drift cannot build up over long runs.
+    """
     def __init__(self, window=50, max_vol=0.01):
-        self.window = window
+        self.window = window if window > 0 else 1  # as the C++ port; fewer than 5 returns never validates
         self.max_vol = max_vol
-        self.buf = []
+        self.buf = [0.0] * self.window
+        self.n = 0
+        self.head = 0
+        self.mean = 0.0
+        self.m2 = 0.0
         self.prev = None
+    def _push(self, r):
+        if self.n < self.window:
+            self.buf[self.n] = r
+            self.n += 1
+            d = r - self.mean
+            self.mean += d / self.n
+            self.m2 += d * (r - self.mean)
+            return
+        old = self.buf[self.head]
+        self.buf[self.head] = r
+        self.head = (self.head + 1) % self.window
+        if self.head == 0:
+            self.mean = sum(self.buf) / self.n
+            self.m2 = sum((v - self.mean) ** 2 for v in self.buf)
+        else:
+            m0 = self.mean
+            self.mean += (r - old) / self.n
+            self.m2 += (r - old) * (r - self.mean + old - m0)
     def step(self, x):
         if self.prev is None:
             self.prev = x
             return False
         ret = (x - self.prev) / max(self.prev, 1e-9)
         self.prev = x
-        self.buf.append(ret)
-        if len(self.buf) > self.window:
-            self.buf.pop(0)
-        if len(self.buf) < 5:
+        self._push(ret)
+        if self.n < 5:
             return False
-        std = float(np.std(self.buf))
+        std = (max(self.m2, 0.0) / self.n) ** 0.5
         return std < self.max_vol
 
 class PersistenceValidator:
@@ -78,59 +109,318 @@ class ConfirmWrapper:
             self.c = 0
         return self.c >= self.confirm
 
-def simulate(df, validator, latency_ticks=1, cost_bps=0.5, slip_bps=0.3, position=1.0,
+class _Gate:
+    """Trade gating: at least ``min_interval`` ticks apart, at most ``max_per_100`` per 100-tick block."""
+    def __init__(self, min_interval_ticks=5, max_trades_per_100=15):
+        self.min_interval = min_interval_ticks
+        self.max_per_100 = max_trades_per_100
+        self.last = -10**9
+        self.block = -1
+        self.count = 0
+    def take(self, i):
+        if i // 100 != self.block:
+            self.block = i // 100
+            self.count = 0
+        if (i - self.last) < self.min_interval or self.count >= self.max_per_100:
+            return False
+        self.last = i
+        self.count += 1
+        return True
+
+class _TradeMetrics:
+    """Running per-trade equity metrics (equity starts at 0.0), shared by the batch and streaming engines."""
+    def __init__(self):
+        self.acc = MetricsAccumulator(0.0)
+        self.losses = 0
+        self.rec = 0
+        self.in_dd = False
+        self.start = 0
+    def add(self, trade_pnl):
+        acc = self.acc
+        peak, dd = acc.peak, acc.max_dd
+        acc.add(trade_pnl)
+        self.losses += trade_pnl < 0
+        idx = acc.count - 1
+        if acc.peak > peak:
+            self.in_dd = False
+        if acc.max_dd > dd:
+            self.in_dd = True; self.start = idx
+        if self.in_dd and acc.last >= acc.peak - 1e-12:
+            self.rec = max(self.rec, idx - self.start); self.in_dd = False
+    def summary(self):
+        acc = self.acc
+        n_tr = acc.count
+        return {
+            "total_pnl": float(acc.last),
+            "trades": n_tr,
+            "fsr": float(self.losses / n_tr) if n_tr else 0.0,
+            "sharpe_like": float(acc.mean / (acc.variance(ddof=0) ** 0.5 + 1e-12)) if n_tr > 1 else 0.0,
+            "dd_recovery_ticks": int(self.rec),
+        }
+
+def _execute(price, hits, latency_ticks=1, cost_bps=0.5, slip_bps=0.3, position=1.0,
              min_interval_ticks=5, max_trades_per_100=15):
-    price = df["price"].values
-    trades = []
-    pnl_series = []
-    last_trade_idx = -10**9
+    # Gate the validator's signal ticks, fill them with latency and summarize.
+    n = len(price)
     bps_factor = (cost_bps + slip_bps) * 1e-4 * 2.0
-    trade_count_rolling = 0
-
-    for i in range(len(price)):
-        if i % 100 == 0:
-            trade_count_rolling = 0
-
-        if (i - last_trade_idx) < min_interval_ticks or trade_count_rolling >= max_trades_per_100:
-            validator.step(price[i])
-            continue
-
-        signal = validator.step(price[i])
-        if signal:
-            j = min(i + latency_ticks, len(price)-1)
-            direction = 1 if price[j] - price[i] >= 0 else -1
-            k = min(j + 1, len(price)-1)
-            gross = position * (price[k] - price[j]) * direction
-            costs = position * price[j] * bps_factor
-            trade_pnl = gross - costs
-            trades.append({"i": i, "j": j, "k": k, "dir": direction, "pnl": float(trade_pnl)})
-            pnl_series.append(trade_pnl)
-            last_trade_idx = i
-            trade_count_rolling += 1
-
-    pnl_series = np.array(pnl_series) if pnl_series else np.array([0.0])
-    total_pnl = float(pnl_series.sum())
-    fsr = float((pnl_series < 0).mean()) if len(pnl_series) > 0 else 0.0
-    sharpe_like = float(pnl_series.mean() / (pnl_series.std()+1e-12)) if len(pnl_series)>1 else 0.0
-
-    equity = np.cumsum(pnl_series)
-    dd = 0.0; peak = 0.0; rec = 0; in_dd=False; start=0
-    for idx, eq in enumerate(equity):
-        if eq > peak:
-            peak = eq; in_dd=False
-        draw = peak - eq
-        if draw > dd:
-            dd = draw; in_dd=True; start = idx
-        if in_dd and eq >= peak - 1e-12:
-            rec = max(rec, idx - start); in_dd=False
-
-    return {
-        "total_pnl": total_pnl,
-        "trades": len(trades),
-        "fsr": fsr,
-        "sharpe_like": sharpe_like,
-        "dd_recovery_ticks": int(rec),
-        "pnl_series": pnl_series.tolist(),
-        "equity": equity.tolist() if len(pnl_series)>1 else [0.0],
+    gate = _Gate(min_interval_ticks, max_trades_per_100)
+    taken = [i for i in hits if gate.take(i)]
+
+    ii = np.asarray(taken, dtype=np.int64)
+    jj = np.minimum(ii + latency_ticks, n - 1)
+    direction = np.where(price[jj] - price[ii] >= 0, 1, -1)
+    kk = np.minimum(jj + 1, n - 1)
+    gross = position * (price[kk] - price[jj]) * direction
+    costs = position * price[jj] * bps_factor
+    pnl_series = (gross - costs).tolist()
+    trades = [{"i": i, "j": j, "k": k, "dir": d, "pnl": p}
+              for i, j, k, d, p in zip(taken, jj.tolist(), kk.tolist(), direction.tolist(), pnl_series)]
+
+    tm = _TradeMetrics()
+    equity = []
+    for trade_pnl in pnl_series:
+        tm.add(trade_pnl)
+        equity.append(tm.acc.last)
+
+    return tm.summary() | {
+        "pnl_series": pnl_series if pnl_series else [0.0],
+        "equity": equity if tm.acc.count > 1 else [0.0],
         "trades_detail": trades
     }
+
+def simulate(df, validator, latency_ticks=1, cost_bps=0.5, slip_bps=0.3, position=1.0,
+             min_interval_ticks=5, max_trades_per_100=15):
+    # a frame with a "price" column, or the price array itself
+    price = df["price"].values if isinstance(df, pd.DataFrame) else np.asarray(df)
+    # Gating never skips a step, so the validator sees every tick regardless of trades
+    hits = [i for i, x in enumerate(price) if validator.step(x)]
+    return _execute(price, hits, latency_ticks=latency_ticks, cost_bps=cost_bps, slip_bps=slip_bps,
+                    position=position, min_interval_ticks=min_interval_ticks,
+                    max_trades_per_100=max_trades_per_100)
+
+# --- Streaming simulation: one tick at a time from a live or replayed feed ---
+
+def _tick_price(tick):
+    # ticks may be bare prices, (ts, price) pairs or {"price": ...} records
+    if isinstance(tick, dict):
+        return float(tick["price"])
+    if isinstance(tick, (tuple, list)):
+        return float(tick[-1])
+    return float(tick)
+
+class StreamingSimulator:
+    """Incremental counterpart of ``simulate``.
+
+    Feed prices with ``on_tick``; each call returns the trades that completed on
+    that tick, each carrying the running ``metrics``. Orders wait in a queue for
+    their latency-delayed fill and the following exit tick, so memory is bounded
+    by the orders in flight (unless ``keep_history``). ``close()`` settles what is
+    still pending at the last price, exactly as ``simulate`` clamps to the final tick,
+    after which ``result()`` equals ``simulate`` on the same prices.
+    """
+    def __init__(self, validator, latency_ticks=1, cost_bps=0.5, slip_bps=0.3, position=1.0,
+                 min_interval_ticks=5, max_trades_per_100=15, keep_history=False):
+        self.validator = validator
+        self.latency = latency_ticks
+        self.position = position
+        self.bps_factor = (cost_bps + slip_bps) * 1e-4 * 2.0
+        self.gate = _Gate(min_interval_ticks, max_trades_per_100)
+        self.metrics = _TradeMetrics()
+        self.pending = deque()  # [i, price_i, j, price_j, dir]; price_j is None until filled
+        self.n = 0
+        self.last_price = None
+        self.history = {"pnl_series": [], "equity": [], "trades_detail": []} if keep_history else None
+
+    def _fill(self, order, j, px):
+        order[2], order[3] = j, px
+        order[4] = 1 if px - order[1] >= 0 else -1
+
+    def _exit(self, order, k, px):
+        i, _, j, pj, d = order
+        trade_pnl = self.position * (px - pj) * d - self.position * pj * self.bps_factor
+        self.metrics.add(trade_pnl)
+        trade = {"i": i, "j": j, "k": k, "dir": d, "pnl": trade_pnl}
+        if self.history is not None:
+            self.history["pnl_series"].append(trade_pnl)
+            self.history["equity"].append(self.metrics.acc.last)
+            self.history["trades_detail"].append(dict(trade))
+        trade["metrics"] = self.metrics.summary()
+        return trade
+
+    def on_tick(self, price):
+        t = self.n
+        self.n += 1
+        self.last_price = price
+        done = []
+        for order in self.pending:
+            if order[3] is None and order[2] == t:
+                self._fill(order, t, price)
+        # exits are one tick after fills, which are in signal order
+        while self.pending and self.pending[0][3] is not None and self.pending[0][2] + 1 == t:
+            done.append(self._exit(self.pending.popleft(), t, price))
+        if self.validator.step(price) and self.gate.take(t):
+            order = [t, price, t + self.latency, None, 0]
+            if self.latency <= 0:
+                self._fill(order, t, price)
+            self.pending.append(order)
+        return done
+
+    def close(self):
+        """Settle pending orders at the last price (fill and exit clamp to the final tick)."""
+        done = []
+        last = self.n - 1
+        while self.pending:
+            order = self.pending.popleft()
+            if order[3] is None:
+                self._fill(order, last, self.last_price)
+            done.append(self._exit(order, min(order[2] + 1, last), self.last_price))
+        return done
+
+    def result(self):
+        out = self.metrics.summary()
+        if self.history is not None:
+            h = self.history
+            out |= {"pnl_series": list(h["pnl_series"]) or [0.0],
+                    "equity": list(h["equity"]) if out["trades"] > 1 else [0.0],
+                    "trades_detail": list(h["trades_detail"])}
+        return out
+
+def simulate_stream(ticks, validator, **sim_params):
+    """Yield trades (with running metrics) from an iterable of ticks as they complete."""
+    sim = StreamingSimulator(validator, **sim_params)
+    for tick in ticks:
+        yield from sim.on_tick(_tick_price(tick))
+    yield from sim.close()
+
+async def simulate_stream_async(ticks, validator, **sim_params):
+    """``simulate_stream`` over an async iterable (e.g. a websocket or replay feed)."""
+    sim = StreamingSimulator(validator, **sim_params)
+    async for tick in ticks:
+        for trade in sim.on_tick(_tick_price(tick)):
+            yield trade
+    for trade in sim.close():
+        yield trade
+
+# --- Batch simulation: many validators, one pass over the prices ---
+
+def _run_length(flags, carry):
+    # Consecutive-True counts down the rows of a (ticks x validators) block, continuing `carry`
+    m = flags.shape[0]
+    idx = np.arange(m)[:, None]
+    last_false = np.maximum.accumulate(np.where(flags, -1, idx), axis=0)
+    return np.where(last_false >= 0, idx - last_false, carry + idx + 1)
+
+def _ewma_block(x, st):
+    m = len(x)
+    a, b = st["alpha"], 1 - st["alpha"]
+    M = np.empty((m + 1, len(a))); D = np.empty((m, len(a))); M[0] = st["mean"]
+    for t in range(m):
+        np.subtract(x[t], M[t], out=D[t]); np.multiply(a, D[t], out=M[t + 1]); M[t + 1] += M[t]
+    Q = a * D * D
+    V = np.empty_like(M); V[0] = st["var"]
+    for t in range(m):
+        np.add(V[t], Q[t], out=V[t + 1]); V[t + 1] *= b
+    std = (V[1:] + 1e-12) ** 0.5
+    z = np.abs((x - M[1:]) / std)
+    hi = z > st["z_enter"]; keep = ~(z < st["z_exit"])
+    IN = np.empty((m + 1, len(a)), dtype=bool); IN[0] = st["in_signal"]
+    for t in range(m):
+        np.copyto(IN[t + 1], np.where(IN[t], keep[t], hi[t]))
+    fired = np.where(IN[:-1], z > st["z_exit"], hi)
+    st["mean"], st["var"], st["in_signal"] = M[-1].copy(), V[-1].copy(), IN[-1].copy()
+    return fired
+
+def _persistence_block(x, st):
+    m = len(x)
+    a = st["mean_alpha"]
+    M = np.empty((m + 1, len(a))); D = np.empty((m, len(a))); M[0] = st["mean"]
+    for t in range(m):
+        np.subtract(x[t], M[t], out=D[t]); np.multiply(a, D[t], out=M[t + 1]); M[t + 1] += M[t]
+    c = _run_length(D > st["z"], st["c"])
+    st["mean"], st["c"] = M[-1].copy(), c[-1].copy()
+    return c >= st["hold"]
+
+_VECTOR_KINDS = {
+    EWMAValidator: (("alpha", "z_enter", "z_exit", "var", "in_signal"), _ewma_block),
+    PersistenceValidator: (("mean_alpha", "z", "hold", "c"), _persistence_block),
+}
+
+def _vector_kind(v):
+    inner = v.inner if isinstance(v, ConfirmWrapper) else v
+    if type(inner) in _VECTOR_KINDS and inner.mean is None:
+        return type(inner)
+    return None
+
+def simulate_many(df, validators, chunk=4096, **sim_params):
+    """Simulate many validators over the same prices in one pass.
+
+    Fresh EWMA and Persistence validators (optionally in a ConfirmWrapper) are
+    stepped together as (ticks x validators) state arrays; any other validator
+    is stepped in the same tick loop. ``sim_params`` are ``simulate`` keyword
+    arguments, each either a scalar or a per-validator sequence. Returns one
+    ``simulate``-shaped result per validator, in order, and leaves every
+    validator in the same state ``simulate`` would.
+    """
+    validators = list(validators)
+    N = len(validators)
+    price = df["price"].values
+    n = len(price)
+    hits = [[] for _ in range(N)]
+
+    groups = {}
+    generic = []
+    for j, v in enumerate(validators):
+        kind = _vector_kind(v) if n else None
+        if kind is None:
+            generic.append(j)
+        else:
+            groups.setdefault(kind, []).append(j)
+
+    states = {}
+    for kind, cols in groups.items():
+        fields, _ = _VECTOR_KINDS[kind]
+        inners = [validators[j].inner if isinstance(validators[j], ConfirmWrapper) else validators[j] for j in cols]
+        st = {f: np.array([getattr(v, f) for v in inners]) for f in fields}
+        # a fresh validator only seeds its mean on the first tick
+        st["mean"] = np.full(len(cols), float(price[0]))
+        st["confirm"] = np.array([validators[j].confirm if isinstance(validators[j], ConfirmWrapper) else 1 for j in cols])
+        # the seeding tick reports False, which resets any confirm counter
+        st["confirm_c"] = np.zeros(len(cols), dtype=np.int64)
+        states[kind] = (cols, inners, st)
+
+    for s in range(1, n, chunk) if groups else ():
+        e = min(s + chunk, n)
+        x = price[s:e].astype(float)[:, None]
+        for kind, (cols, _, st) in states.items():
+            fired = _VECTOR_KINDS[kind][1](x, st)
+            c = _run_length(fired, st["confirm_c"])
+            st["confirm_c"] = c[-1].copy()
+            rows, ks = np.nonzero(c >= st["confirm"])
+            order = np.argsort(ks, kind="stable")
+            rows, ks = rows[order] + s, ks[order]
+            bounds = np.searchsorted(ks, np.arange(len(cols) + 1))
+            for k, j in enumerate(cols):
+                hits[j].extend(rows[bounds[k]:bounds[k + 1]].tolist())
+
+    if generic:
+        steppers = [(j, validators[j].step) for j in generic]
+        for i, x in enumerate(price):
+            for j, step in steppers:
+                if step(x):
+                    hits[j].append(i)
+
+    for kind, (cols, inners, st) in states.items():
+        for k, (j, inner) in enumerate(zip(cols, inners)):
+            inner.mean = float(st["mean"][k])
+            if kind is EWMAValidator:
+                inner.var = float(st["var"][k]); inner.in_signal = bool(st["in_signal"][k])
+            else:
+                inner.c = int(st["c"][k])
+            if isinstance(validators[j], ConfirmWrapper):
+                validators[j].c = int(st["confirm_c"][k])
+
+    def param(name, j):
+        val = sim_params[name]
+        return val[j] if isinstance(val, (list, tuple, np.ndarray)) else val
+
+    return [_execute(price, hits[j], **{k: param(k, j) for k in sim_params}) for j in range(N)]
@@ -1,11 +1,10 @@
 
-import os, json
+import os, io, json
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from synthetic_market import labeled_scenarios
+from synthetic_market import scenarios, regime_index, regime_prices
 from validator_sim import EWMAValidator, VolatilityValidator, PersistenceValidator, ConfirmWrapper, simulate
-from agent_reasoner import decide, log_decision
+from agent_reasoner import decide, decision_record
 
 def _metrics_from_result(res):
     return {
@@ -16,6 +15,53 @@ def _metrics_from_result(res):
         "dd_recovery_ticks": int(res["dd_recovery_ticks"]),
     }
 
+class ArtifactWriter:
+    """Buffers pipeline outputs (decision log records, CSVs, images) in memory.
+
+    Nothing touches the filesystem until ``flush()``, which creates the output
+    directories once and writes each file in a single call; the decision log is
+    rewritten with every buffered record. One writer can collect several runs.
+    """
+    def __init__(self, logs_path):
+        self.logs_path = os.path.abspath(logs_path)
+        self.records = []
+        self.files = {}
+
+    def log(self, record):
+        self.records.append(record)
+
+    def add_file(self, path, data):
+        self.files[os.path.abspath(path)] = data
+
+    def flush(self):
+        for d in {os.path.dirname(p) for p in [self.logs_path, *self.files]}:
+            os.makedirs(d, exist_ok=True)
+        with open(self.logs_path, "w") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in self.records))
+        for path, data in self.files.items():
+            with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+                f.write(data)
+        self.files.clear()
+
+def _png(fig_fn):
+    import matplotlib.pyplot as plt
+    fig_fn(plt)
+    buf = io.BytesIO()
+    plt.tight_layout(); plt.savefig(buf, format="png", dpi=140); plt.close()
+    return buf.getvalue()
+
+def _simulate_job(job):
+    prices, validator, params = job
+    return simulate(prices, validator, **params)
+
+def _stitch(parts):
+    # chains the per-regime equity curves: each part starts from where the previous one ended
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return np.zeros(0)
+    offsets = np.cumsum([0.0] + [p[-1] for p in parts[:-1]])
+    return np.concatenate(parts) + np.repeat(offsets, [len(p) for p in parts])
+
 def run_pipeline(
     n_ticks=3000,
     ewma_alpha=0.05, ewma_z=2.6,
@@ -25,17 +71,37 @@ def run_pipeline(
     cost_bps=0.8, slip_bps=0.5,
     pos_calm=0.8, pos_volatile=0.45, pos_jumpy=0.35,
     min_interval_ticks=7, max_trades_per_100=12, confirm=2,
-    out_dir="../results", logs_path="../aws/reasoning_logs.jsonl",
-    generate_artifacts=True
+    out_dir="../results", logs_path=None,
+    generate_artifacts=None, df=None, in_memory=False, writer=None, workers=1
 ):
+    """Baseline vs regime-adaptive agent comparison.
+
+    ``in_memory=True`` returns the metrics with no filesystem I/O at all (no
+    decision log, CSVs or images), as used by the optimizer; it implies
+    ``generate_artifacts=False`` (the images), which otherwise defaults to on.
+    Outputs go through ``writer`` (an ``ArtifactWriter``, whose own log path
+    is used, so ``logs_path`` cannot be combined with it); when none is given
+    a fresh one for ``logs_path`` (default ``../aws/reasoning_logs.jsonl``) is
+    flushed once at the end of the run. ``workers > 1`` runs the per-regime
+    simulations on a process pool.
+    """
+    if generate_artifacts is None:
+        generate_artifacts = not in_memory
+    if in_memory and (generate_artifacts or writer is not None):
+        raise ValueError("in_memory runs do not write artifacts; pass no writer and leave generate_artifacts off")
+    if writer is not None and logs_path is not None:
+        raise ValueError("logs_path is ignored when a writer is given; set the log path on the ArtifactWriter")
     out_dir = os.path.abspath(out_dir)
-    logs_path = os.path.abspath(logs_path)
-    os.makedirs(out_dir, exist_ok=True)
-    os.makedirs(os.path.dirname(logs_path), exist_ok=True)
-    open(logs_path, "w").close()
+    own_writer = writer is None and not in_memory
+    if own_writer:
+        writer = ArtifactWriter(logs_path or "../aws/reasoning_logs.jsonl")
+    decisions = []
 
-    df = labeled_scenarios(n=n_ticks)
-    regimes = df['regime'].unique().tolist()
+    # callers may pass their own frame; otherwise the process-wide scenario cache supplies it
+    if df is None:
+        df = scenarios(n_ticks)
+    runs = regime_index(df)
+    price = df['price'].to_numpy()
 
     z_enter = ewma_z
     z_exit = max(ewma_z - 0.6, 1.2)
@@ -47,10 +113,8 @@ def run_pipeline(
     )
     base_equity = np.array(base_res.get("equity", [0.0]), dtype=float)
 
-    per_regime = []
-    agent_equity_parts = []
-    for reg in regimes:
-        sub = df[df['regime']==reg]
+    jobs = []
+    for reg, reg_runs in runs.items():
         dec = decide({"current_regime": reg})
         if reg == "calm_trend":
             pos = pos_calm
@@ -66,26 +130,26 @@ def run_pipeline(
         else:
             v = ConfirmWrapper(PersistenceValidator(persist_hold, persist_mean_alpha, persist_z), confirm=confirm)
 
-        res = simulate(
-            sub, v, latency_ticks=agent_latency, cost_bps=cost_bps, slip_bps=slip_bps, position=pos,
-            min_interval_ticks=min_interval_ticks, max_trades_per_100=max_trades_per_100
-        )
+        decisions.append(decision_record(dec, {"regime": reg}))
+        if writer is not None:
+            writer.log(decisions[-1])
+        jobs.append((regime_prices(price, reg_runs), v, dict(
+            latency_ticks=agent_latency, cost_bps=cost_bps, slip_bps=slip_bps, position=pos,
+            min_interval_ticks=min_interval_ticks, max_trades_per_100=max_trades_per_100)))
+
+    if workers and workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+            results = list(ex.map(_simulate_job, jobs))
+    else:
+        results = [_simulate_job(job) for job in jobs]
 
-        log_decision(dec, {"regime": reg}, logs_path)
+    per_regime = []
+    for reg, res in zip(runs, results):
         met = _metrics_from_result(res)
         met["regime"] = reg
         per_regime.append(met)
-        agent_equity_parts.append(np.array(res.get("equity", [0.0]), dtype=float))
-
-    agent_equity = []
-    offset = 0.0
-    for seg in agent_equity_parts:
-        if len(seg) == 0:
-            continue
-        seg_adj = seg + offset
-        offset = seg_adj[-1]
-        agent_equity.extend(seg_adj.tolist())
-    agent_equity = np.array(agent_equity, dtype=float)
+    agent_equity = _stitch([np.asarray(res.get("equity", [0.0]), dtype=float) for res in results])
 
     agg = {
         "total_pnl": float(sum(m["total_pnl"] for m in per_regime)),
@@ -97,66 +161,73 @@ def run_pipeline(
     }
 
     artifacts = {}
-    per_regime_csv = os.path.join(out_dir, "per_regime_metrics.csv")
-    pd.DataFrame(per_regime)[["regime","total_pnl","trades","fsr","sharpe_like","dd_recovery_ticks"]].to_csv(per_regime_csv, index=False)
-    artifacts["per_regime_csv"] = per_regime_csv
-
-    summary_csv = os.path.join(out_dir, "summary.csv")
-    with open(summary_csv, "w") as f:
-        f.write("metric,baseline,agent\n")
-        f.write(f"total_pnl,{base_res['total_pnl']},{agg['total_pnl']}\n")
-        f.write(f"trades,{base_res['trades']},{agg['trades']}\n")
-        f.write(f"fsr,{base_res['fsr']},{agg['fsr']}\n")
-        f.write(f"sharpe_like,{base_res['sharpe_like']},{agg['sharpe_like']}\n")
-        f.write(f"dd_recovery_ticks,{base_res['dd_recovery_ticks']},{agg['dd_recovery_ticks']}\n")
-        f.write(f"adaptive_switch_count,0,{agg['adaptive_switch_count']}\n")
-    artifacts["summary_csv"] = summary_csv
+    if writer is not None:
+        per_regime_csv = os.path.join(out_dir, "per_regime_metrics.csv")
+        writer.add_file(per_regime_csv, pd.DataFrame(per_regime)[["regime","total_pnl","trades","fsr","sharpe_like","dd_recovery_ticks"]].to_csv(index=False))
+        artifacts["per_regime_csv"] = per_regime_csv
+
+        summary_csv = os.path.join(out_dir, "summary.csv")
+        writer.add_file(summary_csv, "".join([
+            "metric,baseline,agent\n",
+            f"total_pnl,{base_res['total_pnl']},{agg['total_pnl']}\n",
+            f"trades,{base_res['trades']},{agg['trades']}\n",
+            f"fsr,{base_res['fsr']},{agg['fsr']}\n",
+            f"sharpe_like,{base_res['sharpe_like']},{agg['sharpe_like']}\n",
+            f"dd_recovery_ticks,{base_res['dd_recovery_ticks']},{agg['dd_recovery_ticks']}\n",
+            f"adaptive_switch_count,0,{agg['adaptive_switch_count']}\n",
+        ]))
+        artifacts["summary_csv"] = summary_csv
 
     if generate_artifacts:
         labels = ["FSR", "Sharpe-like", "DD Recovery"]
         base_vals = [base_res["fsr"], base_res["sharpe_like"], base_res["dd_recovery_ticks"]]
         agent_vals = [agg["fsr"], agg["sharpe_like"], agg["dd_recovery_ticks"]]
 
-        plt.figure(figsize=(8,4))
-        x = range(len(labels))
-        plt.bar([i-0.15 for i in x], base_vals, width=0.3, label=f"Baseline (EWMA, {baseline_latency} ticks)")
-        plt.bar([i+0.15 for i in x], agent_vals, width=0.3, label=f"Agent (Adaptive, {agent_latency} ticks)")
-        plt.xticks(list(x), labels)
-        plt.title("Baseline vs Agent — Key Metrics (gated & confirmed)")
-        plt.legend()
+        def metrics_fig(plt):
+            plt.figure(figsize=(8,4))
+            x = range(len(labels))
+            plt.bar([i-0.15 for i in x], base_vals, width=0.3, label=f"Baseline (EWMA, {baseline_latency} ticks)")
+            plt.bar([i+0.15 for i in x], agent_vals, width=0.3, label=f"Agent (Adaptive, {agent_latency} ticks)")
+            plt.xticks(list(x), labels)
+            plt.title("Baseline vs Agent — Key Metrics (gated & confirmed)")
+            plt.legend()
         metrics_img = os.path.join(out_dir, "metrics_compare.png")
-        plt.tight_layout(); plt.savefig(metrics_img, dpi=140); plt.close()
+        writer.add_file(metrics_img, _png(metrics_fig))
         artifacts["metrics_img"] = metrics_img
 
-        plt.figure(figsize=(9,4))
-        if base_vals is not None:
+        def equity_fig(plt):
+            plt.figure(figsize=(9,4))
             plt.plot(np.array(base_res.get("equity", [0.0]), dtype=float), label="Baseline equity")
-        plt.plot(agent_equity, label="Agent equity")
-        plt.title("Cumulative PnL (Equity Curves) — Baseline vs Agent")
-        plt.xlabel("Trade index")
-        plt.ylabel("Cumulative PnL")
-        plt.legend()
+            plt.plot(agent_equity, label="Agent equity")
+            plt.title("Cumulative PnL (Equity Curves) — Baseline vs Agent")
+            plt.xlabel("Trade index")
+            plt.ylabel("Cumulative PnL")
+            plt.legend()
         eq_img = os.path.join(out_dir, "equity_curves.png")
-        plt.tight_layout(); plt.savefig(eq_img, dpi=140); plt.close()
+        writer.add_file(eq_img, _png(equity_fig))
         artifacts["equity_img"] = eq_img
 
-        with open(logs_path) as f:
-            rows = [json.loads(line) for line in f]
-        ylabels = [r["decision"] for r in rows]
-        t = list(range(len(rows)))
-        plt.figure(figsize=(8,2.8))
-        plt.plot(t, list(range(1, len(rows)+1)), marker="o")
-        plt.yticks(list(range(1, len(rows)+1)), ylabels)
-        plt.xlabel("Decision step")
-        plt.title("Agent Decisions Over Time")
+        def timeline_fig(plt):
+            rows = decisions
+            ylabels = [r["decision"] for r in rows]
+            t = list(range(len(rows)))
+            plt.figure(figsize=(8,2.8))
+            plt.plot(t, list(range(1, len(rows)+1)), marker="o")
+            plt.yticks(list(range(1, len(rows)+1)), ylabels)
+            plt.xlabel("Decision step")
+            plt.title("Agent Decisions Over Time")
         timeline_img = os.path.join(out_dir, "agent_decisions_timeline.png")
-        plt.tight_layout(); plt.savefig(timeline_img, dpi=140); plt.close()
+        writer.add_file(timeline_img, _png(timeline_fig))
         artifacts["timeline_img"] = timeline_img
 
+    if own_writer:
+        writer.flush()
+
     return {
         "baseline": _metrics_from_result(base_res) | {"equity": base_res.get("equity", [0.0])},
         "agent": agg | {"equity": agent_equity.tolist()},
-        "artifacts": artifacts
+        "artifacts": artifacts,
+        "decisions": decisions
     }
 
 if __name__ == "__main__":
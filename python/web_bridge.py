@@ -13,15 +13,20 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
+import copy
 import io
+import itertools
+import threading
 import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 
-from config_loader import StrategySpec, load_config
-from strategy_registry import discover_handlers
-from synthetic_market import labeled_scenarios
+from config_loader import StrategySpec, load_config, load_config_cached
+from strategy_registry import discover_handlers, resolve_handler
+from strategy_runner import run_configs
+from synthetic_market import scenarios
 from validator_sim import (
     EWMAValidator,
     VolatilityValidator,
@@ -30,6 +35,12 @@ from validator_sim import (
     simulate,
 )
 
+import _paths  # noqa: F401  (repo root, for core/ and app/)
+from core.cache.cache import cached, code_version, default_cache, hash_frame, make_key
+
+# Sources strategy/validator results depend on; part of every result-cache key
+_CODE = (str(Path(__file__).resolve().parent), str(Path(__file__).resolve().parents[1] / "core" / "metrics"))
+
 
 def list_strategy_configs(strategies_dir: Path) -> List[Path]:
     exts = {".yaml", ".yml", ".json"}
@@ -69,7 +80,7 @@ def read_price_df_from_upload(file_bytes: bytes, filename: str) -> pd.DataFrame:
 
 
 def make_synthetic_df(n_ticks: int, seed: int = 123) -> pd.DataFrame:
-    df = labeled_scenarios(n=int(n_ticks), seed=int(seed))
+    df = scenarios(n_ticks, seed)
     return df[["price"]].copy()
 
 
@@ -97,16 +108,47 @@ def get_strategy_catalog() -> Dict[str, Dict[str, Any]]:
     return dict(sorted(out.items(), key=lambda kv: kv[0]))
 
 
+def _strategy_params(spec: StrategySpec) -> Dict[str, Any]:
+    return {"raw": spec.raw, "path": str(Path(spec.path).resolve())}
+
+
 def run_strategy_on_df(spec: StrategySpec, df: pd.DataFrame) -> Dict[str, Any]:
-    handlers = discover_handlers()
-    if spec.type not in handlers:
-        raise ValueError(
-            f"Unknown strategy.type='{spec.type}'. Available types: {sorted(handlers.keys())}"
-        )
+    """Run a strategy config on ``df``; identical config + data + code is a result-cache hit."""
+    return cached("strategy", _strategy_params(spec), [hash_frame(df)], code_version(*_CODE),
+                  lambda: _run_strategy_on_df(spec, df))
+
 
-    handler = handlers[spec.type].load()
-    result = handler(spec, df)
+def run_strategy_batch(configs: Iterable[Any], df: pd.DataFrame, workers: int = 4, processes: bool = False,
+                       progress=None) -> List[Dict[str, Any]]:
+    """``run_strategy_on_df`` for many configs (paths or StrategySpecs), results in input order.
 
+    Paths are parsed once per file version, ``df`` is hashed once, and cached
+    results (shared with ``run_strategy_on_df``) are reused; only the misses
+    run, in parallel through ``strategy_runner.run_configs``. Threads are the
+    default because this runs inside the Streamlit server; ``processes=True``
+    suits scripts. ``progress(done, total)`` counts the runs actually executed.
+    """
+    specs = [c if isinstance(c, StrategySpec) else load_config_cached(c) for c in configs]
+    cache = default_cache()
+    data_hash, version = hash_frame(df), code_version(*_CODE)
+    keys = [make_key("strategy", _strategy_params(s), [data_hash], version) for s in specs]
+    miss = object()
+    out = [cache.get(k, miss) if cache is not None else miss for k in keys]
+    todo = [i for i, r in enumerate(out) if r is miss]
+    results = run_configs([specs[i] for i in todo], df, workers=workers, processes=processes, progress=progress)
+    for i, result in zip(todo, results):
+        out[i] = _normalize_strategy_result(specs[i], result, df)
+        if cache is not None:
+            cache.put(keys[i], out[i])
+    # callers get copies, as with run_strategy_on_df
+    return [copy.deepcopy(r) for r in out]
+
+
+def _run_strategy_on_df(spec: StrategySpec, df: pd.DataFrame) -> Dict[str, Any]:
+    return _normalize_strategy_result(spec, resolve_handler(spec.type)(spec, df), df)
+
+
+def _normalize_strategy_result(spec: StrategySpec, result: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
     # Normalize a few fields for UI
     result.setdefault("strategy_id", spec.id)
     result.setdefault("strategy_name", spec.name)
@@ -156,6 +198,17 @@ def max_drawdown_from_equity(equity: Iterable[float]) -> float:
 
 
 def run_validator_sim(df: pd.DataFrame, validator_kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulate one validator on ``df``; identical kind + params + data + code is a result-cache hit."""
+    return cached(
+        "validator_sim",
+        {"kind": validator_kind, "params": params},
+        [hash_frame(df)],
+        code_version(*_CODE),
+        lambda: _run_validator_sim(df, validator_kind, params),
+    )
+
+
+def _run_validator_sim(df: pd.DataFrame, validator_kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
     v = make_validator(validator_kind, params)
     sim_params = {
         "latency_ticks": int(params.get("latency_ticks", 1)),
@@ -221,3 +274,121 @@ def write_results_csv(rows: List[Dict[str, Any]], results_dir: Path) -> Path:
     out_path = results_dir / f"strategy_runs_{ts}.csv"
     pd.DataFrame(rows).to_csv(out_path, index=False)
     return out_path
+
+
+# --- Background jobs ---
+
+
+class JobRunner:
+    """Runs UI work on a thread pool so the Streamlit script never blocks on it.
+
+    A job is one callable applied to a list of argument tuples, queued on the
+    pool. ``status`` polls state and progress, ``cancel`` drops the items that
+    have not started (running ones finish, but the job reports ``cancelled``),
+    and ``result`` returns the outputs in input order. Threads share the
+    process-wide result and scenario caches. The point is responsiveness, not
+    speed: validator sims and strategy handlers are mostly pure-Python loops
+    that hold the GIL, so concurrent jobs interleave rather than run in
+    parallel (``run_strategy_batch(..., processes=True)`` uses processes).
+
+    ``submit(..., progress=True)`` is for a single call that fans out itself
+    (e.g. ``run_strategy_batch``): it gets a ``progress(done, total)`` callback
+    that drives the job's progress and raises ``CancelledError`` once the job is
+    cancelled, so the call stops between steps.
+    """
+
+    def __init__(self, max_workers: int = 4, keep: int = 50):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hft-job")
+        self.keep = keep
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def map(self, fn, items: Iterable[Tuple], label: str = "") -> str:
+        return self._start(label, lambda job: [self.pool.submit(fn, *args) for args in items])
+
+    def submit(self, fn, *args, label: str = "", progress: bool = False) -> str:
+        if not progress:
+            return self.map(fn, [args], label=label)
+
+        def report(job, done, total):
+            job["steps"] = (done, total)
+            if job["cancelled"]:
+                raise CancelledError(f"{label or fn.__name__} cancelled")
+        return self._start(label, lambda job: [self.pool.submit(
+            fn, *args, progress=lambda done, total: report(job, done, total))])
+
+    def _start(self, label: str, launch) -> str:
+        job_id = f"job-{next(self._ids)}"
+        job = {"label": label, "futures": [], "submitted": time.time(), "finished": None,
+               "cancelled": False, "steps": None}
+        job["futures"] = futures = launch(job)
+        with self._lock:
+            self._jobs[job_id] = job
+            for old in list(self._jobs)[:-self.keep]:  # forget the oldest finished jobs
+                if all(f.done() for f in self._jobs[old]["futures"]):
+                    del self._jobs[old]
+        for f in futures:
+            f.add_done_callback(lambda _f, j=job_id: self._finish(j))
+        return job_id
+
+    def _finish(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and job["finished"] is None and all(f.done() for f in job["futures"]):
+                job["finished"] = time.time()
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            if job_id not in self._jobs:
+                raise KeyError(f"Unknown job: {job_id}")
+            return self._jobs[job_id]
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        job = self._job(job_id)
+        futures: List[Future] = job["futures"]
+        done = sum(f.done() for f in futures)
+        errors = [f"{type(e).__name__}: {e}" for f in futures
+                  if f.done() and not f.cancelled() and (e := f.exception()) is not None
+                  and not isinstance(e, CancelledError)]
+        if job["cancelled"]:
+            state = "cancelled"
+        elif done < len(futures):
+            state = "running" if any(f.running() or f.done() for f in futures) else "queued"
+        else:
+            state = "failed" if errors else "done"
+        end = job["finished"] or time.time()
+        total = len(futures)
+        if job["steps"]:  # a progress=True call reports its own steps
+            done, total = job["steps"]
+        return {"id": job_id, "label": job["label"], "state": state, "done": done, "total": total,
+                "progress": done / total if total else 1.0, "errors": errors,
+                "elapsed_s": end - job["submitted"]}
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = list(self._jobs)
+        return [self.status(j) for j in ids]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel the job's items that have not started; True if nothing is left running.
+
+        A job that has already finished keeps its state and results.
+        """
+        job = self._job(job_id)
+        if all(f.done() for f in job["futures"]):
+            return True
+        job["cancelled"] = True
+        for f in job["futures"]:
+            f.cancel()
+        return all(f.done() for f in job["futures"])
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> List[Any]:
+        """Outputs in input order (waits up to ``timeout``); raises the first item's error."""
+        job = self._job(job_id)
+        if job["cancelled"]:
+            raise RuntimeError(f"{job_id} was cancelled")
+        return [f.result(timeout=timeout) for f in job["futures"]]
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
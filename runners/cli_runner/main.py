@@ -10,17 +10,27 @@ def select_agent():
         from agents.local_agent.agent import decide
     return decide
 
-def main():
-    decide = select_agent()
-    decision = decide({"timestamp": datetime.utcnow().isoformat()})
-    params = decision["params"]; validator = decision["validator"]
-    data_path = os.environ.get("DATA_PATH", "data/sample_prices.csv")
+def run_backtest(data_path, validator, params):
+    """C++ backtest metrics: in-process via cpp/libhftcore.so when built, else the CLI binary."""
+    from core.native import native
+    if os.environ.get("CPP_IMPL", "auto").lower() != "subprocess" and native.available():
+        from app.data import load_prices, price_array
+        px = price_array(load_prices(data_path))
+        return native.run_ewma(px, window=int(params.get('window', 50)),
+                               alpha=float(params.get('alpha', 0.05)), threshold=float(params.get('threshold', 2.5)))
     cpp_bin = os.environ.get("CPP_BIN", "cpp/backtester")
     cmd = [cpp_bin, f"--data={data_path}", f"--validator={validator}",
            f"--alpha={params.get('alpha',0.05)}", f"--threshold={params.get('threshold',2.5)}",
            f"--window={params.get('window',50)}"]
     out = subprocess.check_output(cmd).decode().strip()
-    metrics = Metrics.from_cpp_json(out)
+    return Metrics.from_cpp_json(out)
+
+def main():
+    decide = select_agent()
+    decision = decide({"timestamp": datetime.utcnow().isoformat()})
+    params = decision["params"]; validator = decision["validator"]
+    data_path = os.environ.get("DATA_PATH", "data/sample_prices.csv")
+    metrics = run_backtest(data_path, validator, params)
     print(json.dumps({"decision": decision, "metrics": metrics.to_dict()}, indent=2))
 
 if __name__ == "__main__":
@@ -1,10 +1,20 @@
 import json, os
+
+# Agent modules are imported once per warm container, not on every request
+_DECIDERS={}
+
+def _decider(impl):
+    if impl not in _DECIDERS:
+        if impl == "local":
+            from agents.local_agent.agent import decide
+        else:
+            from agents.bedrock_agent.agent import decide
+        _DECIDERS[impl]=decide
+    return _DECIDERS[impl]
+
 def handler(event, context):
     impl = os.environ.get("AGENT_IMPL", "bedrock").lower()
-    if impl == "local":
-        from agents.local_agent.agent import decide
-    else:
-        from agents.bedrock_agent.agent import decide
+    decide = _decider("local" if impl == "local" else "bedrock")
     body={}
     try:
         if "body" in event and event["body"]:
@@ -0,0 +1,210 @@
+"""Long-running validator server: keeps datasets, strategy configs, handler
+registries and synthetic scenarios in memory and answers JSON requests.
+
+    python server.py --socket /tmp/hftv.sock      # Unix socket, one JSON object per line
+    python server.py --port 8765                  # HTTP: POST / with a JSON body
+
+Requests are ``{"op": ..., ...}``:
+- ``run``       ``data_path`` (default DATA_PATH): the ``cli.py`` JSON result
+- ``sweep``     ``data_path``, ``ewma_grid`` [[alpha, threshold, window], ...], ``persist_grid`` [hold, ...]
+- ``strategy``  ``config`` path and ``n_ticks``: the ``python/strategy_runner.py`` result
+- ``stats`` / ``clear`` / ``ping``
+Data files and configs are re-read only when their mtime or size changes.
+"""
+import json, os, sys, threading, time
+
+PY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python")
+
+
+class ValidatorServer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.prices = {}      # data path -> (file_key, prices)
+        self.specs = {}       # config path -> (file_key, StrategySpec)
+        self.handlers = None  # strategy type -> loaded run callable
+        self.requests = 0
+
+    def _prices(self, path):
+        from app.data import file_key, load_prices
+        key = file_key(path)
+        with self.lock:
+            hit = self.prices.get(key[0])
+            if hit and hit[0] == key:
+                return hit[1]
+        prices = load_prices(path)
+        with self.lock:
+            self.prices[key[0]] = (key, prices)
+        return prices
+
+    def _python_modules(self):
+        if PY_DIR not in sys.path:
+            sys.path.insert(0, PY_DIR)
+
+    def _spec(self, path):
+        self._python_modules()
+        from app.data import file_key
+        from config_loader import load_config
+        key = file_key(path)
+        with self.lock:
+            hit = self.specs.get(key[0])
+            if hit and hit[0] == key:
+                return hit[1]
+        spec = load_config(path)
+        with self.lock:
+            self.specs[key[0]] = (key, spec)
+        return spec
+
+    def _handler(self, stype):
+        self._python_modules()
+        from strategy_registry import discover_handlers
+        with self.lock:
+            if self.handlers is None or stype not in self.handlers:
+                # (re)discover once, then on demand for types added while running
+                self.handlers = {t: h.load() for t, h in discover_handlers().items()}
+            handlers = self.handlers
+        if stype not in handlers:
+            raise ValueError(f"Unknown strategy.type='{stype}'. Available types: {sorted(handlers)}")
+        return handlers[stype]
+
+    def _scenarios(self, n_ticks):
+        # process-wide cache shared with run_pipeline and the strategy runner; frames come back as
+        # frame_copy()s (deep unless pandas Copy-on-Write is on), so handlers may edit them
+        self._python_modules()
+        from synthetic_market import scenarios
+        return scenarios(n_ticks)
+
+    def op_ping(self, req):
+        return {"ok": True}
+
+    def op_run(self, req):
+        import cli
+        return cli.run(self._prices(req.get("data_path") or os.environ.get("DATA_PATH", "data/sample_prices.csv")))
+
+    def op_sweep(self, req):
+        from app.backtester import ewma_batch_run, persistence_strategy
+        prices = self._prices(req.get("data_path") or os.environ.get("DATA_PATH", "data/sample_prices.csv"))
+        grid = [tuple(g) for g in req.get("ewma_grid", [])]
+        ewma = ewma_batch_run(prices, grid) if grid else []
+        out = [{"strategy": "EWMA", "params": {"alpha": a, "threshold": t, "window": w}, "metrics": m}
+               for (a, t, w), m in zip(grid, ewma)]
+        out += [{"strategy": "PERSIST", "params": {"hold_period": h}, "metrics": persistence_strategy(prices, hold_period=h)}
+                for h in req.get("persist_grid", [])]
+        return {"results": out}
+
+    def op_strategy(self, req):
+        from pathlib import Path
+        spec = self._spec(req["config"])
+        n_ticks = int(req.get("n_ticks", 3000))
+        result = self._handler(spec.type)(spec, self._scenarios(n_ticks))
+        result["config_path"] = str(Path(req["config"]).resolve())
+        result["n_ticks"] = n_ticks
+        return result
+
+    def op_stats(self, req):
+        self._python_modules()
+        from synthetic_market import scenario_cache
+        scenarios = sorted(k[1] for k in scenario_cache().keys() if k[0] == "labeled_scenarios")
+        with self.lock:
+            return {"requests": self.requests, "datasets": len(self.prices), "specs": len(self.specs),
+                    "scenarios": scenarios, "handlers": sorted(self.handlers or {})}
+
+    def op_clear(self, req):
+        self._python_modules()
+        from synthetic_market import scenario_cache
+        scenario_cache().clear()
+        with self.lock:
+            self.prices.clear(); self.specs.clear(); self.handlers = None
+        return {"ok": True}
+
+    def handle(self, req):
+        """Dispatch one request; errors come back as ``{"error": ...}`` instead of raising."""
+        t0 = time.perf_counter()
+        with self.lock:
+            self.requests += 1
+        try:
+            fn = getattr(self, "op_" + str(req.get("op")), None)
+            if fn is None:
+                raise ValueError(f"Unknown op: {req.get('op')!r}")
+            out = fn(req)
+        except Exception as exc:
+            out = {"error": f"{type(exc).__name__}: {exc}"}
+        out["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        return out
+
+
+def serve_unix(server, path):
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    req = json.loads(line)
+                except ValueError as exc:
+                    resp = {"error": f"bad JSON: {exc}"}
+                else:
+                    resp = server.handle(req)
+                self.wfile.write((json.dumps(resp, default=float) + "\n").encode())
+                self.wfile.flush()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as srv:
+        srv.daemon_threads = True
+        print(f"listening on unix:{path}", file=sys.stderr)
+        try:
+            srv.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+def serve_http(server, host, port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            try:
+                resp, code = server.handle(json.loads(body or b"{}")), 200
+            except ValueError as exc:
+                resp, code = {"error": f"bad JSON: {exc}"}, 400
+            data = json.dumps(resp, default=float).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    with ThreadingHTTPServer((host, port), Handler) as srv:
+        print(f"listening on http://{host}:{port}", file=sys.stderr)
+        srv.serve_forever()
+
+
+def request(req, socket_path):
+    """Client helper: send one request to a Unix-socket server and return the response."""
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(socket_path)
+        s.sendall((json.dumps(req) + "\n").encode())
+        return json.loads(s.makefile("rb").readline())
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Persistent validator server")
+    ap.add_argument("--socket", help="Unix socket path (JSON lines)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="HTTP port when --socket is not given")
+    args = ap.parse_args()
+    import signal
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # unwind so the socket file is removed
+    srv = ValidatorServer()
+    if args.socket:
+        serve_unix(srv, args.socket)
+    else:
+        serve_http(srv, args.host, args.port)
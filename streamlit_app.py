@@ -18,12 +18,12 @@ from web_bridge import (
     read_price_df_from_upload,
     make_synthetic_df,
     get_strategy_catalog,
-    run_strategy_on_df,
+    run_strategy_batch,
     run_validator_sim,
     make_unified_row,
     write_results_csv,
+    JobRunner,
 )
-from config_loader import load_config
 
 st.set_page_config(page_title="HFT Validator - Agent Console", page_icon="🤖", layout="wide")
 st.title("🤖 HFT Validator — Agent Console")
@@ -58,6 +58,49 @@ def get_registry():
     return discover_validators()
 
 REGISTRY, DIAG = get_registry()
+
+@st.cache_resource(show_spinner=False)
+def get_job_runner():
+    # one pool per server process, shared by every session
+    return JobRunner(max_workers=4)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_synthetic_df(n_ticks: int, seed: int):
+    return make_synthetic_df(n_ticks=n_ticks, seed=seed)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_upload_df(data: bytes, name: str):
+    return read_price_df_from_upload(data, name)
+
+_POLLING = []  # jobs still running in this script run; polled once at the bottom
+
+def poll_job(key: str):
+    """Progress/cancel widgets for the job id in st.session_state[key]; its results once it is done."""
+    job_id = st.session_state.get(key)
+    if not job_id:
+        return None
+    runner = get_job_runner()
+    try:
+        status = runner.status(job_id)
+    except KeyError:
+        st.session_state.pop(key, None)
+        return None
+    if status["state"] in ("queued", "running"):
+        st.progress(status["progress"], text=f"{status['label']}: {status['done']}/{status['total']} done "
+                                             f"({status['elapsed_s']:.1f}s)")
+        if st.button("✖️ Cancel", key=f"{key}_cancel"):
+            runner.cancel(job_id)
+        _POLLING.append(job_id)
+        return None
+    st.session_state.pop(key, None)
+    if status["state"] == "cancelled":
+        st.warning(f"{status['label']} cancelled")
+        return None
+    if status["state"] == "failed":
+        st.error(f"{status['label']} failed: " + "; ".join(status["errors"]))
+        return None
+    st.success(f"{status['label']} finished in {status['elapsed_s']:.2f}s")
+    return runner.result(job_id)
 AVAILABLE = list(REGISTRY.keys())
 
 st.sidebar.header("⚙️ Settings")
@@ -179,12 +222,12 @@ with tab_strategy:
     if data_source == "Synthetic":
         n_ticks = int(st.number_input("n_ticks", min_value=200, max_value=200000, value=3000, step=100))
         seed = int(st.number_input("seed", min_value=0, max_value=10_000_000, value=123, step=1))
-        df = make_synthetic_df(n_ticks=n_ticks, seed=seed)
+        df = cached_synthetic_df(n_ticks, seed)
         st.success(f"Synthetic series ready: {len(df)} ticks")
     else:
         up = st.file_uploader("Upload CSV", type=["csv"])
         if up is not None:
-            df = read_price_df_from_upload(up.getvalue(), up.name)
+            df = cached_upload_df(up.getvalue(), up.name)
             n_ticks = len(df)
             st.success(f"CSV series loaded: {len(df)} ticks")
 
@@ -203,28 +246,37 @@ with tab_strategy:
 
         run_all = st.button("▶️ Run selected configs")
         if run_all and df is not None:
-            rows = []
-            results = []
-            ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            with st.spinner("Running strategies..."):
-                for rel in selected:
-                    spec = load_config(ROOT / rel)
-                    out = run_strategy_on_df(spec, df)
-                    results.append(out)
-                    rows.append(
-                        make_unified_row(
-                            timestamp=ts,
-                            data_source=data_source,
-                            n_ticks=len(df),
-                            strategy_result=out,
-                            validator_result=None,
-                        )
-                    )
-
+            paths = [ROOT / rel for rel in selected]
+            # one background batch: handlers and the data hash are resolved once, configs run
+            # concurrently, and this script keeps rendering (Cancel stops it between configs)
+            st.session_state["strategy_job"] = get_job_runner().submit(
+                run_strategy_batch, paths, df, label=f"{len(paths)} strategy config(s)", progress=True)
+            st.session_state["strategy_job_ctx"] = {"data_source": data_source, "n_ticks": len(df),
+                                                    "ts": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+        results = poll_job("strategy_job")
+        if results is not None:
+            results = results[0]
+            ctx = st.session_state.pop("strategy_job_ctx", {})
+            rows = [
+                make_unified_row(
+                    timestamp=ctx.get("ts", time.strftime("%Y-%m-%d %H:%M:%S")),
+                    data_source=ctx.get("data_source", data_source),
+                    n_ticks=ctx.get("n_ticks", n_ticks),
+                    strategy_result=out,
+                    validator_result=None,
+                )
+                for out in results
+            ]
             st.session_state["last_strategy_results"] = results
             st.session_state["unified_rows"] = rows
+            st.session_state["strategy_view"] = {"results": results, "rows": rows,
+                                                 "out_path": str(write_results_csv(rows, ROOT / "results"))}
 
-            st.success(f"Ran {len(results)} strategy config(s)")
+        view = st.session_state.get("strategy_view")
+        if view:
+            results, rows, out_path = view["results"], view["rows"], view["out_path"]
+            st.write(f"Ran {len(results)} strategy config(s)")
             st.write("### Strategy raw outputs")
             for r in results:
                 with st.expander(f"{r.get('strategy_type')} • {r.get('strategy_name')} • {pathlib.Path(r.get('config_path','')).name}"):
@@ -234,7 +286,6 @@ with tab_strategy:
             st.subheader("Unified comparison table (strategy-only)")
             st.dataframe(rows, use_container_width=True)
 
-            out_path = write_results_csv(rows, ROOT / "results")
             st.success(f"Wrote: {out_path}")
             st.download_button(
                 "⬇️ Download results CSV",
@@ -255,12 +306,12 @@ with tab_validator:
     if data_source_v == "Synthetic":
         n_ticks_v = int(st.number_input("n_ticks", min_value=200, max_value=200000, value=3000, step=100, key="val_n"))
         seed_v = int(st.number_input("seed", min_value=0, max_value=10_000_000, value=123, step=1, key="val_seed"))
-        dfv = make_synthetic_df(n_ticks=n_ticks_v, seed=seed_v)
+        dfv = cached_synthetic_df(n_ticks_v, seed_v)
         st.success(f"Synthetic series ready: {len(dfv)} ticks")
     else:
         upv = st.file_uploader("Upload CSV", type=["csv"], key="val_up")
         if upv is not None:
-            dfv = read_price_df_from_upload(upv.getvalue(), upv.name)
+            dfv = cached_upload_df(upv.getvalue(), upv.name)
             st.success(f"CSV series loaded: {len(dfv)} ticks")
 
     st.write("---")
@@ -303,15 +354,16 @@ with tab_validator:
 
     run_sim = st.button("▶️ Run validator sim")
     if run_sim and dfv is not None:
-        with st.spinner("Simulating..."):
-            sim_out = run_validator_sim(dfv, validator_kind=validator_kind, params=params)
-
+        st.session_state["validator_job"] = get_job_runner().submit(
+            run_validator_sim, dfv, validator_kind, dict(params), label=f"{validator_kind} validator sim")
+        st.session_state["validator_job_ctx"] = {"data_source": data_source_v, "n_ticks": len(dfv)}
+
+    done = poll_job("validator_job")
+    if done is not None:
+        sim_out = done[0]
+        ctx = st.session_state.pop("validator_job_ctx", {})
         st.session_state["last_validator_result"] = sim_out
 
-        st.success("Simulation complete")
-        st.write("### Validator metrics")
-        st.json({k: sim_out.get(k) for k in ["validator_kind", "total_pnl", "trades", "fsr", "sharpe_like", "max_drawdown", "dd_recovery_ticks"]})
-
         # Push metrics to Decision tab
         decision_metrics = {
             "sharpe_like": sim_out.get("sharpe_like", 0.0),
@@ -323,6 +375,28 @@ with tab_validator:
         st.session_state["metrics_text"] = json.dumps(decision_metrics, indent=2)
         st.info("Decision metrics updated (Decision tab will use these).")
 
+        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        last_strat = st.session_state.get("last_strategy_results", [])
+        rows = [
+            make_unified_row(
+                timestamp=ts,
+                data_source=ctx.get("data_source", data_source_v),
+                n_ticks=ctx.get("n_ticks", 0),
+                strategy_result=sr,
+                validator_result=sim_out,
+            )
+            for sr in (last_strat or [None])
+        ]
+        st.session_state["unified_rows"] = rows
+        st.session_state["validator_view"] = {"sim_out": sim_out, "rows": rows,
+                                              "out_path": str(write_results_csv(rows, ROOT / "results"))}
+
+    view = st.session_state.get("validator_view")
+    if view:
+        sim_out, rows, out_path = view["sim_out"], view["rows"], view["out_path"]
+        st.write("### Validator metrics")
+        st.json({k: sim_out.get(k) for k in ["validator_kind", "total_pnl", "trades", "fsr", "sharpe_like", "max_drawdown", "dd_recovery_ticks"]})
+
         st.write("### Equity curve")
         st.line_chart(sim_out.get("equity", []))
 
@@ -331,36 +405,8 @@ with tab_validator:
 
         st.write("---")
         st.subheader("Unified comparison table")
-
-        ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        rows = []
-        last_strat = st.session_state.get("last_strategy_results", [])
-        if last_strat:
-            for sr in last_strat:
-                rows.append(
-                    make_unified_row(
-                        timestamp=ts,
-                        data_source=data_source_v,
-                        n_ticks=len(dfv),
-                        strategy_result=sr,
-                        validator_result=sim_out,
-                    )
-                )
-        else:
-            rows.append(
-                make_unified_row(
-                    timestamp=ts,
-                    data_source=data_source_v,
-                    n_ticks=len(dfv),
-                    strategy_result=None,
-                    validator_result=sim_out,
-                )
-            )
-
-        st.session_state["unified_rows"] = rows
         st.dataframe(rows, use_container_width=True)
 
-        out_path = write_results_csv(rows, ROOT / "results")
         st.success(f"Wrote: {out_path}")
         st.download_button(
             "⬇️ Download results CSV",
@@ -374,3 +420,8 @@ st.write("---")
 st.caption(
     "Tip: Run Streamlit from the repo root (or set PYTHONPATH=.) so modules can be discovered. In AWS mode ensure a valid AWS profile and Bedrock model access."
 )
+
+if _POLLING:
+    # background jobs still running: check again shortly; any widget change interrupts the wait
+    time.sleep(0.5)
+    st.rerun()
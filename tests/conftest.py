@@ -2,3 +2,7 @@ import sys, pathlib
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+import os
+# keep the result cache (core/cache) in memory so test runs never write to ~/.cache
+os.environ.setdefault("HFT_CACHE", "memory")
@@ -0,0 +1,13 @@
+import math
+from app.data import load_prices_csv
+from app.backtester import ewma_run, ewma_batch_run
+
+def test_ewma_batch_matches_single_runs():
+    prices=load_prices_csv('data/sample_prices.csv')
+    grid=[(0.02,1.8,90),(0.05,2.5,50),(0.10,3.2,25),(0.3,1.0,10)]
+    for chunk in (2048,64):
+        for (a,t,w),b in zip(grid, ewma_batch_run(prices, grid, chunk=chunk)):
+            m,_=ewma_run(prices, alpha=a, threshold=t, window=w)
+            assert (b["trades"],b["wins"])==(m["trades"],m["wins"])
+            assert b["pnl"]==m["pnl"] and b["max_dd"]==m["max_dd"]
+            assert math.isclose(b["sharpe"], m["sharpe"], rel_tol=1e-9)
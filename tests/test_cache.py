@@ -0,0 +1,54 @@
+import os, time
+import numpy as np
+from core.cache.cache import ResultCache, make_key, hash_array, default_cache
+from app.data import load_prices_csv
+from app.backtester import ewma_strategy, ewma_run
+
+def test_memory_lru_and_disk_tier(tmp_path):
+    c = ResultCache(max_entries=2, disk_dir=str(tmp_path), max_disk_bytes=10**9)
+    for k in "abc":
+        c.put(k, {"k": k})
+    assert list(c._mem) == ["b", "c"]
+    assert c.get("a") == {"k": "a"} and c.disk_hits == 1      # evicted from memory, served from disk
+    calls = []
+    assert c.get_or_compute("d", lambda: calls.append(1) or [1]) == [1]
+    got = c.get_or_compute("d", lambda: calls.append(1) or [1])
+    got.append(2)
+    assert calls == [1] and c.get("d") == [1]                 # computed once; callers get copies
+
+def test_disk_eviction_keeps_newest(tmp_path):
+    c = ResultCache(disk_dir=str(tmp_path), max_disk_bytes=3100)  # three ~1KB pickles
+    for i in range(5):
+        c.put(f"k{i}", b"x" * 1000)
+    c.put("k5", b"x" * 1000)
+    assert sorted(p.name for p in tmp_path.glob("*.pkl")) == ["k3.pkl", "k4.pkl", "k5.pkl"]
+    for i in (5, 3, 4):  # a new cache picks up the directory in mtime order
+        os.utime(tmp_path / f"k{i}.pkl", ns=(i * 10**9, i * 10**9))
+    c = ResultCache(disk_dir=str(tmp_path), max_disk_bytes=3100)
+    assert c._disk_bytes == sum(p.stat().st_size for p in tmp_path.glob("*.pkl"))
+    c.put("k6", b"x" * 1000)
+    assert sorted(p.name for p in tmp_path.glob("*.pkl")) == ["k4.pkl", "k5.pkl", "k6.pkl"]
+
+def test_keys_cover_data_params_and_version():
+    a = np.arange(5.0)
+    base = make_key("ewma", {"alpha": 0.05}, [hash_array(a)], "v1")
+    assert base == make_key("ewma", {"alpha": 0.05}, [hash_array(a.copy())], "v1")
+    assert base != make_key("ewma", {"alpha": 0.06}, [hash_array(a)], "v1")
+    assert base != make_key("ewma", {"alpha": 0.05}, [hash_array(a + 1e-12)], "v1")
+    assert base != make_key("ewma", {"alpha": 0.05}, [hash_array(a)], "v2")
+
+def test_default_is_memory_only(monkeypatch):
+    import core.cache.cache as cache_mod
+    monkeypatch.delenv("HFT_CACHE", raising=False)
+    monkeypatch.setattr(cache_mod, "_DEFAULT", None)
+    assert default_cache().disk_dir is None
+
+def test_ewma_strategy_hits_cache():
+    prices = load_prices_csv("data/sample_prices.csv")
+    first = ewma_strategy(prices, alpha=0.031, threshold=2.2, window=40)
+    hits = default_cache().hits
+    assert ewma_strategy(prices, alpha=0.031, threshold=2.2, window=40) == first
+    assert default_cache().hits == hits + 1
+    assert ewma_strategy(prices, alpha=0.031, threshold=2.2, window=40, cache=False) == first
+    assert default_cache().hits == hits + 1
+    assert first == ewma_run(prices, alpha=0.031, threshold=2.2, window=40)[0]
@@ -0,0 +1,16 @@
+import json, subprocess, sys
+import pytest
+
+def test_list_strategies_stays_light():
+    proc=subprocess.run([sys.executable, "-X", "importtime", "cli.py", "--list-strategies"], capture_output=True, text=True, check=True)
+    from app.backtester import list_strategies
+    assert json.loads(proc.stdout)==list_strategies()
+    loaded={l.split("|")[-1].strip() for l in proc.stderr.splitlines()}
+    assert not loaded & {"numpy", "app.backtester", "app.data", "matplotlib"}
+
+@pytest.mark.parametrize("flag", ["--profile-startup", "--profile"])  # an abbreviation must not re-profile in the child
+def test_profile_startup_reports_imports(flag):
+    proc=subprocess.run([sys.executable, "cli.py", flag, "--list-strategies"], capture_output=True, text=True, check=True, timeout=60)
+    assert "EWMA" in json.loads(proc.stdout)
+    report=json.loads(proc.stderr)
+    assert report["wall_ms"]>0 and any(m["module"]=="json" for m in report["modules"])
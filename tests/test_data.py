@@ -0,0 +1,11 @@
+from app.data import load_prices_csv, csv_to_ticks, load_prices, TickStore
+from app.backtester import ewma_run
+
+def test_tick_store_roundtrip(tmp_path):
+    out=tmp_path/"sample.ticks"
+    rows=load_prices_csv('data/sample_prices.csv')
+    assert csv_to_ticks('data/sample_prices.csv', out)==len(rows)
+    store=load_prices(out)
+    assert isinstance(store, TickStore) and len(store)==len(rows)
+    assert store.price.tolist()==[p for _,p in rows]
+    assert ewma_run(store)[0]==ewma_run(rows)[0]
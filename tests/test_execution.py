@@ -0,0 +1,34 @@
+import sys, pathlib
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import numpy as np
+import pytest
+from execution import execute_signals
+
+LONG = [0, 1, 1, 1, 0, 0, 0, 0]
+SHORT = [0, 0, 0, 0, 1, 0, 0, 0]
+PRICE = [10, 11, 12, 13, 12, 11, 10, 9]
+
+def test_pyramiding_and_same_bar_reverse():
+    r = execute_signals(LONG, SHORT, PRICE, max_position=2)
+    assert r["position"].tolist() == [0, 1, 2, 2, -1, -1, -1, -1]
+    assert r["trades"] == 3 and r["pnl"] == 1 + 2 + 2 + 1 + 1 + 1 + 1
+
+def test_exec_settings_are_honored():
+    r = execute_signals(LONG, SHORT, PRICE, max_position=2, allow_pyramiding=False, same_bar_reverse=False)
+    assert r["position"].tolist() == [0, 1, 1, 1, 0, -1, -1, -1] and r["trades"] == 2
+    with pytest.raises(ValueError):
+        execute_signals(LONG, SHORT, PRICE, reverse_mode="flatten_only")
+
+def test_vectorized_matches_loop():
+    from execution import _positions_loop, _positions_vectorized
+    rng = np.random.default_rng(5)
+    # (max_position, initial_size, add_size): zero entry or add sizes never open or add
+    for sizes in [(3, 1, 2), (3, 0, 1), (1, 0, 2), (3, 2, 0), (0, 1, 1)]:
+        for _ in range(20):
+            L, S = rng.random(120) < 0.2, rng.random(120) < 0.2
+            a = _positions_vectorized(L, S, *sizes, True)
+            b = _positions_loop(L, S, *sizes, True, True)
+            assert np.array_equal(a[0], b[0]) and a[1] == b[1]
+    assert _positions_vectorized(L, S, 3, 0, 1, True)[0].tolist() == [0] * 120
@@ -0,0 +1,14 @@
+import sys, pathlib
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import numpy as np
+from kd_strategy import _rolling_extreme, _sma
+
+def test_rolling_extreme_and_sma_match_naive():
+    x = np.random.default_rng(3).normal(size=257)
+    for n in (1, 2, 9, 64):
+        starts = [max(0, i - n + 1) for i in range(len(x))]
+        assert np.array_equal(_rolling_extreme(x, n, np.maximum), [x[s:i+1].max() for i, s in enumerate(starts)])
+        assert np.array_equal(_rolling_extreme(x, n, np.minimum), [x[s:i+1].min() for i, s in enumerate(starts)])
+        assert np.allclose(_sma(x, n), [x[s:i+1].mean() for i, s in enumerate(starts)])
@@ -0,0 +1,20 @@
+import json, os, shutil
+import lambda_handler
+
+def test_warm_cache_reuses_decision_until_file_changes(tmp_path, monkeypatch):
+    data = tmp_path / "prices.csv"
+    shutil.copy("data/sample_prices.csv", data)
+    monkeypatch.setenv("DATA_PATH", str(data))
+    monkeypatch.setitem(lambda_handler._WARM, "key", None)
+    calls = []
+    real = lambda_handler.smart_choose_and_run
+    monkeypatch.setattr(lambda_handler, "smart_choose_and_run", lambda p: calls.append(1) or real(p))
+    first = lambda_handler.handler({}, None)
+    second = lambda_handler.handler({}, None)
+    assert (first["headers"]["X-Cache"], second["headers"]["X-Cache"]) == ("miss", "hit")
+    assert first["body"] == second["body"] and len(calls) == 1
+    with open(data, "a") as f:
+        f.write("\nt9999,101.0\n")
+    os.utime(data, ns=(0, os.stat(data).st_mtime_ns + 1))
+    assert lambda_handler.handler({}, None)["headers"]["X-Cache"] == "miss" and len(calls) == 2
+    assert "strategy" in json.loads(first["body"])["decision"]
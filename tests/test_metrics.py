@@ -0,0 +1,12 @@
+import math
+from core.metrics.metrics import MetricsAccumulator
+
+def test_accumulator_matches_two_pass():
+    eq=[0.0,1.0,0.5,2.5,1.0,1.5,3.0]
+    acc=MetricsAccumulator()
+    for x in eq: acc.update(x)
+    rets=[b-a for a,b in zip(eq,eq[1:])]
+    m=sum(rets)/len(rets); v=sum((r-m)**2 for r in rets)/(len(rets)-1)
+    M=acc.snapshot()
+    assert M.pnl==3.0 and M.max_dd==1.5
+    assert math.isclose(M.sharpe, len(rets)**0.5*m/v**0.5)
@@ -0,0 +1,63 @@
+import os, subprocess, pathlib
+import numpy as np
+import pytest
+from core.native import native
+from core.metrics.metrics import Metrics
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+pytestmark = pytest.mark.skipif(not native.available(), reason="cpp/libhftcore.so not built (make -C cpp)")
+
+def test_run_ewma_matches_cli_binary():
+    from app.data import load_prices, price_array
+    data = ROOT / "data" / "sample_prices.csv"
+    m = native.run_ewma(price_array(load_prices(str(data))), window=30, alpha=0.05, threshold=2.0)
+    binary = ROOT / "cpp" / "backtester"
+    if binary.exists():
+        out = subprocess.check_output([str(binary), f"--data={data}", "--window=30", "--alpha=0.05", "--threshold=2.0"])
+        ref = Metrics.from_cpp_json(out.decode())
+        assert (m.trades, m.wins) == (ref.trades, ref.wins)
+        assert m.pnl == pytest.approx(ref.pnl, rel=1e-5) and m.sharpe == pytest.approx(ref.sharpe, rel=1e-5)
+    with pytest.raises(ValueError):
+        native.run_ewma(np.ones(10), window=50)
+
+def test_validate_flags_per_tick():
+    px = np.array([99.0, 101.0, 102.0, 103.0, 98.0, 101.0, 101.5])
+    assert native.validate("Persistence", px, p1=2).tolist() == [False, False, True, True, False, False, True]
+    ts = np.arange(px.size, dtype=np.uint64)
+    assert native.validate("Volatility", px, ts, p1=3, p2=100.0)[1:].all()
+    with pytest.raises(ValueError):
+        native.validate("Nope", px)
+
+def test_cli_binary_reads_tick_store(tmp_path):
+    from app.data import csv_to_ticks
+    binary = ROOT / "cpp" / "backtester"
+    if not binary.exists():
+        pytest.skip("cpp/backtester not built")
+    data = ROOT / "data" / "sample_prices.csv"
+    csv_to_ticks(str(data), str(tmp_path / "s.ticks"))
+    run = lambda p: subprocess.check_output([str(binary), f"--data={p}"]).decode()
+    assert run(tmp_path / "s.ticks") == run(data)
+
+def test_cli_sweep_expands_grid(tmp_path):
+    import json
+    binary = ROOT / "cpp" / "backtester"
+    if not binary.exists():
+        pytest.skip("cpp/backtester not built")
+    grid = tmp_path / "grid.txt"
+    grid.write_text("# comment\nEWMA alpha=0.05 threshold=2,2.5 window=30\nPersistence hold=3,5\nImbalance\n")
+    data = ROOT / "data" / "sample_prices.csv"
+    rows = [json.loads(l) for l in subprocess.check_output(
+        [str(binary), f"--data={data}", f"--sweep={grid}", "--threads=2"]).decode().splitlines()]
+    assert [r["validator"] for r in rows] == ["EWMA", "EWMA", "Persistence", "Persistence", "Imbalance"]
+    single = Metrics.from_cpp_json(subprocess.check_output(
+        [str(binary), f"--data={data}", "--window=30", "--alpha=0.05", "--threshold=2.5"]).decode())
+    assert Metrics.from_cpp_json(json.dumps(rows[1])) == single
+
+def test_ewma_lanes_match_single_validators():
+    rng = np.random.default_rng(3)
+    px = 100 + np.cumsum(rng.normal(0, 0.3, 5000))
+    alphas, thresholds = [0.02, 0.05, 0.2], [2.0, 2.5, 1.0]
+    lanes = native.validate_ewma_lanes(px, alphas, thresholds)
+    assert lanes.shape == (5000, 3)
+    for k, (a, t) in enumerate(zip(alphas, thresholds)):
+        assert (lanes[:, k] == native.validate("EWMA", px, p1=a, p2=t)).all()
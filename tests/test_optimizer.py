@@ -0,0 +1,19 @@
+import sys, pathlib, random
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import numpy as np
+from optimizer import SPACE, sample_params, _budgets, _tpe_propose
+
+def test_budgets_end_at_max():
+    assert _budgets(300, 8100, 3) == [300, 900, 2700, 8100]
+    assert _budgets(1000, 3500, 3) == [1000, 3000, 3500]
+
+def test_tpe_proposals_stay_in_space():
+    rng = random.Random(0)
+    obs = [{"params": sample_params(rng), "score": rng.random()} for _ in range(20)]
+    props = _tpe_propose(obs, 4, np.random.default_rng(0), 0.25, 32)
+    assert len(props) == 4
+    for p in props:
+        for k, (kind, lo, hi) in SPACE.items():
+            assert lo <= p[k] <= hi and (kind == "float" or isinstance(p[k], int))
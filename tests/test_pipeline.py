@@ -0,0 +1,63 @@
+import sys, pathlib
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import pytest
+from synthetic_market import labeled_scenarios
+from visualize_metrics import ArtifactWriter, run_pipeline
+
+def test_in_memory_run_matches_and_writes_nothing(tmp_path):
+    df = labeled_scenarios(n=900)
+    out_dir, logs = tmp_path / "results", tmp_path / "aws" / "logs.jsonl"
+    disk = run_pipeline(df=df, generate_artifacts=False, out_dir=str(out_dir), logs_path=str(logs))
+    assert (out_dir / "summary.csv").exists() and len(logs.read_text().splitlines()) == 3
+
+    mem_dir = tmp_path / "mem"
+    mem = run_pipeline(df=df, generate_artifacts=False, in_memory=True,
+                       out_dir=str(mem_dir), logs_path=str(mem_dir / "logs.jsonl"))
+    assert not mem_dir.exists() and mem["artifacts"] == {}
+    assert mem["agent"] == disk["agent"] and mem["baseline"] == disk["baseline"]
+    assert [d["decision"] for d in mem["decisions"]] == [d["decision"] for d in disk["decisions"]]
+
+    assert run_pipeline(df=df, in_memory=True)["agent"] == mem["agent"]  # implies no artifacts
+    with pytest.raises(ValueError):
+        run_pipeline(df=df, in_memory=True, generate_artifacts=True)
+    with pytest.raises(ValueError):
+        run_pipeline(df=df, writer=ArtifactWriter(tmp_path / "w.jsonl"), logs_path=str(logs))
+
+def test_shared_writer_defers_io(tmp_path):
+    df = labeled_scenarios(n=600)
+    w = ArtifactWriter(tmp_path / "logs.jsonl")
+    for _ in range(2):
+        run_pipeline(df=df, generate_artifacts=False, out_dir=str(tmp_path / "r"), writer=w)
+    assert not (tmp_path / "r").exists()
+    w.flush()
+    assert len((tmp_path / "logs.jsonl").read_text().splitlines()) == 6
+    assert (tmp_path / "r" / "per_regime_metrics.csv").exists()
+
+def test_regime_index_matches_boolean_filtering():
+    import numpy as np
+    from synthetic_market import MarketGenerator, regime_index, regime_prices
+    from validator_sim import EWMAValidator, simulate
+    df = MarketGenerator(4000, chunk_size=1000, switch_prob=4e-3).frame()
+    runs = regime_index(df)
+    assert list(runs) == df["regime"].unique().tolist()
+    price = df["price"].to_numpy()
+    for reg, reg_runs in runs.items():
+        sub = df[df["regime"] == reg]
+        assert np.array_equal(regime_prices(price, reg_runs), sub["price"].to_numpy())
+        assert simulate(sub, EWMAValidator()) == simulate(regime_prices(price, reg_runs), EWMAValidator())
+    serial = run_pipeline(df=df, generate_artifacts=False, in_memory=True)
+    parallel = run_pipeline(df=df, generate_artifacts=False, in_memory=True, workers=2)
+    assert serial["agent"] == parallel["agent"] and len(serial["decisions"]) == len(runs)
+
+def test_sliced_scenario_frame_uses_its_own_regimes():
+    from synthetic_market import scenarios
+    full = scenarios(3000)
+    run_pipeline(df=full, in_memory=True)
+    tail = full.iloc[1500:].reset_index(drop=True)
+    out = run_pipeline(df=tail, in_memory=True)
+    assert [d["context"]["regime"] for d in out["decisions"]] == ["volatile", "jumpy"]
+    bare = tail.copy()
+    bare.attrs.clear()
+    assert out["agent"] == run_pipeline(df=bare, in_memory=True)["agent"]
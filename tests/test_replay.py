@@ -0,0 +1,41 @@
+import sys, pathlib, asyncio
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import numpy as np
+from replay import Replay, replay, tick_times
+
+def test_tick_times_spacing():
+    ts, px = tick_times([("t1", 1.0), ("t2", 2.0), ("t3", 3.0)])
+    assert ts.tolist() == [0, 1_000_000, 2_000_000] and px.tolist() == [1.0, 2.0, 3.0]
+    ts, _ = tick_times([(1_000, 1.0), (5_000, 2.0)])
+    assert ts.tolist() == [1_000, 5_000]
+    ts, _ = tick_times(np.ones(3), interval_ns=10)
+    assert ts.tolist() == [0, 10, 20]
+
+def test_replay_fans_out_in_order_and_paces():
+    got_sync, got_async = [], []
+
+    async def slow(tick):
+        await asyncio.sleep(0)
+        got_async.append(tick.seq)
+
+    px = np.linspace(100, 101, 200)
+    report = replay(px, {"sync": lambda t: got_sync.append(t.price), "async": slow,
+                         "bad": lambda t: 1 / 0}, interval_ns=100_000)
+    assert got_sync == px.tolist() and got_async == list(range(200))
+    assert report["wall_s"] >= 199 * 100e-6
+    assert report["target_rate_per_s"] == 10_000
+    subs = report["subscribers"]
+    assert subs["sync"]["ticks"] == subs["async"]["ticks"] == 200
+    assert subs["bad"]["errors"] == 200 and "ZeroDivisionError" in subs["bad"]["last_error"]
+
+def test_drop_overflow_counts_skipped_ticks():
+    seen = []
+    async def stuck(tick):
+        await asyncio.sleep(0.002)
+        seen.append(tick.seq)
+    report = asyncio.run(Replay({"stuck": stuck}, speed=None, queue_size=2, overflow="drop").run(np.ones(50)))
+    s = report["subscribers"]["stuck"]
+    assert s["dropped"] > 0 and s["ticks"] + s["dropped"] == 50 == report["ticks"]
+    assert s["backlog"]["max"] == 2 and seen == sorted(seen)
@@ -0,0 +1,26 @@
+import os, shutil, threading, time
+from server import ValidatorServer, request, serve_unix
+
+def test_handle_caches_and_reloads(tmp_path):
+    data = tmp_path / "prices.csv"
+    shutil.copy("data/sample_prices.csv", data)
+    srv = ValidatorServer()
+    first = srv.handle({"op": "sweep", "data_path": str(data), "ewma_grid": [[0.05, 2.5, 50]], "persist_grid": [5]})
+    assert [r["strategy"] for r in first["results"]] == ["EWMA", "PERSIST"]
+    cached = srv.prices[str(data)][1]
+    srv.handle({"op": "sweep", "data_path": str(data), "persist_grid": [8]})
+    assert srv.prices[str(data)][1] is cached
+    os.utime(data, ns=(0, os.stat(data).st_mtime_ns + 1))
+    srv.handle({"op": "sweep", "data_path": str(data)})
+    assert srv.prices[str(data)][1] is not cached
+    assert "error" in srv.handle({"op": "nope"})
+
+def test_unix_socket_roundtrip(tmp_path):
+    sock = str(tmp_path / "s.sock")
+    threading.Thread(target=serve_unix, args=(ValidatorServer(), sock), daemon=True).start()
+    for _ in range(100):
+        if os.path.exists(sock):
+            break
+        time.sleep(0.01)
+    assert request({"op": "ping"}, sock)["ok"] is True
+    assert request({"op": "stats"}, sock)["requests"] == 2
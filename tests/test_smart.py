@@ -5,3 +5,9 @@ def test_runs():
     prices=load_prices_csv('data/sample_prices.csv')
     out=smart_choose_and_run(prices)
     assert 'strategy' in out and 'params' in out and 'metrics' in out
+
+def test_parallel_matches_serial():
+    prices=load_prices_csv('data/sample_prices.csv')
+    grid=[(0.02,1.8,90),(0.04,2.2,60),(0.05,2.5,50),(0.08,3.0,30)]
+    serial=smart_choose_and_run(prices, ewma_grid=grid, workers=1)
+    assert smart_choose_and_run(prices, ewma_grid=grid, workers=2)==serial
@@ -0,0 +1,62 @@
+import sys, pathlib
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import numpy as np
+import pytest
+from synthetic_market import MarketGenerator, labeled_scenarios
+from app.data import open_ticks
+
+def test_labeled_scenarios_leaves_global_rng_alone():
+    np.random.seed(0)
+    expected = np.random.random()
+    np.random.seed(0)
+    df = labeled_scenarios(n=300, seed=5)
+    assert np.random.random() == expected
+    assert df.equals(labeled_scenarios(n=300, seed=5))
+    assert df["regime"].dtype == "category" and df["regime"].unique().tolist() == ["calm_trend", "volatile", "jumpy"]
+
+def test_chunks_are_independent_and_writers_agree(tmp_path):
+    gen = MarketGenerator(5000, chunk_size=700, switch_prob=5e-3, seed=9)
+    df = gen.frame()
+    assert len(df) == 5000 and len(gen.schedule()[0]) > 1
+    codes, r = MarketGenerator(5000, chunk_size=700, switch_prob=5e-3, seed=9).log_returns(3)
+    assert np.allclose(np.diff(np.log(df["price"].to_numpy()))[2099:2799], r)
+    assert np.array_equal(df["regime"].cat.codes.to_numpy()[2100:2800], codes)
+    for workers in (1, 2):
+        path = tmp_path / f"w{workers}.ticks"
+        gen.write_ticks(str(path), workers=workers, regimes_path=str(tmp_path / f"w{workers}.npy"))
+        store = open_ticks(str(path))
+        assert np.array_equal(store.price, df["price"].to_numpy()) and np.array_equal(store.ts, df["ts"].to_numpy())
+        assert np.array_equal(np.load(tmp_path / f"w{workers}.npy"), df["regime"].cat.codes.to_numpy())
+
+def test_explicit_segments():
+    gen = MarketGenerator(7, segments=[("jumpy", 2), ("calm_trend", 3)])
+    assert gen.frame()["regime"].tolist() == ["jumpy"] * 2 + ["calm_trend"] * 3 + ["jumpy"] * 2
+    for bad in ([], [("jumpy", 0)], [("jumpy", 2), ("calm_trend", -1)], [("sideways", 3)]):
+        with pytest.raises(ValueError):
+            MarketGenerator(5, segments=bad)
+
+def test_scenario_cache_lru_by_bytes_copies_and_spill(tmp_path):
+    from synthetic_market import ScenarioCache
+    cache = ScenarioCache(max_bytes=40_000, spill_dir=str(tmp_path))
+    build = lambda n: (lambda: labeled_scenarios(n=n))
+    df = cache.get(("labeled_scenarios", 2000, 123), build(2000))
+    df["price"] = 0.0
+    edited = cache.get(("labeled_scenarios", 2000, 123), lambda: 1 / 0)
+    edited.loc[0, "price"] = -1.0  # in-place edits stay private too
+    again = cache.get(("labeled_scenarios", 2000, 123), lambda: 1 / 0)
+    assert again.equals(labeled_scenarios(n=2000)) and cache.hits == 2
+    for n in (2001, 2002, 2003):
+        cache.get(("labeled_scenarios", n, 123), build(n))
+    assert cache.nbytes <= 40_000 and ("labeled_scenarios", 2000, 123) not in cache.keys()
+    fresh = ScenarioCache(spill_dir=str(tmp_path))
+    assert fresh.get(("labeled_scenarios", 2000, 123), lambda: 1 / 0).equals(again) and fresh.disk_hits == 1
+
+def test_frame_copy_is_deep_without_copy_on_write(monkeypatch):
+    import numpy as np
+    import synthetic_market
+    df = labeled_scenarios(n=100)
+    monkeypatch.setattr(synthetic_market, "_copy_on_write", lambda: False)  # pandas 2.x default
+    out = synthetic_market.frame_copy(df)
+    assert out.equals(df) and not np.shares_memory(out["price"].to_numpy(), df["price"].to_numpy())
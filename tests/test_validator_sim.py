@@ -0,0 +1,70 @@
+import sys, pathlib
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import numpy as np
+from synthetic_market import labeled_scenarios
+from validator_sim import VolatilityValidator
+
+def test_volatility_ring_buffer_matches_np_std():
+    px = labeled_scenarios(n=1500, seed=7)["price"].to_numpy()
+    v = VolatilityValidator(window=40, max_vol=0.01)
+    rets = []
+    for i, x in enumerate(px):
+        v.step(x)
+        if i:
+            rets.append((x - px[i-1]) / px[i-1])
+        if len(rets) >= 5:
+            assert np.isclose((v.m2 / v.n) ** 0.5, np.std(rets[-40:]), rtol=1e-9)
+
+def test_volatility_nonpositive_window_never_validates():
+    px = labeled_scenarios(n=200, seed=7)["price"].to_numpy()
+    for w in (0, -3):
+        v = VolatilityValidator(window=w, max_vol=1.0)
+        assert not any(v.step(x) for x in px)
+
+def _mixed_validators():
+    from validator_sim import EWMAValidator, PersistenceValidator, ConfirmWrapper
+    return [
+        EWMAValidator(0.05, 2.5, 1.8),
+        ConfirmWrapper(EWMAValidator(0.1, 1.5, 1.9), confirm=2),
+        PersistenceValidator(2, 0.05, 0.1),
+        ConfirmWrapper(PersistenceValidator(3, 0.08, 0.05), confirm=3),
+        VolatilityValidator(30, 0.02),
+    ]
+
+def test_simulate_many_matches_simulate():
+    from validator_sim import simulate, simulate_many
+    df = labeled_scenarios(n=2000, seed=11)
+    lat = [1, 2, 3, 0, 5]
+    batch = simulate_many(df, _mixed_validators(), chunk=300, latency_ticks=lat, min_interval_ticks=2)
+    for v, l, got in zip(_mixed_validators(), lat, batch):
+        want = simulate(df, v, latency_ticks=l, min_interval_ticks=2)
+        assert got["trades_detail"] == want["trades_detail"]
+        for k in ("total_pnl", "fsr", "sharpe_like", "dd_recovery_ticks"):
+            assert np.isclose(got[k], want[k], rtol=1e-9, atol=1e-12)
+
+def test_streaming_matches_simulate():
+    import asyncio
+    from validator_sim import simulate, StreamingSimulator, simulate_stream_async
+    df = labeled_scenarios(n=2000, seed=11)
+    lat = [1, 2, 3, 0, 5]
+    for v, l, v2 in zip(_mixed_validators(), lat, _mixed_validators()):
+        want = simulate(df, v, latency_ticks=l, min_interval_ticks=2)
+        sim = StreamingSimulator(v2, latency_ticks=l, min_interval_ticks=2, keep_history=True)
+        trades = [t for x in df["price"] for t in sim.on_tick(x)] + sim.close()
+        assert sim.result() == want
+        assert [t["i"] for t in trades] == [t["i"] for t in want["trades_detail"]]
+        assert not sim.pending
+
+    async def feed():
+        for i, x in enumerate(df["price"]):
+            yield i, x
+
+    async def collect():
+        return [t async for t in simulate_stream_async(feed(), _mixed_validators()[2], latency_ticks=3)]
+
+    got = asyncio.run(collect())
+    want = simulate(df, _mixed_validators()[2], latency_ticks=3)
+    assert [{k: t[k] for k in ("i", "j", "k", "dir", "pnl")} for t in got] == want["trades_detail"]
+    assert got[-1]["metrics"]["total_pnl"] == want["total_pnl"]
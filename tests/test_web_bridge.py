@@ -0,0 +1,47 @@
+import sys, pathlib, threading, time
+PY_DIR = pathlib.Path(__file__).resolve().parents[1] / "python"
+if str(PY_DIR) not in sys.path:
+    sys.path.insert(0, str(PY_DIR))
+import pytest
+from web_bridge import JobRunner, make_synthetic_df, run_validator_sim
+
+def test_job_runner_progress_cancel_and_results():
+    runner = JobRunner(max_workers=1)
+    gate = threading.Event()
+    blocked = runner.map(lambda x: gate.wait(5) and x, [(1,), (2,), (3,)], label="blocked")
+    while runner.status(blocked)["state"] != "running":
+        time.sleep(0.005)
+    assert runner.status(blocked)["progress"] == 0.0
+    assert not runner.cancel(blocked)  # the first item is already running
+    gate.set()
+    df = make_synthetic_df(600)
+    job = runner.submit(run_validator_sim, df, "EWMA", {"confirm": 1}, label="sim")
+    assert runner.result(job, timeout=10)[0] == run_validator_sim(df, "EWMA", {"confirm": 1})
+    st = runner.status(job)
+    assert st["state"] == "done" and st["done"] == st["total"] == 1
+    assert runner.cancel(job) and runner.status(job)["state"] == "done"  # finished jobs stay done
+    assert runner.status(blocked)["state"] == "cancelled"
+    with pytest.raises(RuntimeError):
+        runner.result(blocked)
+    failed = runner.submit(lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        runner.result(failed, timeout=10)
+    assert runner.status(failed)["state"] == "failed"
+    runner.shutdown()
+
+def test_strategy_batch_matches_single_runs_in_order(tmp_path):
+    import json
+    from config_loader import load_config
+    from web_bridge import _run_strategy_on_df, run_strategy_batch
+    base = json.loads((PY_DIR.parent / "strategies" / "strategy_mtx_kd_1m.json").read_text())
+    paths = []
+    for k in (5, 9, 14, 21):
+        base["indicator"]["kd"]["k_period"] = k
+        paths.append(tmp_path / f"kd_{k}.json")
+        paths[-1].write_text(json.dumps(base))
+    df = make_synthetic_df(2000)
+    expected = [_run_strategy_on_df(load_config(p), df) for p in paths]
+    steps = []
+    assert run_strategy_batch(paths, df, workers=2, progress=lambda d, n: steps.append((d, n))) == expected
+    assert steps[-1] == (4, 4)
+    assert run_strategy_batch(paths[::-1], df, workers=2, processes=True) == expected[::-1]